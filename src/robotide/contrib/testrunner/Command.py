@@ -51,9 +51,11 @@ class Command:
         self._prefix = prefix
         return self
 
-    def with_listener(self, port, pause_on_failure=False):
+    def with_listener(self, port, pause_on_failure=False, batch_interval=0,
+                      keyword_events=True):
         if port:
-            self._listener = (port, pause_on_failure)
+            self._listener = (port, pause_on_failure, batch_interval,
+                              keyword_events)
         else:
             self._listener = None
         return self
@@ -86,7 +88,11 @@ class Command:
         path = self._get_listener_path()
         if path[-1] in ['c', 'o']:
             path = path[:-1]
-        return '%s:%s:%s' % (path, self._listener[0], self._listener[1])
+        port, pause_on_failure, batch_interval, keyword_events = self._listener
+        if batch_interval or not keyword_events:
+            return '%s:%s:%s:%s:%s' % (path, port, pause_on_failure,
+                                       batch_interval, keyword_events)
+        return '%s:%s:%s' % (path, port, pause_on_failure)
 
     def _get_listener_path(self):
         return os.path.abspath(inspect.getfile(TestRunnerAgent))
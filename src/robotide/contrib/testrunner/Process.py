@@ -30,22 +30,25 @@
 #  limitations under the License.
 
 import os
+import selectors
 import signal
 import socket
 import subprocess
 import sys
 import threading
 
-from queue import Empty, Queue
 from robotide.context import IS_WINDOWS
 
 OUTPUT_ENCODING = sys.getfilesystemencoding()
 
 
 class Process(object):
+    # Seconds to wait for the rest of the output after the process has ended
+    CLOSE_TIMEOUT = 0.5
 
-    def __init__(self, cwd):
+    def __init__(self, cwd, on_output=None):
         self._process = None
+        self._on_output = on_output
         self._error_stream = None
         self._output_stream = None
         self._cwd = cwd
@@ -76,20 +79,29 @@ class Process(object):
             subprocess_args['shell'] = True
         self._process = subprocess.Popen(command, **subprocess_args)
         self._process.stdin.close()
-        self._output_stream = StreamReaderThread(self._process.stdout)
-        self._error_stream = StreamReaderThread(self._process.stderr)
-        self._output_stream.run()
-        self._error_stream.run()
+        self._output_stream = StreamReaderThread(self._process.stdout, self._on_output)
+        self._error_stream = StreamReaderThread(self._process.stderr, self._on_output)
+        if IS_WINDOWS:
+            self._output_stream.run()
+            self._error_stream.run()
+        else:
+            StreamSelectorThread([self._output_stream, self._error_stream]).run()
         self._kill_called = False
 
     def set_port(self, port):
         self._port = port
 
     def get_output(self):
-        return self._output_stream.pop()
+        return self._pop(self._output_stream)
 
     def get_errors(self):
-        return self._error_stream.pop()
+        return self._pop(self._error_stream)
+
+    def _pop(self, stream):
+        if not self.is_alive():
+            # Output written just before the process ended may still be unread
+            stream.wait_closed(self.CLOSE_TIMEOUT)
+        return stream.pop()
 
     def get_returncode(self):
         return self._process.returncode
@@ -160,28 +172,126 @@ class Process(object):
 
 
 class StreamReaderThread(object):
+    """Reads a stream in chunks and keeps the output until it is popped.
+
+    `on_output` is called, possibly from another thread, when output
+    becomes available after the previous `pop`. Until the stream is closed,
+    `pop` keeps an incomplete UTF-8 character or terminal escape sequence at
+    the end of the output for the next `pop`.
+    """
+    CHUNK_SIZE = 65536
 
-    def __init__(self, stream):
-        self._queue = Queue()
+    def __init__(self, stream, on_output=None):
+        self._chunks = []
+        self._pending = False
+        self._closed = threading.Event()
+        self._lock = threading.Lock()
         self._thread = None
         self._stream = stream
+        self._on_output = on_output
+
+    @property
+    def stream(self):
+        return self._stream
 
     def run(self):
-        self._thread = threading.Thread(target=self._enqueue_output,
-                                        args=(self._stream,))
+        self._thread = threading.Thread(target=self._read_output)
         self._thread.daemon = True
         self._thread.start()
 
-    def _enqueue_output(self, out):
-        for line in iter(out.readline, b''):
-            self._queue.put(line)
+    def _read_output(self):
+        fd = self._stream.fileno()
+        for chunk in iter(lambda: os.read(fd, self.CHUNK_SIZE), b''):
+            self.feed(chunk)
+        self.feed_eof()
+
+    def feed(self, chunk):
+        with self._lock:
+            notify = not self._pending
+            self._pending = True
+            self._chunks.append(chunk)
+        if notify and self._on_output:
+            self._on_output()
+
+    def feed_eof(self):
+        with self._lock:
+            notify = not self._pending and bool(self._chunks)
+            self._pending = self._pending or notify
+            self._closed.set()
+        if notify and self._on_output:
+            self._on_output()
+
+    def wait_closed(self, timeout):
+        return self._closed.wait(timeout)
 
     def pop(self):
-        result = b''
-        my_queue_rng = range(self._queue.qsize())
-        for _ in my_queue_rng:
-            try:
-                result += self._queue.get_nowait()
-            except Empty:
-                pass
-        return result
+        with self._lock:
+            output = b''.join(self._chunks)
+            self._pending = False
+            end = len(output) if self._closed.is_set() else _complete_length(output)
+            if len(output) - end > self.CHUNK_SIZE:
+                end = len(output)
+            self._chunks = [output[end:]] if end < len(output) else []
+        return output[:end]
+
+
+def _complete_length(output):
+    """Returns length of `output` without an incomplete UTF-8 character or
+    terminal escape sequence at its end."""
+    end = len(output)
+    osc = output.rfind(b'\x1b]')
+    if osc >= 0 and output.find(b'\x1b\\', osc) < 0 and output.find(b'\x07', osc) < 0:
+        end = osc
+    esc = output.rfind(b'\x1b', 0, end)
+    if esc >= 0 and not _is_complete_escape(output[esc:end]):
+        end = esc
+    for back in range(1, min(4, end) + 1):
+        byte = output[end - back]
+        if byte < 0x80:
+            break
+        if byte >= 0xC0:
+            needed = 2 if byte < 0xE0 else 3 if byte < 0xF0 else 4
+            if back < needed:
+                end -= back
+            break
+    return end
+
+
+def _is_complete_escape(sequence):
+    if len(sequence) < 2:
+        return False
+    if sequence[1:2] == b'[':
+        return any(0x40 <= byte <= 0x7E for byte in sequence[2:])
+    if sequence[1:2] == b']':
+        return b'\x07' in sequence
+    return True
+
+
+class StreamSelectorThread(object):
+    """Reads the streams of several readers in one thread.
+
+    Uses selectors, which do not support pipes on Windows.
+    """
+
+    def __init__(self, readers):
+        self._readers = readers
+        self._thread = None
+
+    def run(self):
+        self._thread = threading.Thread(target=self._read_output)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _read_output(self):
+        with selectors.DefaultSelector() as selector:
+            for reader in self._readers:
+                selector.register(reader.stream, selectors.EVENT_READ, reader)
+            while selector.get_map():
+                for key, __ in selector.select():
+                    chunk = os.read(key.fd, StreamReaderThread.CHUNK_SIZE)
+                    if chunk:
+                        key.data.feed(chunk)
+                    else:
+                        selector.unregister(key.fileobj)
+                        key.data.feed_eof()
+
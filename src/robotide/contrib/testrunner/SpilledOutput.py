@@ -0,0 +1,63 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import os
+from itertools import islice
+
+
+def lines_over_limit(line_count, max_lines):
+    """Returns how many lines to remove from the beginning of an output.
+
+    Lines are removed only after the output has grown a tenth over
+    `max_lines`, so that lines are not removed on every append. Zero or
+    negative `max_lines` means no limit.
+    """
+    if max_lines <= 0 or line_count <= max_lines + max_lines // 10:
+        return 0
+    return line_count - max_lines
+
+
+class SpilledOutput(object):
+    """Lines removed from the beginning of an output, kept in a file."""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.lines = 0
+        if path and os.path.exists(path):
+            os.remove(path)
+
+    def append(self, text):
+        if self.path:
+            with open(self.path, 'a', encoding='utf-8') as spill:
+                spill.write(text)
+        self.lines += text.count('\n')
+
+    def read_lines(self, start=0, count=None):
+        """Returns `count` spilled lines starting from line `start`."""
+        if not self.path or not os.path.exists(self.path):
+            return []
+        with open(self.path, encoding='utf-8') as spill:
+            end = start + count if count is not None else None
+            return list(islice(spill, start, end))
+
+    def find(self, text, start=0):
+        """Returns the number of the first line from `start` containing `text`.
+
+        Matching is case-insensitive. Returns -1 if no line matches."""
+        text = text.lower()
+        for index, line in enumerate(self.read_lines(start), start):
+            if text in line.lower():
+                return index
+        return -1
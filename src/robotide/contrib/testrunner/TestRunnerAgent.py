@@ -65,6 +65,8 @@ json or pickle to send objects to the listening server. It should probably be
 refactored to call an XMLRPC server.
 """
 
+import base64
+import binascii
 import copy
 import os
 import pickle
@@ -72,6 +74,7 @@ import platform
 import sys
 import socket
 import threading
+import zlib
 
 PLATFORM = platform.python_implementation()
 
@@ -106,6 +109,10 @@ except ImportError:  # py3 <=3.6
     from io import StringIO
 
 HOST = "localhost"
+# Events sent immediately also when batching, after the events collected so far
+CONTROL_EVENTS = ('pid', 'port', 'paused', 'continue', 'close')
+# JSON messages longer than this are compressed when batching
+COMPRESS_THRESHOLD = 4096
 
 # Setting Output encoding to UTF-8 and ignoring the platform specs
 # RIDE will expect UTF-8
@@ -119,8 +126,10 @@ HOST = "localhost"
 class TestRunnerAgent:
     """Pass all listener events to a remote listener
 
-    If called with one argument, that argument is a port
-    If called with two, the first is a hostname, the second is a port
+    The first argument is a port and the second tells whether to pause on
+    failure. The optional third argument is an interval in milliseconds for
+    sending events in batches, and the fourth tells whether to send keyword
+    events at all.
     """
     ROBOT_LISTENER_API_VERSION = 2
 
@@ -130,7 +139,12 @@ class TestRunnerAgent:
         self.sock = None
         self.filehandler = None
         self.streamhandler = None
-        self._connect()
+        self._batch = None
+        batch_interval = int(args[2]) if len(args) >= 3 else 0
+        self._keyword_events = len(args) < 4 or args[3] == 'True'
+        self._connect(compress=batch_interval > 0)
+        if self.filehandler and batch_interval > 0:
+            self._batch = EventBatch(self._send_packet, batch_interval / 1000.0)
         self._send_pid()
         self._create_debugger((len(args) >= 2) and (args[1] == 'True'))
         self._create_kill_server()
@@ -183,7 +197,8 @@ class TestRunnerAgent:
         del attrs_copy['doc']
         del attrs_copy['assign']
 
-        self._send_socket("start_keyword", name, attrs_copy)
+        if self._keyword_events:
+            self._send_socket("start_keyword", name, attrs_copy)
         if self._debugger.is_breakpoint(name, attrs):  # must check original
             self._debugger.pause()
         paused = self._debugger.is_paused()
@@ -200,7 +215,8 @@ class TestRunnerAgent:
         del attrs_copy['doc']
         del attrs_copy['assign']
 
-        self._send_socket("end_keyword", name, attrs_copy)
+        if self._keyword_events:
+            self._send_socket("end_keyword", name, attrs_copy)
         self._debugger.end_keyword(attrs['status'] == 'PASS')
 
     def message(self, message):
@@ -230,18 +246,20 @@ class TestRunnerAgent:
 
     def close(self):
         self._send_socket("close")
+        if self._batch:
+            self._batch.close()
         if self.sock:
             self.filehandler.close()
             self.sock.close()
 
-    def _connect(self):
+    def _connect(self, compress=False):
         """Establish a connection for sending data"""
         try:
             self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.sock.connect((self.host, self.port))
             # Iron python does not return right object type if not binary mode
             self.filehandler = self.sock.makefile('wb')
-            self.streamhandler = StreamHandler(self.filehandler)
+            self.streamhandler = StreamHandler(self.filehandler, compress)
         except socket.error as ex:
             print('unable to open socket to "%s:%s" error: %s'
                   % (self.host, self.port, str(ex)))
@@ -249,11 +267,18 @@ class TestRunnerAgent:
             self.filehandler = None
 
     def _send_socket(self, name, *args):
+        if self._batch:
+            if name in CONTROL_EVENTS:
+                self._batch.send((name, args))
+            else:
+                self._batch.add(name, args)
+        elif self.filehandler:
+            self._send_packet((name, args))
+
+    def _send_packet(self, packet):
         try:
-            if self.filehandler:
-                packet = (name, args)
-                self.streamhandler.dump(packet)
-                self.filehandler.flush()
+            self.streamhandler.dump(packet)
+            self.filehandler.flush()
         except Exception:
             import traceback
             traceback.print_exc(file=sys.stdout)
@@ -261,6 +286,51 @@ class TestRunnerAgent:
             raise
 
 
+class EventBatch(object):
+    """Collects listener events and sends them as one `batch` packet.
+
+    Events are sent when `interval` seconds have passed, when `MAX_EVENTS`
+    events are collected, or before a packet sent with `send`.
+    """
+    MAX_EVENTS = 500
+
+    def __init__(self, send_packet, interval):
+        self._send_packet = send_packet
+        self._interval = interval
+        self._events = []
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_periodically)
+        self._flusher.daemon = True
+        self._flusher.start()
+
+    def add(self, name, args):
+        with self._lock:
+            self._events.append((name, args))
+            if len(self._events) >= self.MAX_EVENTS:
+                self._flush()
+
+    def send(self, packet):
+        with self._lock:
+            self._flush()
+            self._send_packet(packet)
+
+    def close(self):
+        self._closed.set()
+        with self._lock:
+            self._flush()
+
+    def _flush_periodically(self):
+        while not self._closed.wait(self._interval):
+            with self._lock:
+                self._flush()
+
+    def _flush(self):
+        if self._events:
+            events, self._events = self._events, []
+            self._send_packet(('batch', (events,)))
+
+
 class RobotDebugger(object):
 
     def __init__(self, pause_on_failure=False):
@@ -380,6 +450,7 @@ class DecodeError(StreamError):
     wrapped_exceptions = (pickle.UnpicklingError,)
     if _JSONAVAIL and hasattr(json, 'JSONDecodeError'):
         wrapped_exceptions = (pickle.UnpicklingError, json.JSONDecodeError)
+    wrapped_exceptions += (zlib.error, binascii.Error)
 
 
 def dump(obj, fp):
@@ -444,11 +515,13 @@ class StreamHandler(object):
     loads = staticmethod(loads)
     dumps = staticmethod(dumps)
 
-    def __init__(self, fp):
+    def __init__(self, fp, compress=False):
         """
         Stream handler that encodes objects as either JSON (if available) with
         message length header prepended for sending over a socket, or as a
         pickled object if using python < 2.6 and simplejson is not installed.
+        With `compress`, long JSON messages are sent zlib compressed and
+        base64 encoded.
 
         Since 'pickle.load' has memory leak issues with memoization (remembers
         absolutely everything decoded since instantiation), json is a preferred
@@ -466,6 +539,7 @@ class StreamHandler(object):
             self._json_decoder = staticmethod(json_not_impl)
             self._json_encoder = staticmethod(json_not_impl)
         self.fp = fp
+        self.compress = compress
 
     def dump(self, obj):
         """
@@ -483,7 +557,11 @@ class StreamHandler(object):
         if _JSONAVAIL:
             try:
                 s = self._json_encoder(obj)
-                write_list.append('J')
+                if self.compress and len(s) > COMPRESS_THRESHOLD:
+                    s = base64.b64encode(zlib.compress(s.encode('UTF-8'))).decode('ascii')
+                    write_list.append('Z')
+                else:
+                    write_list.append('J')
                 write_list.extend([str(len(s)), '|', s])
             except Exception as ex:
                 # Probably just failed to JSON-encode an object; try pickle.
@@ -517,6 +595,8 @@ class StreamHandler(object):
         try:
             if msgtype == 'J':
                 return self._json_decoder(buff.getvalue())
+            elif msgtype == 'Z':
+                return self._json_decoder(zlib.decompress(base64.b64decode(buff.getvalue())).decode('UTF-8'))
             elif msgtype == 'P':
                 return pickle.loads(buff.getvalue())
             else:
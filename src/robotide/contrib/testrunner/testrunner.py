@@ -67,8 +67,8 @@ class TestRunner(object):
         self._named_suite = ''
         self._suite_name = None
 
-    def enable(self, result_handler):
-        self._start_listener_server(result_handler)
+    def enable(self, result_handler, batch_handler=None):
+        self._start_listener_server(result_handler, batch_handler)
 
     def add_profile(self, name, item):
         self.profiles[name] = item
@@ -83,12 +83,22 @@ class TestRunner(object):
     def get_profile_names(self):
         return sorted(self.profiles.keys())
 
-    def _start_listener_server(self, result_handler):
+    def _start_listener_server(self, result_handler, batch_handler=None):
         def handle(*args):
             self._result_handler(*args)
             result_handler(*args)
 
-        self._server = RideListenerServer(RideListenerHandler, handle)
+        def handle_batch(events):
+            for name, args in events:
+                self._result_handler(name, *args)
+            if batch_handler:
+                batch_handler(events)
+            else:
+                for name, args in events:
+                    result_handler(name, *args)
+
+        self._server = RideListenerServer(RideListenerHandler, handle,
+                                          handle_batch)
         self._server_thread = threading.Thread(
             target=self._server.serve_forever)
         # DEPRECATED: self._server_thread.setDaemon(True)
@@ -130,11 +140,18 @@ class TestRunner(object):
                                                                    testname))
 
     def _get_test_controller(self, longname, testname=None):
-        ret = self._project.find_controller_by_longname(longname, testname)
-        if not ret and self._named_suite:
-            ret = self._project.find_controller_by_longname(longname.replace(self._named_suite, self._suite_name)
-                                                            .strip('.'), testname)
-        return ret
+        longnames = [longname]
+        if self._named_suite:
+            longnames.append(longname.replace(self._named_suite, self._suite_name).strip('.'))
+        for name in longnames:
+            ret = self._project.longname_index.find(name)
+            if ret:
+                return ret
+        for name in longnames:
+            ret = self._project.find_controller_by_longname(name, testname)
+            if ret:
+                return ret
+        return None
 
     def clear_server(self):
         self._server = None
@@ -174,9 +191,9 @@ class TestRunner(object):
         if self._process:
             self._process.step_over()
 
-    def run_command(self, command, cwd):
+    def run_command(self, command, cwd, on_output=None):
         self._pid_to_kill = None
-        self._process = Process(cwd)
+        self._process = Process(cwd, on_output)
         self._process.run_command(command)
 
     def get_output_and_errors(self, profile):
@@ -207,9 +224,10 @@ class RideListenerServer(SocketServer.TCPServer):
     """Implements a simple line-buffered socket server"""
     allow_reuse_address = True
 
-    def __init__(self, request_handler_class, callback):
+    def __init__(self, request_handler_class, callback, batch_callback=None):
         SocketServer.TCPServer.__init__(self, ("", 0), request_handler_class)
         self.callback = callback
+        self.batch_callback = batch_callback
 
 
 class RideListenerHandler(SocketServer.StreamRequestHandler):
@@ -218,7 +236,10 @@ class RideListenerHandler(SocketServer.StreamRequestHandler):
         while True:
             try:
                 (name, args) = decoder.load()
-                self.server.callback(name, *args)
+                if name == 'batch' and self.server.batch_callback:
+                    self.server.batch_callback(args[0])
+                else:
+                    self.server.callback(name, *args)
             except (EOFError, IOError):
                 # I should log this...
                 break
@@ -54,7 +54,6 @@ import tempfile
 import threading
 import time
 import os
-import psutil
 import re
 import wx
 import wx.stc
@@ -71,6 +70,7 @@ from robotide.contrib.testrunner.CommandArgs import CommandArgs
 from robotide.contrib.testrunner.Command import Command
 from robotide.contrib.testrunner.FileWriter import FileWriter
 from robotide.contrib.testrunner.SettingsParser import SettingsParser
+from robotide.contrib.testrunner.SpilledOutput import SpilledOutput, lines_over_limit
 from robotide.controller.macrocontrollers import TestCaseController
 from robotide.controller.filecontrollers import start_filemanager
 from robotide.publish import RideSettingsChanged, PUBLISHER
@@ -136,6 +136,9 @@ class TestRunnerPlugin(Plugin):
                 "show_console_log": True,
                 "show_message_log": True,
                 "active_status_bar": True,
+                "listener_batch_interval": 0,
+                "listener_keyword_events": True,
+                "output_max_lines": 20000,
                 "sash_position": 200,
                 "run_profiles":
                     [('jybot', 'jybot' + ('.bat' if os.name == 'nt' else '')),
@@ -172,15 +175,12 @@ class TestRunnerPlugin(Plugin):
         self._controls = {}
         self._running = False
         self._currently_executing_keyword = None
+        self._output_pending = False
         self._test_runner = TestRunner(application.model)
         self._register_shortcuts()
         self._min_log_level_number = LOG_LEVELS['INFO']
         self._pause_on_failure = False
         self._selected_tests: {TestCaseController} = set()
-        self._process = psutil.Process()
-        self._initmemory = None
-        self._limitmemory = None  # This will be +80%
-        self._maxmemmsg = None
         self._named_suite = ''
         self.active_status_bar = self.__getattr__('active_status_bar')
         self.use_colors = self.__getattr__('use colors')
@@ -228,7 +228,8 @@ class TestRunnerPlugin(Plugin):
         self._add_tab_to_notebook()
         self._init_profile_choice(self.profile_name)
         self._subscribe_to_events()
-        self._test_runner.enable(self._test_runner_events_handler)
+        self._test_runner.enable(self._test_runner_events_handler,
+                                 self._test_runner_batch_handler)
         self._set_stopped()
         self._create_temporary_directory()
 
@@ -316,11 +317,6 @@ class TestRunnerPlugin(Plugin):
         self._test_runner.shutdown_server()
         event.Skip()
 
-    def _reset_memory_calc(self):
-        self._initmemory = self._process.memory_info()[0]
-        self._limitmemory = self._initmemory * 1.80
-        self._maxmemmsg = None
-
     def on_stop(self, event):
         """Called when the user clicks the "Stop" button
 
@@ -328,7 +324,6 @@ class TestRunnerPlugin(Plugin):
         same effect as typing control-c when running from the
         command line."""
         __ = event
-        self._reset_memory_calc()
         self._append_to_console_log(_('[ SENDING STOP SIGNAL ]\n'),
                                     source='stderr')
         self._test_runner.send_stop_signal()
@@ -337,7 +332,6 @@ class TestRunnerPlugin(Plugin):
 
     def on_pause(self, event):
         __ = event
-        self._reset_memory_calc()
         self._append_to_console_log(_('[ SENDING PAUSE SIGNAL ]\n'))
         self._test_runner.send_pause_signal()
         if self.active_status_bar:
@@ -345,7 +339,6 @@ class TestRunnerPlugin(Plugin):
 
     def on_continue(self, event):
         __ = event
-        self._reset_memory_calc()
         self._append_to_console_log(_('[ SENDING CONTINUE SIGNAL ]\n'))
         self._test_runner.send_continue_signal()
         if self.active_status_bar:
@@ -353,7 +346,6 @@ class TestRunnerPlugin(Plugin):
 
     def on_step_next(self, event):
         __ = event
-        self._reset_memory_calc()
         self._append_to_console_log(_('[ SENDING STEP NEXT SIGNAL ]\n'))
         self._test_runner.send_step_next_signal()
         if self.active_status_bar:
@@ -361,7 +353,6 @@ class TestRunnerPlugin(Plugin):
 
     def on_step_over(self, event):
         __ = event
-        self._reset_memory_calc()
         self._append_to_console_log(_('[ SENDING STEP OVER SIGNAL ]\n'))
         self._test_runner.send_step_over_signal()
         if self.active_status_bar:
@@ -387,7 +378,6 @@ class TestRunnerPlugin(Plugin):
                 and not self._ask_user_to_run_anyway():
             # In Linux NO runs dialog 4 times
             return
-        self._reset_memory_calc()
         profile = self.get_current_profile()
         self.use_colors = self.__getattr__('use colors')
         command_args = self._create_command_args(profile.get_command_args(), log_level, self.use_colors)
@@ -399,7 +389,8 @@ class TestRunnerPlugin(Plugin):
         # DEBUG on Py3 it not shows correct if tags with latin chars
         self._append_to_console_log(_("command: %s\n") % command)
         try:
-            self._test_runner.run_command(command, self._get_current_working_dir(profile))
+            self._test_runner.run_command(command, self._get_current_working_dir(profile),
+                                          self._on_process_output)
             self._process_timer.Start(41)  # roughly 24fps
             self._set_running()
             self._progress_bar.Start()
@@ -429,7 +420,9 @@ class TestRunnerPlugin(Plugin):
         return Command().with_prefix(profile_command) \
             .with_args_file(args_file) \
             .with_listener(self._test_runner.get_listener_port(),
-                           self._pause_on_failure) \
+                           self._pause_on_failure,
+                           self.__getattr__('listener_batch_interval'),
+                           self.__getattr__('listener_keyword_events')) \
             .with_tests_suite_file(self.model.suite.source) \
             .build()
 
@@ -491,14 +484,9 @@ class TestRunnerPlugin(Plugin):
         self._log_message_queue = Queue()
 
     def _clear_log_ctrls(self):
-        self._clear_text_ctrl(self._console_log_ctrl)
-        self._clear_text_ctrl(self._message_log_ctrl)
-
-    @staticmethod
-    def _clear_text_ctrl(text_ctrl):
-        text_ctrl.SetReadOnly(False)
-        text_ctrl.ClearAll()
-        text_ctrl.SetReadOnly(True)
+        max_lines = self.__getattr__('output_max_lines')
+        self._console_log_ctrl.clear(max_lines, os.path.join(self._default_output_dir, 'console_log.txt'))
+        self._message_log_ctrl.clear(max_lines, os.path.join(self._default_output_dir, 'message_log.txt'))
 
     def on_open_logs_directory(self, event):
         """Called when the user clicks on the "Open Logs Directory" button"""
@@ -586,18 +574,27 @@ class TestRunnerPlugin(Plugin):
         """Get process output"""
         __ = event
         if not self._log_message_queue.empty():
-            if self._process.memory_info()[0] <= self._limitmemory:
-                texts = []
-                while not self._log_message_queue.empty():
-                    texts += [self._log_message_queue.get()]
-                self._append_to_message_log('\n' + '\n'.join(texts))
-            else:
-                if not self._maxmemmsg:
-                    self._maxmemmsg = '\n' + _("Messages log exceeded 80% of process memory, stopping for now...")
-                    self._append_to_message_log(self._maxmemmsg, "stderr")
+            texts = []
+            while not self._log_message_queue.empty():
+                texts += [self._log_message_queue.get()]
+            self._append_to_message_log('\n' + '\n'.join(texts))
         if not self._test_runner.is_running():
             self.on_process_ended(None)
             return
+        self._append_process_output()
+
+    def _on_process_output(self):
+        """Called from the reader threads when the test process has output"""
+        if not self._output_pending:
+            self._output_pending = True
+            wx.CallAfter(self._show_process_output)
+
+    def _show_process_output(self):
+        self._output_pending = False
+        if self._test_runner.is_running():
+            self._append_process_output()
+
+    def _append_process_output(self):
         out_buffer, err_buffer, __ = self._test_runner.get_output_and_errors(self.get_current_profile())
         if len(out_buffer) > 0:
             self._append_to_console_log(out_buffer, source="stdout")
@@ -690,8 +687,14 @@ class TestRunnerPlugin(Plugin):
 
         text_ctrl.SetReadOnly(True)
         if last_visible_line >= line_count - 4:
+            text_ctrl.limit_lines()
             line_count = text_ctrl.GetLineCount()
             text_ctrl.ScrollToLine(line_count)
+        else:
+            first_visible_line = text_ctrl.GetFirstVisibleLine()
+            removed = text_ctrl.limit_lines()
+            if removed:
+                text_ctrl.SetFirstVisibleLine(max(first_visible_line - removed, 0))
 
     def parse_colors(self, txt):
         # print(f"DEBUG: enter parse_colors {txt}")
@@ -1094,6 +1097,27 @@ class TestRunnerPlugin(Plugin):
         if event == 'continue':
             self._handle_continue(args)
 
+    def _test_runner_batch_handler(self, events):
+        """Endpoint of the listener interface for batched events
+
+        Consecutive log messages of the batch are queued as one message, so
+        that they are written to the message log in one update."""
+        if not self.panel:
+            return
+        messages = []
+        for event, args in events:
+            if event == 'log_message':
+                message = self._format_log_message(args)
+                if message is not None:
+                    messages.append(message)
+                continue
+            if messages:
+                self._log_message_queue.put('\n'.join(messages))
+                messages = []
+            self._test_runner_events_handler(event, *args)
+        if messages:
+            self._log_message_queue.put('\n'.join(messages))
+
     def _handle_start_test(self, args):
         longname = args[1]['longname'].encode('utf-8')
         self._log_message_queue.put(
@@ -1127,13 +1151,19 @@ class TestRunnerPlugin(Plugin):
         self._progress_bar.empty_current_keyword()
 
     def _handle_log_message(self, args):
+        message = self._format_log_message(args)
+        if message is not None:
+            self._log_message_queue.put(message)
+
+    def _format_log_message(self, args):
         a = args[0]
-        if LOG_LEVELS[a['level']] >= self._min_log_level_number:
-            prefix = '%s : %s : ' % (a['timestamp'], a['level'].rjust(5))
-            message = a['message']
-            if '\n' in message:
-                message = '\n' + message
-            self._log_message_queue.put(prefix + message)
+        if LOG_LEVELS[a['level']] < self._min_log_level_number:
+            return None
+        prefix = '%s : %s : ' % (a['timestamp'], a['level'].rjust(5))
+        message = a['message']
+        if '\n' in message:
+            message = '\n' + message
+        return prefix + message
 
     def _handle_paused(self, args):
         __ = args
@@ -1345,6 +1375,72 @@ class ProgressBar(wx.Panel):
                reduce(lambda ll, b: divmod(ll[0], b) + ll[1:], [(t,), 60, 60])
 
 
+class SpilledOutputDialog(RIDEDialog):
+    """Pages and searches output lines moved to a spill file."""
+    PAGE_SIZE = 1000
+
+    def __init__(self, spilled, parent):
+        RIDEDialog.__init__(self, title=spilled.path, parent=parent, size=(800, 600))
+        self._spilled = spilled
+        self._start = 0
+        self._text = wx.TextCtrl(self, style=wx.TE_MULTILINE | wx.TE_READONLY | wx.HSCROLL)
+        self._search = wx.TextCtrl(self, style=wx.TE_PROCESS_ENTER)
+        self._search.Bind(wx.EVT_TEXT_ENTER, self.on_find_next)
+        self._status = Label(self)
+        buttons = wx.BoxSizer(wx.HORIZONTAL)
+        buttons.Add(self._search, 1, wx.ALL | wx.EXPAND, 3)
+        for label, handler in ((_('Find next'), self.on_find_next),
+                               (_('Previous'), self.on_previous),
+                               (_('Next'), self.on_next)):
+            buttons.Add(ButtonWithHandler(self, label, handler=handler, fsize=self.font_size,
+                                          color_secondary_foreground=self.color_secondary_foreground,
+                                          color_secondary_background=self.color_secondary_background),
+                        0, wx.ALL, 3)
+        buttons.Add(self._status, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 3)
+        sizer = wx.BoxSizer(wx.VERTICAL)
+        sizer.Add(self._text, 1, wx.ALL | wx.EXPAND, 3)
+        sizer.Add(buttons, 0, wx.EXPAND)
+        self.SetSizer(sizer)
+        self._show_page(0)
+
+    def on_previous(self, event):
+        self._show_page(self._start - self.PAGE_SIZE)
+
+    def on_next(self, event):
+        if self._start + self.PAGE_SIZE < self._spilled.lines:
+            self._show_page(self._start + self.PAGE_SIZE)
+
+    def on_find_next(self, event):
+        text = self._search.GetValue()
+        if not text:
+            return
+        line = self._spilled.find(text, self._start + self._current_line() + 1)
+        if line == -1:
+            self._status.SetLabel(_('Not found'))
+            return
+        self._show_page(line - line % self.PAGE_SIZE)
+        self._select_line(line - self._start)
+
+    def _show_page(self, start):
+        self._start = max(0, start)
+        lines = self._spilled.read_lines(self._start, self.PAGE_SIZE)
+        self._text.SetValue(''.join(lines))
+        self._status.SetLabel(_('Lines %d-%d of %d') % (self._start + 1, self._start + len(lines),
+                                                       self._spilled.lines))
+
+    def _current_line(self):
+        start, end = self._text.GetSelection()
+        if start == end:
+            return -1
+        return self._text.PositionToXY(start)[2]
+
+    def _select_line(self, line):
+        start = self._text.XYToPosition(0, line)
+        self._text.SetSelection(start, start + self._text.GetLineLength(line))
+        self._text.ShowPosition(start)
+        self._text.SetFocus()
+
+
 class OutputStyledTextCtrl(wx.stc.StyledTextCtrl):
 
     def __init__(self, parent):
@@ -1353,6 +1449,52 @@ class OutputStyledTextCtrl(wx.stc.StyledTextCtrl):
         app_settings = self._get_app_settings(parent)
         self.stylizer = OutputStylizer(self, app_settings)
         self._max_row_len = 0
+        self._max_lines = 0
+        self._spilled = SpilledOutput()
+        self.Bind(wx.EVT_LEFT_DCLICK, self.on_double_click)
+
+    def on_double_click(self, event):
+        """Opens the spilled lines when the note on the first line is double-clicked."""
+        if self._spilled.lines and self._spilled.path and \
+                self.LineFromPosition(self.PositionFromPoint(event.GetPosition())) == 0:
+            dialog = SpilledOutputDialog(self._spilled, self)
+            dialog.ShowModal()
+            dialog.Destroy()
+        else:
+            event.Skip()
+
+    def clear(self, max_lines=0, spill_path=None):
+        """Clears the output and sets how many lines it keeps.
+
+        Older lines are moved to the file `spill_path`."""
+        self.SetReadOnly(False)
+        self.ClearAll()
+        self.SetReadOnly(True)
+        self._max_lines = max_lines
+        self._spilled = SpilledOutput(spill_path)
+
+    def limit_lines(self):
+        """Moves lines over the limit to the spill file.
+
+        The first line then tells how many lines were moved and where.
+        Returns the change in the number of lines."""
+        note_lines = 1 if self._spilled.lines else 0
+        excess = lines_over_limit(self.GetLineCount() - note_lines, self._max_lines)
+        if not excess:
+            return 0
+        end = self.PositionFromLine(note_lines + excess)
+        self._spilled.append(self.GetTextRange(self.PositionFromLine(note_lines), end))
+        self.SetReadOnly(False)
+        self.DeleteRange(0, end)
+        self.InsertText(0, self._spilled_note())
+        self.SetReadOnly(True)
+        return excess + note_lines - 1
+
+    def _spilled_note(self):
+        if self._spilled.path:
+            return _('[ %d earlier lines in %s, double-click to view ]\n') % (self._spilled.lines,
+                                                                              self._spilled.path)
+        return _('[ %d earlier lines removed ]\n') % self._spilled.lines
 
     def update_scroll_width(self, string):
         if isinstance(string, bytes):
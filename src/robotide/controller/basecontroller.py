@@ -64,6 +64,10 @@ class ControllerWithParent(_BaseController):
     def datafiles(self):
         return self._parent.datafiles
 
+    @property
+    def usage_index(self):
+        return self._parent.usage_index
+
     @property
     def language(self):
         return self._parent.datafile_controller._language
@@ -260,6 +260,15 @@ class SetDataFile(_Command):
         context.set_datafile(self._datafile)
 
 
+class UpdateDataFile(SetDataFile):
+    """Like `SetDataFile`, but updates only the changed tests and keywords when possible."""
+
+    def execute(self, context):
+        context.mark_dirty()
+        if not context.apply_datafile_changes(self._datafile):
+            context.set_datafile(self._datafile)
+
+
 class _StepsChangingCommand(_ReversibleCommand):
 
     def _execute(self, context):
@@ -691,7 +700,7 @@ class FindOccurrences(_Command):
             raise ValueError('Keyword name can not be "%s"' % keyword_name)
         self.normalized_name = normalize_kw_name(keyword_name)
         # print(f"DEBUG: ctlcommands.py FindOccurrences INIT keyword_name={keyword_name}")
-        self._keyword_name = keyword_name
+        self._keyword_name = self._searched_name = keyword_name
         self._keyword_info = keyword_info
         self.normalized_name_res = None
         if self._keyword_info:
@@ -739,6 +748,11 @@ class FindOccurrences(_Command):
         return self._find_occurrences_in(self._items_from(context))
 
     def _items_from(self, context):
+        usage_index = getattr(context, 'usage_index', None)
+        if usage_index:
+            for item in self._items_from_usage_index(context, usage_index):
+                yield item
+            return
         for df in context.datafiles:
             # print(f"DEBUG: ctrlcommands FindOccurrences _items_from FILENAME: df={df.source}")
             self._yield_for_other_threads()
@@ -746,6 +760,24 @@ class FindOccurrences(_Command):
                 for item in self._items_from_datafile(df):
                     yield item
 
+    def _items_from_usage_index(self, context, usage_index):
+        names = self._indexed_names()
+        for df in context.datafiles:
+            self._yield_for_other_threads()
+            # Resolving the keyword source is slow, do it only for files possibly using the keyword
+            candidates = usage_index.keyword_items(df, names)
+            if candidates and self._items_from_datafile_should_be_checked(df):
+                for item, keyword in candidates:
+                    if keyword is None or keyword.source == self._keyword_source:
+                        yield item
+
+    def _indexed_names(self):
+        if variablematcher.contains_scalar_variable(self._searched_name) and \
+                not variablematcher.is_variable(self._searched_name):
+            return None  # Embedded arguments can match anything
+        return [name for name in (self._searched_name, self._keyword_name, self.normalized_name,
+                                  self.normalized_name_res) if name]
+
     def _items_from_datafile_should_be_checked(self, datafile):
         if datafile.filename and \
                 os.path.basename(datafile.filename) == self._keyword_source:
@@ -839,6 +871,7 @@ class FindOccurrences(_Command):
 
 
 class FindVariableOccurrences(FindOccurrences):
+    _scope = None  # Datafiles where the variable can be used, `None` if not limited
 
     def _contains_item(self, item):
         self._yield_for_other_threads()
@@ -866,23 +899,27 @@ class FindVariableOccurrences(FindOccurrences):
             for item in self._items_from_controller(context):
                 yield item
         else:
+            self._scope = self._datafiles_in_scope()
+            usage_index = getattr(context, 'usage_index', None)
+            names = [name for name in (self._keyword_name, self.normalized_name,
+                                       self.prefix and self.normalized_name_res) if name]
             for df in context.datafiles:
                 self._yield_for_other_threads()
                 if self._items_from_datafile_should_be_checked(df):
-                    for item in self._items_from_datafile(df):
+                    items = usage_index.variable_items(df, names) if usage_index else self._items_from_datafile(df)
+                    for item in items:
                         yield item
 
     def _items_from_datafile_should_be_checked(self, datafile):
+        return self._scope is None or datafile in self._scope
+
+    def _datafiles_in_scope(self):
         if self._is_file_variable(self._keyword_name, self._context):
-            return datafile in [self._context.datafile_controller] + \
-                self._get_all_where_used(self._context)
-        elif self._is_imported_variable(self._keyword_name, self._context):
-            return datafile in [self._get_source_of_imported_var(
-                self._keyword_name, self._context)] + \
-                self._get_all_where_used(self._get_source_of_imported_var(
-                    self._keyword_name, self._context))
-        else:
-            return True
+            return [self._context.datafile_controller] + self._get_all_where_used(self._context)
+        source = self._get_source_of_imported_var(self._keyword_name, self._context)
+        if source not in [None, self._context.datafile_controller]:
+            return [source] + self._get_all_where_used(source)
+        return None
 
     @staticmethod
     def _is_local_variable(name, context):
@@ -0,0 +1,93 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""Finds the tests and keywords that differ between two parsed datafiles.
+
+Used when applying changes from the text editor, so that only the changed
+tests and keywords are updated instead of replacing the whole datafile.
+"""
+
+from .. import robotapi
+
+
+class ItemChange(object):
+
+    def __init__(self, old, new):
+        self.old = old
+        self.new = new
+        self.name_changed = old.name != new.name
+        self.settings_changed = _settings_rows(old) != _settings_rows(new)
+        self.steps_changed = _steps_rows(old.steps) != _steps_rows(new.steps)
+
+    @property
+    def changed(self):
+        return self.name_changed or self.settings_changed or self.steps_changed
+
+    def apply(self):
+        """Moves the name, settings and steps of the new item to the old one."""
+        old, new = self.old, self.new
+        old.name = new.name
+        if self.settings_changed:
+            for attribute, setting in list(vars(new).items()):
+                if isinstance(setting, robotapi.Setting):
+                    setting.parent = old
+                    setattr(old, attribute, setting)
+        if self.steps_changed:
+            for step in new.steps:
+                if getattr(step, 'parent', None) is new:
+                    step.parent = old
+            old.steps = new.steps
+
+
+def diff_datafiles(old, new):
+    """Returns `(tests, keywords)`, lists of `(index, ItemChange)` pairs.
+
+    Returns None if the datafiles differ also otherwise, for example if
+    settings or variables changed, or tests or keywords were added or
+    removed. Tests and keywords are compared by their position in the file.
+    """
+    if type(old) is not type(new) or _file_rows(old) != _file_rows(new):
+        return None
+    changes = []
+    for old_items, new_items in ((old.testcase_table.tests, new.testcase_table.tests),
+                                 (old.keyword_table.keywords, new.keyword_table.keywords)):
+        if len(old_items) != len(new_items):
+            return None
+        changes.append([(index, change) for index, change in
+                        enumerate(ItemChange(o, n) for o, n in zip(old_items, new_items)) if change.changed])
+    return tuple(changes)
+
+
+def _file_rows(data):
+    rows = [getattr(data, '_language', None), getattr(data, '_preamble', None),
+            [getattr(table, 'type', None) for table in data.tables]]
+    for table in (data.setting_table, data.variable_table, data.comment_table):
+        rows.append([item.as_list() for item in table] if table is not None else None)
+    for table in (data.setting_table, data.variable_table, data.testcase_table, data.keyword_table):
+        rows.append(getattr(table, '_header', None))
+    return rows
+
+
+def _settings_rows(item):
+    return [setting.as_list() for setting in item.settings]
+
+
+def _steps_rows(steps):
+    rows = []
+    for step in steps:
+        rows.append(step.as_list())
+        if step.is_for_loop():
+            rows.append(_steps_rows(step.steps))
+    return rows
@@ -14,12 +14,23 @@
 #  limitations under the License.
 
 import os
-from threading import Thread
+import pickle
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from threading import Thread, local
 
 from robotide.lib.compat.parsing import language as lang
 from robotide.lib.robot.errors import DataError
+from robotide.lib.robot.output import LOGGER
+from robotide.lib.robot.parsing.populators import FromDirectoryPopulator, NoTestsFound
 from .. import robotapi
 
+PARSE_TIMEOUT = 60.0
+# Packages needed by the worker processes parsing files, see `worker_command`
+_WORKER_PACKAGES = ('robotide', 'robotide.spec', 'robotide.controller')
+# Attributes of parsed files referring to objects of RIDE process
+_DETACHED = ('parent', 'settings', '_settings')
+
 
 class DataLoader(object):
 
@@ -102,8 +113,22 @@ class _DataLoader(_DataLoaderThread):
                 self.language = lang.check_file_language(self._path)
             except (OSError, IOError, UnicodeDecodeError):
                 self.language = 'en'
+        workers = self._settings.get('suite loading workers', 0) if self._settings else 0
+        # More worker processes than processors only add overhead
+        workers = min(workers, os.cpu_count() or 1)
+        if workers > 1 and os.path.isdir(self._path):
+            return self._load_in_parallel(workers)
         return test_data(source=self._path, settings=self._settings, language=self.language)
 
+    def _load_in_parallel(self, workers):
+        # The directory tree is discovered in this thread, files are parsed in worker processes
+        with _ParserPool(workers) as executor:
+            data = test_data(source=self._path, settings=self._settings, language=self.language,
+                             executor=executor)
+            if isinstance(data, TestDataDirectoryWithExcludes):
+                data.resolve_children()
+        return data
+
 
 class _InitFileLoader(_DataLoaderThread):
 
@@ -140,20 +165,167 @@ class _ResourceLoader(_DataLoaderThread):
 
 class TestDataDirectoryWithExcludes(robotapi.TestDataDirectory):
 
-    def __init__(self, parent, source, settings, language=None):
+    def __init__(self, parent, source, settings, language=None, executor=None):
         self._settings = settings
         self.language = language
+        self._executor = executor
         robotapi.TestDataDirectory.__init__(self, parent, source, settings=self._settings, language=self.language)
 
+    def populate(self, include_suites=None, extensions=None, recurse=True):
+        if not self._executor:
+            return robotapi.TestDataDirectory.populate(self, include_suites, extensions, recurse)
+        # Children being parsed are kept until resolve_children is called
+        FromDirectoryPopulator().populate(self.source, self, include_suites,
+                                          extensions, recurse, self._tab_size)
+        return self
+
     def add_child(self, path, include_suites, extensions=None,
                   warn_on_skipped=False, language=None):
-        if not self._settings.excludes.contains(path):
-            self.children.append(test_data(parent=self, source=path, settings=self._settings, language=self.language))
-        else:
+        if self._settings.excludes.contains(path):
             self.children.append(ExcludedDirectory(self, path, language=self.language))
+        elif self._executor and not os.path.isdir(path):
+            self.children.append(_ParsedFile(self, path, self._settings, self.language, self._executor))
+        else:
+            self.children.append(test_data(parent=self, source=path, settings=self._settings, language=self.language,
+                                           executor=self._executor))
+
+    def resolve_children(self):
+        """Waits until children parsed in parallel are ready.
+
+        Like `populate` does when loading sequentially, children without
+        tests are removed.
+        """
+        children = []
+        for child in self.children:
+            if isinstance(child, _ParsedFile):
+                child = child.result()
+            elif isinstance(child, TestDataDirectoryWithExcludes):
+                child.resolve_children()
+            if child is not None and child.has_tests():
+                children.append(child)
+        self.children = children
+        self._executor = None
+
+
+class _ParserPool(object):
+    """Parses test data files in worker processes.
+
+    Each thread of the pool uses its own worker process, so files are parsed
+    in parallel instead of taking turns on the GIL of RIDE process.
+    """
+
+    def __init__(self, workers, timeout=PARSE_TIMEOUT):
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._timeout = timeout
+        self._local = local()
+        self._workers = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+    def submit(self, path, settings, language):
+        """Returns a future of the `(status, value)` response for parsing `path`."""
+        tab_size = settings.get('txt number of spaces', 2) if settings else 2
+        return self._executor.submit(self._parse, (path, language, tab_size))
+
+    def _parse(self, task):
+        worker = getattr(self._local, 'worker', None)
+        if worker is None:
+            from ..spec.libraryimporter import WorkerProcess, worker_command
+            worker = self._local.worker = WorkerProcess(worker_command(__name__, _WORKER_PACKAGES),
+                                                        self._timeout)
+            self._workers.append(worker)
+        return worker.call(task, "test data file '%s'" % task[0])
+
+    def shutdown(self):
+        self._executor.shutdown()
+        for worker in self._workers:
+            worker.close()
+        self._workers = []
+
+
+class _ParsedFile(object):
+    """Test data file parsed in a worker process of the loading pool.
+
+    Files found in the parsed model cache are not sent to the pool, and a file
+    the worker process fails to parse is parsed in RIDE process.
+    """
+
+    def __init__(self, parent, path, settings, language, executor):
+        from ..namespace.modelcache import get_model_cache  # Avoid circular import via namespace package
+        self._parent = parent
+        self._path = path
+        self._settings = settings
+        self._language = language
+        self._model_cache = get_model_cache(settings)
+        self._cached = None
+        if self._model_cache:
+            # Cache entries are keyed by the language `test_data` finds for the file
+            self._language = language = language if language else lang.check_file_language(path)
+            self._cached = self._model_cache.get(path, language, 'test data', parent, settings)
+        self._future = executor.submit(path, settings, language) if not self._cached else None
+
+    def result(self):
+        if self._cached:
+            datafile, tasks = self._cached
+            error = None
+        else:
+            datafile, tasks, error = self._parsed()
+        # Parsed files set `tasks` of their parent in the order they are loaded
+        if tasks is not None:
+            self._parent.tasks = tasks
+        if isinstance(error, NoTestsFound):
+            LOGGER.info("Data source '%s' has no tests or tasks." % self._path)
+        elif error:
+            LOGGER.error("Parsing '%s' failed: %s" % (self._path, error.message))
+        return datafile
+
+    def _parsed(self):
+        status, value = self._future.result()
+        if status != 'ok':
+            return self._parse_here()
+        datafile, attached, tasks, error, messages = value
+        for message, level in messages:
+            LOGGER.write(message, level)
+        if datafile is not None:
+            values = {'parent': self._parent, 'settings': self._settings, '_settings': self._settings}
+            for name in attached:
+                setattr(datafile, name, values[name])
+            if self._model_cache:
+                self._model_cache.put(self._path, self._language, 'test data', datafile, tasks)
+        return datafile, tasks, error
+
+    def _parse_here(self):
+        recorder = _ParentRecorder(self._parent)
+        try:
+            datafile = test_data(parent=recorder, source=self._path, settings=self._settings,
+                                 language=self._language)
+        except DataError as err:
+            return None, recorder.tasks, err
+        if datafile is not None and datafile.parent is recorder:
+            datafile.parent = self._parent
+        return datafile, recorder.tasks, None
 
 
-def test_data(source, parent=None, settings=None, language=None):
+class _ParentRecorder(object):
+    """Stands for the parent directory while a child file is parsed.
+
+    Changes to `tasks` are recorded instead of modifying the parent from
+    several threads, everything else is read from the parent.
+    """
+
+    def __init__(self, parent):
+        self._parent = parent
+        self.tasks = None
+
+    def __getattr__(self, name):
+        return getattr(self._parent, name)
+
+
+def test_data(source, parent=None, settings=None, language=None, executor=None):
     """Parses a file or directory to a corresponding model object.
 
     :param source: path where test data is read from.
@@ -170,12 +342,20 @@ def test_data(source, parent=None, settings=None, language=None):
                 language = lang.check_file_language(init_file)
                 # print(f"DEBUG: Dataloader TestCaseFile init file {init_file=}\n"
                 #       f" language={language} {source=}")
-        data = TestDataDirectoryWithExcludes(parent, source, settings, language)
+        data = TestDataDirectoryWithExcludes(parent, source, settings, language, executor)
         # print("DEBUG: Dataloader testdata %s\n" % data.name)
         data.populate()
         # print("DEBUG: Dataloader after populate %s  %s\n" % (data._tables, data.name))
         return data
     language = language if language else lang.check_file_language(source)
+    from ..namespace.modelcache import get_model_cache  # Avoid circular import via namespace package
+    model_cache = get_model_cache(settings)
+    if model_cache:
+        return _cached_test_data_file(model_cache, source, parent, settings, language)
+    return _test_data_file(source, parent, settings, language)
+
+
+def _test_data_file(source, parent, settings, language):
     # print(f"DEBUG: Dataloader TestCaseFile getting datafile language={language}")
     datafile = None
     try:
@@ -192,6 +372,23 @@ def test_data(source, parent=None, settings=None, language=None):
     return datafile
 
 
+def _cached_test_data_file(model_cache, source, parent, settings, language):
+    cached = model_cache.get(source, language, 'test data', parent, settings)
+    if cached:
+        datafile, tasks = cached
+    else:
+        recorder = _ParentRecorder(parent)
+        datafile = _test_data_file(source, recorder, settings, language)
+        if datafile is not None and datafile.parent is recorder:
+            datafile.parent = parent
+        tasks = recorder.tasks
+        model_cache.put(source, language, 'test data', datafile, tasks)
+    # Parsing sets `tasks` of the parent directory, also when the file is cached
+    if tasks is not None and parent is not None:
+        parent.tasks = tasks
+    return datafile
+
+
 class ExcludedDirectory(robotapi.TestDataDirectory):
     def __init__(self, parent, path, language=None):
         self._parent = parent
@@ -201,3 +398,51 @@ class ExcludedDirectory(robotapi.TestDataDirectory):
 
     def has_tests(self):
         return True
+
+
+class _MessageCollector(object):
+    """Collects messages logged while parsing in a worker process."""
+
+    def __init__(self):
+        self.messages = []
+
+    def message(self, msg):
+        self.messages.append((msg.message, msg.level))
+
+
+def serve():
+    """Worker process main loop reading files to parse from stdin.
+
+    NOTE! This is executed in another process, see `_ParserPool`.
+    """
+    from robotide.spec.libraryimporter import READY, read_frame, write_frame
+    channel = os.fdopen(os.dup(sys.stdout.fileno()), 'wb')
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    collector = _MessageCollector()
+    LOGGER.unregister_console_logger()
+    LOGGER.disable_message_cache()
+    LOGGER.register_logger(collector)
+    write_frame(channel, READY)
+    while True:
+        try:
+            path, language, tab_size = read_frame(sys.stdin.buffer)
+        except EOFError:
+            return
+        collector.messages = []
+        recorder = _ParentRecorder(None)
+        datafile, error = None, None
+        try:
+            language = language if language else lang.check_file_language(path)
+            datafile = _test_data_file(path, recorder, {'txt number of spaces': tab_size}, language)
+        except DataError as err:
+            error = err
+        except BaseException as err:
+            write_frame(channel, ('error', str(err) or err.__class__.__name__))
+            continue
+        attached = [name for name in _DETACHED if getattr(datafile, name, None) is not None]
+        for name in attached:
+            setattr(datafile, name, None)
+        try:
+            write_frame(channel, ('ok', (datafile, attached, recorder.tasks, error, collector.messages)))
+        except (pickle.PicklingError, RecursionError, TypeError, AttributeError) as err:
+            write_frame(channel, ('error', str(err)))
@@ -27,6 +27,7 @@ from ..robotapi import TestDataDirectory, TestCaseFile, ResourceFile
 from .. import utils
 
 from .basecontroller import WithUndoRedoStacks, _BaseController, WithNamespace, ControllerWithParent
+from .datafilediff import diff_datafiles
 from .robotdata import new_test_case_file, new_test_data_directory
 from .settingcontrollers import (DocumentationController, FixtureController, TimeoutController, TemplateController,
                                  DefaultTagsController, ForceTagsController, TestTagsController)
@@ -188,6 +189,29 @@ class _DataController(_BaseController, WithUndoRedoStacks, WithNamespace):
         self._imports = None
         RideDataFileSet(item=self).publish()
 
+    def apply_datafile_changes(self, datafile):
+        """Updates the tests and keywords that differ in `datafile` in place.
+
+        Returns False without changing anything if `datafile` differs also
+        otherwise, see `datafilediff.diff_datafiles`.
+        """
+        changes = diff_datafiles(self.data, datafile)
+        if changes is None:
+            return False
+        for table, items in zip((self.tests, self.keywords), changes):
+            for index, change in items:
+                old_name = change.old.name
+                change.apply()
+                ctrl = table[index]
+                if change.name_changed:
+                    ctrl.notify_name_changed(old_name=old_name, new_name=ctrl.name)
+                if change.settings_changed:
+                    ctrl.clear_cached_settings()
+                    ctrl.notify_settings_changed()
+                if change.steps_changed:
+                    ctrl.notify_steps_changed()
+        return True
+
     def _children(self, data):
         _ = data
         return []
@@ -242,6 +266,10 @@ class _DataController(_BaseController, WithUndoRedoStacks, WithNamespace):
         return chain([self], (df for df in self._project.datafiles
                               if df != self))
 
+    @property
+    def usage_index(self):
+        return self._project.usage_index if self._project else None
+
     @property
     def datafile_controller(self):
         return self
@@ -278,6 +306,10 @@ class _DataController(_BaseController, WithUndoRedoStacks, WithNamespace):
         # print(f"DEBUG: filecontrollers.py _DataController keyword_info call keyword_info keyword_name={keyword_name}")
         return WithNamespace.keyword_info(self, self.data, keyword_name)
 
+    def update_namespace(self):
+        if self.namespace:
+            self.namespace.update_datafile(self.data)
+
     def mark_dirty(self):
         if not self.dirty:
             self.dirty = True
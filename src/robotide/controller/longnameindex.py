@@ -0,0 +1,78 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""Index from the long names of suites and tests to their controllers.
+
+Used to find the tests of execution results. The index is dropped when a
+message tells that suites or tests were added, removed or renamed, and built
+again when it is searched next time.
+"""
+
+from threading import RLock
+
+from ..publish import PUBLISHER
+from ..publish.messages import (RideDataFileRemoved, RideDataFileSet, RideExcludesChanged, RideFileNameChanged,
+                                RideIncludesChanged, RideInitFileRemoved, RideItemMovedDown, RideItemMovedUp,
+                                RideItemNameChanged, RideNewProject, RideOpenSuite, RideSuiteAdded,
+                                RideTestCaseAdded, RideTestCaseRemoved)
+
+_STRUCTURE_CHANGED_MESSAGES = (RideDataFileRemoved, RideDataFileSet, RideExcludesChanged, RideFileNameChanged,
+                               RideIncludesChanged, RideInitFileRemoved, RideItemMovedDown, RideItemMovedUp,
+                               RideItemNameChanged, RideNewProject, RideOpenSuite, RideSuiteAdded,
+                               RideTestCaseAdded, RideTestCaseRemoved)
+
+
+class LongnameIndex(object):
+
+    def __init__(self, project):
+        self._project = project
+        self._root = None
+        self._controllers = None
+        self._lock = RLock()
+        for message_class in _STRUCTURE_CHANGED_MESSAGES:
+            PUBLISHER.subscribe(self._structure_changed, message_class)
+
+    def close(self):
+        PUBLISHER.unsubscribe_all(self)
+
+    def _structure_changed(self, message):
+        __ = message
+        with self._lock:
+            self._controllers = None
+
+    def find(self, longname):
+        """Returns the suite or test controller with `longname`, or None.
+
+        If several suites or tests have the same long name, returns the first.
+        """
+        with self._lock:
+            if self._controllers is None or self._root is not self._project.controller:
+                self._root = self._project.controller
+                self._controllers = self._index(self._root)
+            return self._controllers.get(longname)
+
+    @staticmethod
+    def _index(root):
+        controllers = {}
+        if root is None:
+            return controllers
+        for suite in root.iter_datafiles():
+            longname = getattr(suite, 'longname', None)
+            if longname is None:  # Excluded directories
+                continue
+            controllers.setdefault(longname, suite)
+            for test in suite.tests:
+                controllers.setdefault(longname + '.' + test.name, test)
+        return controllers
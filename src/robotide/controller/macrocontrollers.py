@@ -23,7 +23,7 @@ from .settingcontrollers import (DocumentationController, FixtureController, Tag
                                  TemplateController, ArgumentsController, ReturnValueController)
 from .stepcontrollers import ForLoopStepController, StepController, IntendedStepController
 from .tags import Tag
-from ..namespace.local_namespace import local_namespace
+from ..namespace.local_namespace import local_namespace, LocalVariableIndex
 from ..publish.messages import (RideItemStepsChanged, RideItemNameChanged, RideItemSettingsChanged,
                                 RideUserKeywordRemoved)
 from ..spec.iteminfo import ResourceUserKeywordInfo, TestCaseUserKeywordInfo
@@ -93,6 +93,7 @@ class WithStepsController(ControllerWithParent, WithUndoRedoStacks):
         self._init(data)
         self._has_steps_changed = True
         self._steps_cached = None
+        self._local_variable_index = None
         self.datafile_controller.register_for_namespace_updates(
             self.clear_cached_steps)
 
@@ -169,6 +170,13 @@ class WithStepsController(ControllerWithParent, WithUndoRedoStacks):
     def get_local_namespace(self):
         return local_namespace(self, self.datafile_controller.namespace)
 
+    def get_local_variable_index(self):
+        """Returns `LocalVariableIndex` of the current steps."""
+        steps = self.steps
+        if self._local_variable_index is None or not self._local_variable_index.is_for(steps):
+            self._local_variable_index = LocalVariableIndex(steps)
+        return self._local_variable_index
+
     def get_local_namespace_for_row(self, row):
         # print(f"DEBUG: local namespace_for_row controller.namespace {self.datafile_controller.namespace} row {row}")
         return local_namespace(self, self.datafile_controller.namespace, row)
@@ -319,6 +327,10 @@ class WithStepsController(ControllerWithParent, WithUndoRedoStacks):
         self.update_namespace()
         self._notify(RideItemSettingsChanged)
 
+    def clear_cached_settings(self):
+        """Forgets setting controllers created for the current settings."""
+        pass
+
     def notify_steps_changed(self, old_name=None):
         self._has_steps_changed = True
         # print(f"DEBUG: macrocontrollers.py WithStepsController notify_steps_changed: ENTER old_name={old_name}"
@@ -487,6 +499,10 @@ class UserKeywordController(WithStepsController):
         ]
         return result
 
+    def clear_cached_settings(self):
+        self._setup = self._SETUP_NOT_SET
+        self._teardown = self._TEARDOWN_NOT_SET
+
     @property
     def setup(self):
         if self._setup == self._SETUP_NOT_SET:
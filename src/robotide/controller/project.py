@@ -20,6 +20,8 @@ import tempfile
 from .basecontroller import WithNamespace, _BaseController
 from .dataloader import DataLoader
 from .robotdata import new_test_case_file, new_test_data_directory
+from .longnameindex import LongnameIndex
+from .usageindex import UsageIndex
 from ..context import LOG, SETTINGS_DIRECTORY
 from ..controller.ctrlcommands import NullObserver, SaveFile
 from ..publish.messages import RideOpenSuite, RideNewProject, RideFileNameChanged, RideSettingsChanged
@@ -35,6 +37,8 @@ class Project(_BaseController, WithNamespace):
 
     def __init__(self, namespace=None, settings=None, library_manager=None, tasks=False, file_language=None):
         from .filecontrollers import ResourceFileControllerFactory
+        self.usage_index = UsageIndex()
+        self.longname_index = LongnameIndex(self)
         self._library_manager = self._construct_library_manager(library_manager, settings)
         if not self._library_manager.is_alive():
             self._library_manager.start()
@@ -54,7 +58,16 @@ class Project(_BaseController, WithNamespace):
     @staticmethod
     def _construct_library_manager(library_manager, settings):
         return library_manager or \
-            spec.LibraryManager(spec.DATABASE_FILE, SpecInitializer(settings.get('library xml directories', [])[:]))
+            spec.LibraryManager(spec.DATABASE_FILE, SpecInitializer(settings.get('library xml directories', [])[:]),
+                                Project._construct_importer_pool(settings))
+
+    @staticmethod
+    def _construct_importer_pool(settings):
+        workers = settings.get('library import workers', 0)
+        if not workers:
+            return None
+        return spec.LibraryImporterPool(workers if workers > 0 else None,
+                                        settings.get('library import timeout', spec.DEFAULT_IMPORT_TIMEOUT))
 
     def __del__(self):
         if self._library_manager:
@@ -63,6 +76,8 @@ class Project(_BaseController, WithNamespace):
     def close(self):
         self._library_manager.stop()
         self._library_manager = None
+        self.usage_index.close()
+        self.longname_index.close()
 
     def _set_namespace(self, namespace):
         namespace.set_library_manager(self._library_manager)
@@ -169,7 +184,8 @@ class Project(_BaseController, WithNamespace):
         return self._resource_file_controller_factory
 
     def find_controller_by_longname(self, longname, testname=None):
-        return self.controller.find_controller_by_longname(longname, testname)
+        return (self.longname_index.find(longname) or
+                self.controller.find_controller_by_longname(longname, testname))
 
     def get_language_from_settings(self):
         from ..preferences import RideSettings
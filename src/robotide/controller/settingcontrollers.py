@@ -473,6 +473,7 @@ class VariableController(_SettingController):
         self._parent.remove_var(self)
 
     def notify_value_changed(self):
+        self.datafile_controller.update_namespace()
         RideVariableUpdated(item=self).publish()
 
     def notify_variable_added(self):
@@ -32,9 +32,33 @@ def obtain_bdd_prefixes(language):
     return bdd_prefixes
 
 
+class _StepAnalysis(object):
+    """Cell infos of a step and the lookups needed to compute them.
+
+    An analysis is valid as long as the cells of the step and the namespace
+    revision are the same as when it was created.
+    """
+
+    def __init__(self, revision, cells):
+        self.revision = revision
+        self.cell_infos = {}
+        self.local_namespace = None
+        self.first_comment_column = next((i for i, cell in enumerate(cells) if cell.startswith('#')), None)
+        self.last_non_empty_column = next((i for i in reversed(range(len(cells))) if cells[i].strip() != ''),
+                                          None)
+        self._lookups = {}
+
+    def lookup(self, function, value):
+        key = (function.__name__, value)
+        if key not in self._lookups:
+            self._lookups[key] = function(value)
+        return self._lookups[key]
+
+
 class StepController(_BaseController):
 
     indent = None
+    _analysis = None
 
     def __init__(self, parent, step):
         self.continuing_kw = None
@@ -119,6 +143,32 @@ class StepController(_BaseController):
         return values[col]
 
     def get_cell_info(self, col):
+        analysis = self._current_analysis()
+        if not analysis.cell_infos:
+            # All cells are classified at once, they share the keyword lookups
+            for column in range(len(self.as_list())):
+                analysis.cell_infos[column] = self._analyze_cell(column)
+        if col not in analysis.cell_infos:
+            analysis.cell_infos[col] = self._analyze_cell(col)
+        return analysis.cell_infos[col]
+
+    def _current_analysis(self):
+        cells = self.as_list()
+        revision = (tuple(cells), self._keyword_column, self._namespace_revision())
+        if self._analysis is None or self._analysis.revision != revision:
+            self._analysis = _StepAnalysis(revision, cells)
+        return self._analysis
+
+    def _namespace_revision(self):
+        try:
+            return self.datafile_controller.namespace.revision
+        except AttributeError:
+            return None
+
+    def _cached(self, function, value):
+        return self._current_analysis().lookup(function, value)
+
+    def _analyze_cell(self, col):
         position = self._get_cell_position(col)
         content = self._get_content_with_type(col, position)
         # print(f"DEBUG: stepcontrollers.py StepController call get_cell_info col={col} content.type={content.type}")
@@ -148,7 +198,7 @@ class StepController(_BaseController):
             return CellPosition(CellType.UNKNOWN, None)
         column -= len(self.step_controller_step.assign)
         value_at_col = self.get_value(col)
-        info = self.get_keyword_info(value_at_col)  # Getting info for the keyword cell
+        info = self._cached(self.get_keyword_info, value_at_col)  # Getting info for the keyword cell
         keyword_col = col if col >= self._keyword_column else self._keyword_column
         if info:
             casesensitive = (value_at_col.upper() != value_at_col and value_at_col.upper() in CONTROL_MARKERS)
@@ -161,7 +211,7 @@ class StepController(_BaseController):
             while not info and keyword_col > 0 and keyword_col > self._keyword_column:
                 keyword_col -= 1
                 value_at_col = self.get_value(keyword_col)
-                info = self.get_keyword_info(value_at_col)  # Getting info for the previous cell
+                info = self._cached(self.get_keyword_info, value_at_col)  # Getting info for the previous cell
             casesensitive = (value_at_col.upper() != value_at_col and value_at_col.upper() in CONTROL_MARKERS)
             if casesensitive:
                 return CellPosition(CellType.UNKNOWN, None)
@@ -179,7 +229,7 @@ class StepController(_BaseController):
                     while self.continuing_kw == '...' and self._index()-drow > 0:
                         drow += 1
                         self.continuing_kw = self.parent.step(self._index() - drow).keyword
-                info = self.get_keyword_info(self.continuing_kw)  # Getting info for the previous step kw
+                info = self._cached(self.get_keyword_info, self.continuing_kw)  # Getting info for the previous step kw
                 if info:
                     args = info.arguments
         args_amount = len(args)
@@ -255,28 +305,36 @@ class StepController(_BaseController):
             if self._is_unknow_variable(value, position):
                 return CellContent(ContentType.UNKNOWN_VARIABLE, value)
             return CellContent(ContentType.VARIABLE, value)
-        if self.is_user_keyword(value):
-            kw_info = self.get_keyword_info(value)
+        if self._cached(self.is_user_keyword, value):
+            kw_info = self._cached(self.get_keyword_info, value)
             source = kw_info.source
             return CellContent(ContentType.USER_KEYWORD, value, source=source, private=kw_info.private)
         if value in CONTROL_MARKERS:
-            return CellContent(ContentType.LIBRARY_KEYWORD, value, source=self.get_keyword_info(value).source)
-        if self.is_library_keyword(value):
-            return CellContent(ContentType.LIBRARY_KEYWORD, value, source=self.get_keyword_info(value).source)
+            return CellContent(ContentType.LIBRARY_KEYWORD, value,
+                               source=self._cached(self.get_keyword_info, value).source)
+        if self._cached(self.is_library_keyword, value):
+            return CellContent(ContentType.LIBRARY_KEYWORD, value,
+                               source=self._cached(self.get_keyword_info, value).source)
         return CellContent(ContentType.STRING, value)
 
     def _is_unknow_variable(self, value, position):
         if position.type == CellType.ASSIGN:
             return False
         try:
-            is_known = self._get_local_namespace().has_name(value)
+            is_known = self._cached(self._local_namespace().has_name, value)
         except AttributeError:
             return False
         if is_known:
             return False
         inner_value = value[2:-1]
         modified = re.split(r'\W', inner_value, 1)[0]
-        return not self._get_local_namespace().has_name('%s{%s}' % (value[0], modified))
+        return not self._cached(self._local_namespace().has_name, '%s{%s}' % (value[0], modified))
+
+    def _local_namespace(self):
+        analysis = self._current_analysis()
+        if analysis.local_namespace is None:
+            analysis.local_namespace = self._get_local_namespace()
+        return analysis.local_namespace
 
     def _get_local_namespace(self):
         index = self.parent.index_of_step(self.step_controller_step)
@@ -284,11 +342,7 @@ class StepController(_BaseController):
             self.parent, self.datafile_controller.namespace, index)
 
     def _get_last_none_empty_col_idx(self):
-        values = self.as_list()
-        for i in reversed(range(len(values))):
-            if values[i].strip() != '':
-                return i
-        return None
+        return self._current_analysis().last_non_empty_column
 
     def is_modifiable(self):
         return self.datafile_controller.is_modifiable()
@@ -424,10 +478,8 @@ class StepController(_BaseController):
     def _is_commented(self, col):
         if self._has_comment_keyword():
             return col > self._keyword_column
-        for i in range(min(col + 1, len(self.as_list()))):
-            if self.get_value(i).startswith('#'):
-                return True
-        return False
+        first_comment = self._current_analysis().first_comment_column
+        return first_comment is not None and first_comment <= col
 
     def _first_non_empty_cell(self):
         index = self.step_controller_step.first_non_empty_cell()
@@ -700,7 +752,7 @@ class ForLoopStepController(StepController):
             return CellPosition(CellType.OPTIONAL, None)
         return CellPosition(CellType.MUST_BE_EMPTY, None)
 
-    def get_cell_info(self, col):
+    def _analyze_cell(self, col):
         position = self._get_cell_position(col)
         content = self._get_content_with_type(col, position)
         return self._build_cell_info(content, position)
@@ -37,6 +37,7 @@ class TreeController(object):
         self.settings = settings
         self._history = history or _History()
         self._test_selection = test_selection
+        self._nodes = None
 
     def register_tree_actions(self):
         tree_actions = _("""[Navigate]
@@ -101,10 +102,47 @@ class TreeController(object):
             self._tree.SetItemText(node, '*' + text)
 
     def find_node_by_controller(self, controller):
-        def match_handler(n):
-            handler = self.get_handler(n)
-            return handler and controller is handler.controller
-        return self._find_node_with_predicate(self._tree.root, match_handler)
+        """Returns the node of `controller`, or None if it has no node.
+
+        Nodes are indexed by their controllers. The index is built when first
+        needed, kept up to date when nodes are added with `register_node` and
+        dropped with `forget_nodes` when nodes are deleted.
+        """
+        if self._nodes is None:
+            self._nodes = self._index_nodes()
+        node = self._nodes.get(id(controller))
+        if node is not None and not self._is_node_of(node, controller):
+            self._nodes = self._index_nodes()
+            node = self._nodes.get(id(controller))
+        return node
+
+    def register_node(self, node):
+        if self._nodes is not None:
+            handler = self.get_handler(node)
+            if handler:
+                self._nodes.setdefault(id(handler.controller), node)
+
+    def forget_nodes(self):
+        self._nodes = None
+
+    def _is_node_of(self, node, controller):
+        handler = self.get_handler(node)
+        return handler is not None and handler.controller is controller
+
+    def _index_nodes(self):
+        nodes = {}
+        self._index_children(self._tree.root, nodes)
+        return nodes
+
+    def _index_children(self, node, nodes):
+        item, cookie = self._tree.GetFirstChild(node)
+        while item:
+            handler = self.get_handler(item)
+            if handler:
+                nodes.setdefault(id(handler.controller), item)
+            if self._tree.ItemHasChildren(item):
+                self._index_children(item, nodes)
+            item, cookie = self._tree.GetNextChild(node, cookie)
 
     def find_node_with_label(self, node, label):
         # print(f"DEBUG: treecontroller.py TreeController find_node_with_label node={node} LABEL={label}")
@@ -0,0 +1,243 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""Reverse indexes from keyword and variable names to the items using them.
+
+For every datafile the index maps the normalized cell values of its settings,
+steps and keyword names, and the variables referenced in them, to the items
+containing them. Finding keyword or variable occurrences then needs to check
+only the items that can match. The entries of a datafile are dropped when a
+message tells that it has changed, and built again when the datafile is
+searched next time.
+"""
+
+import re
+from itertools import chain
+from threading import RLock
+
+from ..publish import PUBLISHER
+from ..publish.messages import (RideDataChangedToDirty, RideDataFileRemoved, RideDataFileSet, RideFileNameChanged,
+                                RideImportSettingAdded, RideImportSettingChanged, RideImportSettingRemoved,
+                                RideInitFileRemoved, RideItemMovedDown, RideItemMovedUp, RideItemNameChanged,
+                                RideItemSettingsChanged, RideItemStepsChanged, RideNewProject, RideOpenSuite,
+                                RideSuiteAdded, RideTestCaseAdded, RideTestCaseRemoved, RideUserKeywordAdded,
+                                RideUserKeywordRemoved, RideUserKeywordRenamed, RideVariableAdded,
+                                RideVariableMovedDown, RideVariableMovedUp, RideVariableRemoved, RideVariableUpdated)
+
+_IGNORED_CHARACTERS = re.compile(r'[\s_]+')
+_VARIABLE_REFERENCE = re.compile(r'[$@&%]{[^{}]*}')
+_PATTERN_CHARACTERS = re.compile(r'[*?\[\]]')
+_DATA_CHANGED_MESSAGES = (RideDataChangedToDirty, RideDataFileRemoved, RideDataFileSet, RideFileNameChanged,
+                          RideImportSettingAdded, RideImportSettingChanged, RideImportSettingRemoved,
+                          RideInitFileRemoved, RideItemMovedDown, RideItemMovedUp, RideItemNameChanged,
+                          RideItemSettingsChanged, RideItemStepsChanged, RideSuiteAdded, RideTestCaseAdded,
+                          RideTestCaseRemoved, RideUserKeywordAdded, RideUserKeywordRemoved, RideUserKeywordRenamed,
+                          RideVariableAdded, RideVariableMovedDown, RideVariableMovedUp, RideVariableRemoved,
+                          RideVariableUpdated)
+
+
+def usage_key(name):
+    """Returns the key `name` is indexed with.
+
+    Keys ignore case, spaces and underscores, so that every cell value matching
+    a keyword name in `FindOccurrences` has the same key as the name.
+    """
+    return _IGNORED_CHARACTERS.sub('', name or '').casefold()
+
+
+def variable_keys(value):
+    """Returns keys of the innermost variables referenced in `value`.
+
+    For example, `${x}[0]`, `Hello ${X}!` and `${y${x}}` all reference `${x}`.
+    """
+    return _VARIABLE_REFERENCE.findall(usage_key(value))
+
+
+class UsageIndex(object):
+
+    def __init__(self):
+        self._entries = {}
+        self._revision = 0
+        self._lock = RLock()
+        for message_class in _DATA_CHANGED_MESSAGES:
+            PUBLISHER.subscribe(self._data_changed, message_class)
+        PUBLISHER.subscribe(self._project_changed, RideOpenSuite)
+        PUBLISHER.subscribe(self._project_changed, RideNewProject)
+
+    def close(self):
+        PUBLISHER.unsubscribe_all(self)
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._revision += 1
+            self._entries.clear()
+
+    def invalidate(self, datafile):
+        with self._lock:
+            self._revision += 1
+            for entry_class in (_KeywordEntry, _VariableEntry):
+                self._entries.pop((entry_class, datafile), None)
+
+    def keyword_items(self, datafile, names=None):
+        """Returns `(item, keyword)` pairs of `datafile` in the order they are defined.
+
+        `keyword` is the keyword controller of keyword name items and `None` for
+        other items. If `names` are given, only items having a cell with the
+        same key as one of the names are returned.
+        """
+        entry = self._entry(_KeywordEntry, datafile)
+        return entry.items_with(None if names is None else [usage_key(name) for name in names])
+
+    def variable_items(self, datafile, names=None):
+        """Returns items of `datafile` possibly referencing variables `names`.
+
+        Items are returned in the order they are defined, the variable table
+        being the last. If a name does not reference any variable or the
+        reference is a pattern, all items are returned.
+        """
+        keys = []
+        for name in names if names is not None else [None]:
+            references = variable_keys(name) if name else []
+            if not references or _PATTERN_CHARACTERS.search(references[0]):
+                keys = None
+                break
+            keys.append(references[0])
+        entry = self._entry(_VariableEntry, datafile)
+        return [item for item, _ in entry.items_with(keys)]
+
+    def _entry(self, entry_class, datafile):
+        with self._lock:
+            entry = self._entries.get((entry_class, datafile))
+            revision = self._revision
+        if entry is None:
+            entry = entry_class(datafile)
+            with self._lock:
+                # Data may have changed while the entry was built
+                if revision == self._revision:
+                    self._entries[(entry_class, datafile)] = entry
+        return entry
+
+    def _project_changed(self, message):
+        _ = message
+        self.clear()
+
+    def _data_changed(self, message):
+        datafile = self._changed_datafile(message)
+        if datafile is None:
+            self.clear()
+        else:
+            self.invalidate(datafile)
+
+    @staticmethod
+    def _changed_datafile(message):
+        for name in ('datafile', 'item'):
+            try:
+                return getattr(message, name).datafile_controller
+            except AttributeError:
+                continue
+        return None
+
+
+class _DatafileEntry(object):
+
+    def __init__(self, datafile):
+        from .stepcontrollers import StepController
+        from .tablecontrollers import VariableTableController
+        self._step_class = StepController
+        self._variable_table_class = VariableTableController
+        self.items = []
+        self.positions = {}
+        self.unindexed = []
+        for item, keyword in self._items_from_datafile(datafile):
+            position = len(self.items)
+            self.items.append((item, keyword))
+            keys = self._keys_of(item, keyword)
+            if keys is None:
+                self.unindexed.append(position)
+                continue
+            for key in set(keys):
+                self.positions.setdefault(key, []).append(position)
+
+    def items_with(self, keys):
+        if keys is None:
+            return list(self.items)
+        positions = set(self.unindexed)
+        for key in keys:
+            positions.update(self.positions.get(key, ()))
+        return [self.items[position] for position in sorted(positions)]
+
+    def _items_from_datafile(self, datafile):
+        raise NotImplementedError(self.__class__)
+
+    def _keys_of(self, item, keyword):
+        raise NotImplementedError(self.__class__)
+
+
+class _KeywordEntry(_DatafileEntry):
+    """Items searched by `FindOccurrences` keyed by their cell values."""
+
+    def _items_from_datafile(self, datafile):
+        for setting in datafile.settings:
+            yield setting, None
+        for test in datafile.tests:
+            for item in chain(test.settings, test.steps):
+                yield item, None
+        for kw in datafile.keywords:
+            yield kw.keyword_name, kw
+            for item in chain(kw.steps, [kw.setup] if kw.setup else [], [kw.teardown] if kw.teardown else []):
+                yield item, None
+
+    def _keys_of(self, item, keyword):
+        if keyword is not None:
+            return [usage_key(keyword.name)]
+        if isinstance(item, self._step_class):
+            cells = [item.keyword or ''] + item.args
+            # Steps match also when the keyword has a Given/When/Then prefix
+            matcher = getattr(item, '_GIVEN_WHEN_THEN_MATCHER', None)
+            if matcher:
+                cells += [matcher.sub('', cell) for cell in cells if matcher.match(cell)]
+            return [usage_key(cell) for cell in cells]
+        if hasattr(item, 'as_list'):
+            return [usage_key(cell) for cell in item.as_list()]
+        return None
+
+
+class _VariableEntry(_DatafileEntry):
+    """Items searched by `FindVariableOccurrences` keyed by the variables they reference."""
+
+    def _items_from_datafile(self, datafile):
+        for setting in datafile.settings:
+            yield setting, None
+        for test in datafile.tests:
+            for item in chain(test.settings, test.steps):
+                yield item, None
+        for kw in datafile.keywords:
+            yield kw.keyword_name, kw
+            for item in chain(kw.steps, kw.settings):
+                yield item, None
+        yield datafile.variables, None
+
+    def _keys_of(self, item, keyword):
+        if keyword is not None:
+            return variable_keys(keyword.name)
+        if isinstance(item, self._variable_table_class):
+            return [key for variable in item for cell in variable.as_list() for key in variable_keys(cell)]
+        if not hasattr(item, 'as_list'):
+            return None
+        cells = list(item.as_list())
+        value = getattr(item, 'value', None)
+        cells += value if isinstance(value, list) else [value]
+        return [key for cell in cells if isinstance(cell, str) for key in variable_keys(cell)]
@@ -28,6 +28,13 @@ from ..controller.cellinfo import CellType, ContentType
 prefix=re.compile(r'^\d+_{2,}')
 
 class Colorizer(object):
+    """Colors grid cells based on their cell infos.
+
+    Rows are colored in batches, the visible rows first. Styles applied to
+    each row are remembered, so that only rows whose styles have changed
+    are updated in the grid.
+    """
+    ROWS_PER_BATCH = 20
 
     def __init__(self, grid, controller):
         self._grid = grid
@@ -35,10 +42,15 @@ class Colorizer(object):
         self._colors = ColorizationSettings(grid.settings)
         self._current_task_id = 0
         self._timer = None
+        self._row_styles = {}
 
     def close(self):
         self._grid = None
 
+    def reset(self):
+        """Forgets applied styles, so that all rows are colored again."""
+        self._row_styles.clear()
+
     def colorize(self, selection_content):
         self._current_task_id += 1
         if self._timer is None:
@@ -46,46 +58,87 @@ class Colorizer(object):
         else:
             self._timer.Restart(50, self._current_task_id, selection_content)
 
-    def _coloring_task(self, task_index, selection_content, row=0, col=0):
+    def _coloring_task(self, task_index, selection_content, rows=None, refresh=False):
         if task_index != self._current_task_id or self._grid is None:
             return
-        if row >= self._grid.NumberRows:
+        if rows is None:
+            for row in [r for r in self._row_styles if r >= self._grid.NumberRows]:
+                del self._row_styles[row]
+            rows = self._rows_in_coloring_order()
+        batch, rows = rows[:self.ROWS_PER_BATCH], rows[self.ROWS_PER_BATCH:]
+        visible = self._visible_rows()
+        for row in batch:
+            if self._colorize_row(row, selection_content) and row in visible:
+                refresh = True
+        if refresh and (not rows or rows[0] not in visible):
+            # Rows outside the view are painted when they are scrolled into it
             self._grid.ForceRefresh()
-        elif col < self._grid.NumberCols:
-            self._colorize_cell(row, col, selection_content)
-            wx.CallAfter(self._coloring_task, task_index, selection_content, row, col+1)
-        else:
-            self._coloring_task(task_index, selection_content, row+1, 0)
+            refresh = False
+        if rows:
+            wx.CallAfter(self._coloring_task, task_index, selection_content, rows, refresh)
+
+    def _rows_in_coloring_order(self):
+        visible = self._visible_rows()
+        return (list(visible) + list(range(visible.stop, self._grid.NumberRows)) +
+                list(range(min(visible.start, self._grid.NumberRows))))
+
+    def _visible_rows(self):
+        top = self._grid.CalcUnscrolledPosition(0, 0)[1]
+        height = self._grid.GetGridWindow().GetClientSize().height
+        first = self._grid.YToRow(top)
+        last = self._grid.YToRow(top + height)
+        if first == wx.NOT_FOUND:
+            first = 0
+        if last == wx.NOT_FOUND:
+            last = self._grid.NumberRows - 1
+        return range(first, last + 1)
+
+    def _colorize_row(self, row, selection_content):
+        """Applies styles of the cells in `row` if they have changed. Returns `True` if they had."""
+        styles = tuple(self._get_cell_style(row, col, selection_content) for col in range(self._grid.NumberCols))
+        previous = self._row_styles.get(row)
+        if styles == previous:
+            return False
+        for col, style in enumerate(styles):
+            if previous is None or len(previous) != len(styles) or previous[col] != style:
+                self._apply_style(row, col, style)
+        self._row_styles[row] = styles
+        return True
 
     def _colorize_cell(self, row, col, selection_content):
-        from ..controller.macrocontrollers import UserKeywordController
+        self._apply_style(row, col, self._get_cell_style(row, col, selection_content))
+
+    def _get_cell_style(self, row, col, selection_content):
         cell_info = self._controller.get_cell_info(row, col)
         if cell_info is None:
-            self._set_default_colors(row, col)
-            return
-        # print(f"DEBUG: gridcolorizer.py Colorizer _colorize_cell ENTER cell_info.cell_type={cell_info.cell_type} "
+            return None
+        # print(f"DEBUG: gridcolorizer.py Colorizer _get_cell_style ENTER cell_info.cell_type={cell_info.cell_type} "
         #       f"CELL cell_info.content_type=={cell_info.content_type} content={cell_info.value}")
         if cell_info.cell_type == CellType.KEYWORD and cell_info.content_type==ContentType.USER_KEYWORD:
-            source = self._controller.display_name
-            parent = self._controller.parent
-            parent_name = self._controller.datafile_controller.name
-            cell_source = prefix.sub('', cell_info.source.split('.')[0], 1).title()
-            private = cell_info.private
-            current_section = 'keywords' if isinstance(self._controller, UserKeywordController) else 'tests'
-            # print(f"DEBUG: gridcolorizer.py Colorizer _colorize_cell USER KEYWORD source={source} "
-            #       f"CELL Source=={cell_source} parent={parent}  parent_name={parent_name}"
-            #       f"\n Same File? {cell_source==parent_name} PRIVATE={private} "
-            #       f" source={self._controller.datafile_controller.datafile.source} current_section={current_section}")
-            if private:
-                if current_section == 'tests' or (current_section == 'keywords'
-                                                             and cell_source != parent_name):
-                    cell_info.set_or_clear_error(True)
-                else:
-                    cell_info.set_or_clear_error(False)
-            # self._controller.get_cell_info CellContent.value
-        self._grid.SetCellTextColour(row, col, self._get_text_color(cell_info))
-        self._grid.SetCellBackgroundColour(row, col, self._get_background_color(cell_info, selection_content))
-        self._grid.SetCellFont(row, col, self._get_cell_font(row, col, cell_info))
+            self._check_private_keyword(cell_info)
+        return (self._get_text_color(cell_info), self._get_background_color(cell_info, selection_content),
+                self._get_weight(cell_info), bool(cell_info.private))
+
+    def _check_private_keyword(self, cell_info):
+        from ..controller.macrocontrollers import UserKeywordController
+        parent_name = self._controller.datafile_controller.name
+        cell_source = prefix.sub('', cell_info.source.split('.')[0], 1).title()
+        current_section = 'keywords' if isinstance(self._controller, UserKeywordController) else 'tests'
+        if cell_info.private:
+            if current_section == 'tests' or (current_section == 'keywords'
+                                              and cell_source != parent_name):
+                cell_info.set_or_clear_error(True)
+            else:
+                cell_info.set_or_clear_error(False)
+
+    def _apply_style(self, row, col, style):
+        if style is None:
+            self._set_default_colors(row, col)
+            return
+        text_color, background_color, weight, italic = style
+        self._grid.SetCellTextColour(row, col, text_color)
+        self._grid.SetCellBackgroundColour(row, col, background_color)
+        self._grid.SetCellFont(row, col, self._get_cell_font(row, col, weight, italic))
 
     def _set_default_colors(self, row, col):
         self._grid.SetCellTextColour(row, col, self._colors.DEFAULT_TEXT)
@@ -102,11 +155,10 @@ class Colorizer(object):
             return self._colors.get_error_color()
         return self._colors.get_background_color(cell_info.cell_type)
 
-    def _get_cell_font(self, row, col, cell_info):
+    def _get_cell_font(self, row, col, weight, italic):
         font = self._grid.GetCellFont(row, col)
-        font.SetWeight(self._get_weight(cell_info))
-        if cell_info.private:
-            font.SetStyle(wx.FONTSTYLE_ITALIC)
+        font.SetWeight(weight)
+        font.SetStyle(wx.FONTSTYLE_ITALIC if italic else wx.FONTSTYLE_NORMAL)
         return font
 
     @staticmethod
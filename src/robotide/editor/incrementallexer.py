@@ -0,0 +1,90 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""Line based lexing of Robot Framework data for the text editor.
+
+The state of the Robot Framework Pygments lexer at the beginning of every
+`CHECKPOINT_INTERVAL`th line is saved. Lexing a range of lines starts from the
+last checkpoint before it instead of from the beginning of the document.
+"""
+
+import pickle
+import sys
+
+CHECKPOINT_INTERVAL = 16
+
+
+class IncrementalLexer(object):
+
+    def __init__(self, lexer):
+        module = sys.modules[type(lexer).__module__]
+        self._row_tokenizer_class = module.RowTokenizer
+        self._var_tokenizer = module.VariableTokenizer()
+        self._language = getattr(lexer, 'new_lang', None)
+        self._checkpoints = []
+        self._checkpoints_supported = True
+
+    def invalidate(self, line):
+        """Forgets lexer states depending on `line` or lines after it."""
+        del self._checkpoints[line // CHECKPOINT_INTERVAL + 1:]
+
+    def lex(self, get_line, first, last):
+        """Returns tokens of lines from `first` to `last`, both inclusive.
+
+        `get_line` returns the text of the given line without the line
+        separator. Lines `first` and after it are considered changed. Returns
+        a list of `(line, tokens)` pairs where `tokens` is a list of
+        `(value, token)` pairs, the last value being the line separator.
+        """
+        self.invalidate(first)
+        line, row_tokenizer = self._start_state(first)
+        lines = []
+        while line <= last:
+            if line % CHECKPOINT_INTERVAL == 0 and line // CHECKPOINT_INTERVAL == len(self._checkpoints):
+                self._save_checkpoint(row_tokenizer)
+            tokens = self._tokenize(row_tokenizer, get_line(line))
+            if line >= first:
+                lines.append((line, tokens))
+            line += 1
+        return lines
+
+    def _start_state(self, line):
+        index = min(line // CHECKPOINT_INTERVAL, len(self._checkpoints) - 1)
+        if index < 0:
+            return 0, self._new_row_tokenizer()
+        return index * CHECKPOINT_INTERVAL, pickle.loads(self._checkpoints[index])
+
+    def _new_row_tokenizer(self):
+        if self._language is None:
+            return self._row_tokenizer_class()
+        return self._row_tokenizer_class(self._language)
+
+    def _save_checkpoint(self, row_tokenizer):
+        if not self._checkpoints_supported:
+            return
+        try:
+            self._checkpoints.append(pickle.dumps(row_tokenizer, protocol=pickle.HIGHEST_PROTOCOL))
+        except (pickle.PicklingError, TypeError, AttributeError):
+            # Lexing then always starts from the beginning of the document
+            self._checkpoints_supported = False
+            self._checkpoints = []
+
+    def _tokenize(self, row_tokenizer, row):
+        tokens = []
+        for value, token in row_tokenizer.tokenize(row):
+            for var_value, var_token in self._var_tokenizer.tokenize(value, token):
+                if var_value:
+                    tokens.append((str(var_value), var_token))
+        return tokens
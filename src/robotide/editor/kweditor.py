@@ -292,7 +292,8 @@ class KeywordEditor(GridEditor, Plugin):
         for row in range(self.NumberRows):
             for col in range(self.NumberCols):
                 self.SetCellFont(row, col, font)
-                self.ForceRefresh()
+        self._colorizer.reset()
+        self.ForceRefresh()
 
     def _make_bindings(self):
         self.Bind(grid.EVT_GRID_EDITOR_SHOWN, self.on_editor)
@@ -13,9 +13,9 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 import builtins
+import importlib.util
 import os
 import re
-import tempfile
 from io import StringIO, BytesIO
 from os.path import dirname
 from time import time
@@ -24,16 +24,19 @@ import wx
 from wx import stc, Colour
 from wx.adv import HyperlinkCtrl, EVT_HYPERLINK
 from multiprocessing import shared_memory
+from .incrementallexer import IncrementalLexer
 from .popupwindow import HtmlPopupWindow
+from .validationjob import ValidationJob
 from .pythoneditor import PythonSTC
 from . import _EDIT_nt, get_menudata
 from .. import robotapi
 from ..context import IS_WINDOWS, IS_MAC
-from ..controller.ctrlcommands import SetDataFile, INDENTED_START
+from ..controller.ctrlcommands import UpdateDataFile, INDENTED_START
 from ..controller.dataloader import TestDataDirectoryWithExcludes
 from ..controller.filecontrollers import ResourceFileController
 from ..controller.macrocontrollers import WithStepsController
 from ..namespace.suggesters import SuggestionSource
+from ..namespace.wordindex import WordIndex, var_strip
 from ..pluginapi import Plugin, action_info_collection, TreeAwarePluginMixin
 from ..publish.messages import (RideSaved, RideTreeSelection, RideNotebookTabChanging, RideDataChanged, RideOpenSuite,
                                 RideDataChangedToDirty, RideBeforeSaving, RideSaving, RideDataDirtyCleared)
@@ -65,6 +68,7 @@ AUTO_SUGGESTIONS = 'enable auto suggestions'
 LANG_SETTING = 'Language: '
 PATH_EXCLUSIONS = dirname(__file__)
 PLUGIN_NAME = 'Text Edit'
+PREVALIDATION_DELAY = 500  # milliseconds after the last change
 TOKEN_TXT = 'Token('
 TXT_NUM_SPACES = 'txt number of spaces'
 ZOOM_FACTOR = 'zoom factor'
@@ -125,6 +129,13 @@ def _get_lang(set_lang:list, adoc_lang: list) -> list:
     return set_lang
 
 
+def _has_rf_parser():
+    try:
+        return importlib.util.find_spec('robot.parsing.parser.parser') is not None
+    except ImportError:
+        return False
+
+
 def get_rf_lang_code(lang: (str, list), iso: bool=False) -> str:
     if isinstance(lang, list):
         clean_lang = lang
@@ -692,6 +703,9 @@ class DataValidationHandler(object):
         self._last_answer = None
         self._last_answer_time = 0
         self._editor = None
+        self._validation = None
+        self._validated_data = None
+        self._validated_language = None
         if lang is not None:
             self._doc_language = lang
         else:
@@ -699,9 +713,6 @@ class DataValidationHandler(object):
                 self._get_shared_doc_lang()
             except FileNotFoundError:
                 pass
-        file = tempfile.NamedTemporaryFile(prefix="model_saved_from_RIDE_",
-                                           suffix=".robot", mode="w+", delete=False)
-        self.tempfilename=file.name
 
     def _get_shared_doc_lang(self):
         try:
@@ -731,6 +742,34 @@ class DataValidationHandler(object):
     def set_editor(self, editor):
         self._editor = editor
 
+    def prevalidate(self, data, text, lang='en'):
+        """Starts validating `text` on a worker thread.
+
+        When the same text is applied later, the result of this validation
+        and the datafile built from the text are used.
+        """
+        self.cancel_validation()
+        if not _has_rf_parser():  # RF > 4.0
+            return
+        rf_lang = get_rf_lang_code(self._language_of(text, lang))
+        m_text = text.decode("utf-8")
+        build = None
+        if data:
+            # Read here, because the worker thread must not change the language of data
+            language = data.language_of(m_text)
+
+            def build(content):
+                return data.create_target_from(content, language)
+            self._validated_language = language
+        self._validated_data = data
+        self._validation = ValidationJob(m_text, rf_lang, self._check_text, build=build).start()
+
+    def cancel_validation(self):
+        if self._validation:
+            self._validation.cancel()
+            self._validation = None
+        self._validated_data = None
+        self._validated_language = None
 
     def validate_and_update(self, data, text, lang='en', auto=False):
 
@@ -803,16 +842,7 @@ class DataValidationHandler(object):
         # print(f"DEBUG: textedit.py validate_and_update ENTER"
         #       f" params: {lang=} doc_language={self._doc_language}")
         initial_lang = lang  # if lang is not None else self._doc_language self._doc_language or
-        if LANG_SETTING in m_text:
-            try:
-                self._doc_language = obtain_language(lang, text)
-            except ValueError:
-                self._doc_language = 'en'
-            # print(f"DEBUG: textedit.py validate_and_update Language in doc--> lang={self._doc_language}")
-        else:
-            self._doc_language = lang if lang is not None else 'en'
-            # print(f"DEBUG: textedit.py validate_and_update NO Language in doc--> arg lang={lang} "
-            #       f"set to={self._doc_language}")
+        self._doc_language = self._language_of(text, lang)
         self._editor.language = self._doc_language
 
         try:
@@ -842,54 +872,53 @@ class DataValidationHandler(object):
                     return False
         # Save language
         self._set_shared_doc_lang(self._doc_language)
-        if self._editor.reformat:
-            data.update_from(data.format_text(m_text))
-        else:
-            # DEBUG: This is the area where we will implement to not reformat code
-            # print(f"DEBUG: TextEditor.py DataValidationHandler validate_and_update calling update NO REFORMAT"
-            #       f" lang={self._doc_language} text={m_text}")
-            data.update_from(m_text)
-            # There is no way to update the model without reformatting
-            # DEBUG: this only updates the editor, but not the model, changes in Text Editor are not reflected
-            # in Grid or when saving
-            # self.source_editor.source_editor.set_text(m_text)
+        # Parsing the reformatted text gives the same datafile as parsing the text itself, the text shown
+        # after applying is always generated from the datafile
+        validation = self._validation
+        target, language = None, None
+        if validation and validation.matches(m_text, get_rf_lang_code(self._doc_language)) \
+                and self._validated_data is data:
+            target, language = validation.target, self._validated_language
+        self.cancel_validation()
+        data.update_from(m_text, target, language)
         self._editor.set_editor_caret_position()
         return True
 
+    @staticmethod
+    def _language_of(text, lang):
+        if LANG_SETTING in text.decode("utf-8"):
+            try:
+                return obtain_language(lang, text)
+            except ValueError:
+                return 'en'
+        return lang if lang is not None else 'en'
+
     def _sanity_check(self, data, text):
-        from robotide.lib.compat.parsing import ErrorReporter
-        from robot.parsing.parser.parser import get_model
-        from robotide.lib.robot.errors import DataError
-        result = None
+        __ = data
         rf_lang = get_rf_lang_code(self._doc_language)
         # print(f"DEBUG: textedit.py _sanity_check data is type={type(data)} lang={self._doc_language},"
         #       f" transformed lang={rf_lang}")
-        from robot.api.parsing import get_tokens
-        for token in get_tokens(text):
-            # print(repr(token))
-            if token.type == token.ERROR:
-                # print("DEBUG: textedit.py _sanity_check TOKEN in ERROR")
-                result = 'ERROR', repr(token)
-                return result
-            if token.type == token.INVALID_HEADER:
-                # print("DEBUG: textedit.py _sanity_check TOKEN in INVALID_HEADER")
-                result = 'INVALID_HEADER', repr(token)
-                return result
+        validation = self._validation
+        if not validation or not validation.matches(text, rf_lang):
+            self.cancel_validation()
+            validation = self._validation = ValidationJob(text, rf_lang, self._check_text)
+            validation.run()
+        return validation.wait()
 
+    @staticmethod
+    def _check_text(text, rf_lang):
+        from robotide.lib.compat.parsing import ErrorReporter
+        from robot.parsing.parser.parser import get_model
+        from robotide.lib.robot.errors import DataError
         try:
             model = get_model(text, lang=rf_lang)
         except AttributeError:
             return "Failed validation by Robot Framework", "Please, check if Language setting is valid!"
-        validator = ErrorReporter()
         try:
-            validator.visit(model)
+            ErrorReporter(check_tokens=True).visit(model)
         except DataError as err:
-            result = (err.message, err.details)
-        model.save(self.tempfilename)
-        # print(f"DEBUG: textedit.py _sanity_check after calling validator {validator}\n"
-        #       f"Save model in /tmp/model_saved_from_RIDE.robot"
-        #       f" result={result}")
-        return True if not result else result
+            return err.message, err.details
+        return True
 
     """ DEBUG
     formatted_text = data.format_text(text)
@@ -949,17 +978,38 @@ class DataFileWrapper(object):  # DEBUG: bad class name
             return False
         return self.wrapper_data == other.wrapper_data
 
-    def update_from(self, content):
-        self.wrapper_data.execute(SetDataFile(self._create_target_from(content)))
+    def update_from(self, content, target=None, language=None):
+        """Updates the datafile from `content`.
+
+        `target` is a datafile already parsed from `content` in `language`.
+        It is used only if `content` is still parsed in the same language.
+        """
+        if target is None or language != self.language_of(content):
+            target = self.create_target_from(content)
+        else:
+            self._doc_language = language
+        self.wrapper_data.execute(UpdateDataFile(target))
+
+    def language_of(self, content):
+        """Returns the language `content` would be parsed in."""
+        return obtain_language(self._doc_language, content=content.encode("utf-8"))
+
+    def create_target_from(self, content, language=None):
+        """Parses `content` to a new datafile.
 
-    def _create_target_from(self, content):
+        Without `language` the language is read from `content` and set as the
+        language of this wrapper. Threads other than the UI thread must give
+        `language`, see `language_of`.
+        """
+        if language is None:
+            language = self._doc_language = self.language_of(content)
         src = BytesIO(content.encode("utf-8"))
-        target = self._create_target(content.encode("utf-8"))
-        FromStringIOPopulator(target, lang=self._doc_language).populate(src, self._tab_size)
+        target = self._create_target(language)
+        FromStringIOPopulator(target, lang=language).populate(src, self._tab_size)
         return target
 
     def format_text(self, text):
-        return self._txt_data(self._create_target_from(text))
+        return self._txt_data(self.create_target_from(text))
 
     def mark_data_dirty(self):
         if not self.wrapper_data.is_dirty:
@@ -969,20 +1019,19 @@ class DataFileWrapper(object):  # DEBUG: bad class name
         if self.wrapper_data.is_dirty:
             self.wrapper_data.unmark_dirty()
 
-    def _create_target(self, content=None):
+    def _create_target(self, language):
         data = self.wrapper_data.data
         target_class = type(data)
-        self._doc_language = obtain_language(self._doc_language, content=content)
-        # print(f"DEBUG: textedit.py DataFileWrapper _create_target self._doc_language={self._doc_language}"
+        # print(f"DEBUG: textedit.py DataFileWrapper _create_target language={language}"
         #       f"\n target class={target_class}")
         if isinstance(data, robotapi.TestDataDirectory):
             target = robotapi.TestDataDirectory(parent=None, source=self.wrapper_data.directory,
-                                                settings=self._settings, language=self._doc_language)
+                                                settings=self._settings, language=language)
             target.initfile = data.initfile
             return target
         elif isinstance(data, TestDataDirectoryWithExcludes):
             target = TestDataDirectoryWithExcludes(parent=None, source=self.wrapper_data.directory,
-                                                   settings=self._settings, language=self._doc_language)
+                                                   settings=self._settings, language=language)
             target.initfile = data.initfile
             return target
         return target_class(source=self.wrapper_data.source)
@@ -1051,6 +1100,7 @@ class SourceEditor(wx.Panel):
         except (AttributeError, FileNotFoundError):  # Unittests fails here
             set_lang = [['en']]
         self._doc_language = set_lang[0]
+        self._word_index = WordIndex()  # Words of the document to add to suggestions
         self._create_ui(title)
         self._data = None
         self._position = 0  # Start at 0 if first time access
@@ -1062,10 +1112,9 @@ class SourceEditor(wx.Panel):
         self._tab_open = self._title  # When starting standalone this was not being set
         self._controller_for_context = None
         self._suggestions = None
-        self.doc_size: int = 0  # Number of lines in document to be used in collecting words
-        self._words_cache = set()  # Actual cache of words to add to suggestions
         self._stored_text = None
         self._ctrl_action = None
+        self._prevalidation_call = None
         # self.is_saving = False  # To avoid double calls to save
         self.old_information_popup = None
         PUBLISHER.subscribe(self.on_settings_changed, RideSettingsChanged)
@@ -1318,31 +1367,22 @@ class SourceEditor(wx.Panel):
             self.source_editor_parent.SetFocus()
             self.source_editor.Update()
 
-    def words_cache(self, doc_size: int):
-        if doc_size != self.doc_size:  # DEBUG The initial idea was to not update words list if no changes in doc
-            words_list = self.collect_words(self.source_editor.GetText())
-            self._words_cache.update(words_list)
-            self.doc_size = doc_size
-        return sorted(self._words_cache)
-
     @staticmethod
     def var_strip(txt:str):
-        for symb in '$&@%{[()]}':
-            txt = txt.strip(symb)
-        return txt
-
-    def collect_words(self, text: str):
-        if not text:
-            return ['']
-        words = set()
-        words_ = list(text.replace('\r\n', ' ').replace('\n', ' ').split(' '))
-        for w in words_:
-            wl = self.var_strip(w)
-            if wl and wl[0].isalpha():
-                words.add(w)
-
-        # print(f"DEBUG: texteditor.py SourceEditor collect_words returning {words=}")
-        return sorted(words)
+        return var_strip(txt)
+
+    def on_text_modified(self, event):
+        """Indexes again the words of the lines where text was inserted or deleted."""
+        modification = event.GetModificationType()
+        if modification & (stc.STC_MOD_INSERTTEXT | stc.STC_MOD_DELETETEXT):
+            first = self.source_editor.LineFromPosition(event.GetPosition())
+            added = event.GetLinesAdded()
+            if modification & stc.STC_MOD_INSERTTEXT:
+                replaced, lines = 1, range(first, first + added + 1)
+            else:
+                replaced, lines = 1 - added, range(first, first + 1)
+            self._word_index.replace_lines(first, replaced, [self.source_editor.GetLine(line) for line in lines])
+        event.Skip()
 
     def on_content_assist(self, event):
         """
@@ -1367,7 +1407,7 @@ class SourceEditor(wx.Panel):
         if not self._suggestions:
             self._controller_for_context = DummyController(self._data.wrapper_data, self._data.wrapper_data)
             self._suggestions = SuggestionSource(self.plugin, self._controller_for_context)
-        self._suggestions.update_from_local(self.words_cache(self.source_editor.GetLineCount()), self.language)
+        self._suggestions.update_from_local([], self.language, word_index=self._word_index)
         sugs = set()
         if selected:
             selected = list(selected)
@@ -1427,7 +1467,7 @@ class SourceEditor(wx.Panel):
                 sugs.remove('')
         suggestions=";".join(sorted(sugs))
         # print(f"DEBUG: texteditor.py SourceEditor on_content_assist BEFORE SHOW LIST suggestions = {suggestions}\n"
-        #       f" size={len(suggestions)} cache size={len(self._words_cache)}")
+        #       f" size={len(suggestions)} words size={len(self._word_index)}")
         if len(suggestions) > 0:  # Consider using contentassist as in Grid Editor
             self.source_editor.AutoCompSetDropRestOfWord(False)
             self.source_editor.AutoCompSetFillUps('=')
@@ -1483,8 +1523,7 @@ class SourceEditor(wx.Panel):
                 self.source_editor.set_text(self._data.content)
             self.set_editor_caret_position()
         wx.CallAfter(self.plugin.statusbar_message, f'{_("Source: ")}{self._controller_for_context.source}', 4000)
-        self._words_cache.clear()
-        self._suggestions.update_from_local(self.words_cache(self.source_editor.GetLineCount()), self.language)
+        self._suggestions.update_from_local([], self.language, word_index=self._word_index)
 
     def selected(self, data):
         if not self.source_editor:
@@ -1773,8 +1812,24 @@ class SourceEditor(wx.Panel):
         self.source_editor.Bind(wx.EVT_KILL_FOCUS, self.LeaveFocus)
         self.source_editor.Bind(wx.EVT_SET_FOCUS, self.GetFocus)
         self.source_editor.Bind(wx.EVT_MENU, self.on_menu)
+        self.source_editor.Bind(stc.EVT_STC_CHANGE, self.on_text_changed)
+        self.source_editor.Bind(stc.EVT_STC_MODIFIED, self.on_text_modified)
+        self._word_index.set_text(self.source_editor.GetText())
         # DEBUG: Add here binding for keyword help
 
+    def on_text_changed(self, event):
+        """Validates the text on a worker thread when typing pauses."""
+        self._data_validator.cancel_validation()
+        if self._prevalidation_call:
+            self._prevalidation_call.Stop()
+        self._prevalidation_call = wx.CallLater(PREVALIDATION_DELAY, self._prevalidate)
+        event.Skip()
+
+    def _prevalidate(self):
+        self._prevalidation_call = None
+        if self._data and self.dirty and not self.source_editor.readonly:
+            self._data_validator.prevalidate(self._data, self.source_editor.utf8_text, lang=self.language)
+
     def on_menu(self, event):
         m_id=event.GetId()
         if m_id in (12, 14):  # Cut and Paste
@@ -2762,8 +2817,7 @@ class RobotDataEditor(PythonSTC):
         return self.GetText().encode('UTF-8')
 
     def on_style(self, event):
-        __ = event
-        self.stylizer.stylize()
+        self.stylizer.stylize(event.GetPosition())
 
     def on_zoom(self, event):
         __ = event
@@ -3088,6 +3142,7 @@ class RobotStylizer(object):
         # print(f"DEBUG: texteditor.py RobotStylizer _init_ language={self.language}\n")
         if robotframeworklexer:
             self.lexer = robotframeworklexer.RobotFrameworkLexer(**options)
+            self._incremental_lexer = IncrementalLexer(self.lexer)
         else:
             self.editor.GetParent().create_syntax_colorization_help()
         self.set_styles(self._readonly)
@@ -3220,21 +3275,47 @@ class RobotStylizer(object):
             sys_font = wx.SystemSettings.GetFont(wx.SYS_ANSI_FIXED_FONT)
             self.settings[PLUGIN_NAME]['font face'] = sys_font.GetFaceName()
 
-    def stylize(self):
+    def stylize(self, end=None):
+        """Styles lines from the first unstyled one up to position `end`.
+
+        Without `end`, styles up to the last visible line. Only the changed
+        lines are lexed again, starting from the closest saved lexer state.
+        """
         # print(f"DEBUG: texteditor.py RobotStylizer stylize ENTER lexer={self.lexer}")
         if not self.lexer:
             return
-        self.editor.ConvertEOLs(2)
-        shift = 0
-        for position, token, value in self.lexer.get_tokens_unprocessed(self.editor.GetText()):
+        editor = self.editor
+        if end is None:
+            editor.ConvertEOLs(2)
+            last_visible = editor.DocLineFromVisible(editor.GetFirstVisibleLine() + editor.LinesOnScreen())
+            end = editor.GetLineEndPosition(min(last_visible, editor.GetLineCount() - 1))
+        first_line = editor.LineFromPosition(editor.GetEndStyled())
+        last_line = editor.LineFromPosition(min(end, editor.GetLength()))
+        if editor.GetEndStyled() >= editor.GetLength() or first_line > last_line:
+            return
+        get_line = lambda line: editor.GetLine(line).rstrip('\r\n')
+        for line, tokens in self._incremental_lexer.lex(get_line, first_line, last_line):
+            self._style_line(line, tokens)
+
+    def _style_line(self, line, tokens):
+        editor = self.editor
+        position = editor.PositionFromLine(line)
+        line_end = editor.PositionFromLine(line + 1) if line + 1 < editor.GetLineCount() else editor.GetLength()
+        if wx.VERSION < (4, 1, 0):
+            editor.StartStyling(position, 31)
+        else:
+            editor.StartStyling(position)
+        style = 0
+        for value, token in tokens:
             # print(f"DEBUG: texteditor.py RobotStylizer stylize token={token} value={value}")
-            if wx.VERSION < (4, 1, 0):
-                self.editor.StartStyling(position + shift, 31)
-            else:
-                self.editor.StartStyling(position + shift)
             try:
-                self.editor.SetStyling(len(value.encode('utf-8')), self.tokens[token])
-                shift += len(value.encode('utf-8')) - len(value)
+                length = len(value.encode('utf-8'))
             except UnicodeEncodeError:
-                self.editor.SetStyling(len(value), self.tokens[token])
-                shift += len(value) - len(value)
+                length = len(value)
+            length = min(length, line_end - position)
+            style = self.tokens[token]
+            if length > 0:
+                editor.SetStyling(length, style)
+                position += length
+        if position < line_end:
+            editor.SetStyling(line_end - position, style)
@@ -0,0 +1,74 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from threading import Event, Thread
+
+
+class ValidationJob(object):
+    """Validates Text Edit content and builds a datafile from it.
+
+    `check(text, language)` returns True for valid content and otherwise
+    a `(message, details)` tuple. When the content is valid and `build` is
+    given, `build(text)` creates the datafile. A job run with `start` runs
+    on a worker thread and its result is discarded once it is cancelled.
+    """
+
+    def __init__(self, text, language, check, build=None):
+        self.text = text
+        self.language = language
+        self.result = None
+        self.target = None
+        self._check = check
+        self._build = build
+        self._error = None
+        self._cancelled = Event()
+        self._done = Event()
+
+    def start(self):
+        Thread(target=self.run, daemon=True).start()
+        return self
+
+    def run(self):
+        try:
+            self.result = self._check(self.text, self.language)
+        except Exception as err:
+            self._error = err
+        if self.result is True and self._build and not self.cancelled:
+            try:
+                self.target = self._build(self.text)
+            except Exception:
+                # The datafile is then built when the changes are applied
+                self.target = None
+        self._done.set()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def matches(self, text, language):
+        return not self.cancelled and self.text == text and self.language == language
+
+    def wait(self):
+        """Returns the result of the check, waiting for it if necessary.
+
+        Errors raised by the check are raised again here.
+        """
+        self._done.wait()
+        if self._error:
+            raise self._error
+        return self.result
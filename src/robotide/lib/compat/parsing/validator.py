@@ -1,10 +1,24 @@
-from robot.api.parsing import ModelVisitor
+from robot.api.parsing import ModelVisitor, Token
+from robot.parsing.model.statements import Statement
 from robotide.lib.robot.errors import DataError
 
 
 class ErrorReporter(ModelVisitor):
+    """Raises DataError on the first error in the model.
+
+    With `check_tokens`, also ERROR and INVALID_HEADER tokens are reported,
+    as `DataError(message='ERROR' or 'INVALID_HEADER', details=repr(token))`.
+    """
+    token_errors = {Token.ERROR: 'ERROR', Token.INVALID_HEADER: 'INVALID_HEADER'}
+
+    def __init__(self, check_tokens=False):
+        self.check_tokens = check_tokens
 
     def generic_visit(self, node):
+        if self.check_tokens and isinstance(node, Statement):
+            for token in node.tokens:
+                if token.type in self.token_errors:
+                    raise DataError(message=self.token_errors[token.type], details=repr(token))
         if node.errors:
             # print(f"DEBUG: validator.py ErrorReporter: Error on line {node.lineno}:")
             for error in node.errors:
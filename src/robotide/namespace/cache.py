@@ -13,10 +13,10 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
-import os
-import time
+from collections import OrderedDict
+from threading import RLock
 
-from ..robotapi import normpath, ALIAS_MARKER
+from ..robotapi import ALIAS_MARKER
 from ..spec.iteminfo import BlockKeywordInfo
 
 BOOL_COND = '(boolean) condition'
@@ -34,7 +34,10 @@ class LibraryCache(object):
         if library_manager:
             self.set_library_manager(library_manager)
         self._libraries_need_refresh_listener = libraries_need_refresh_listener
+        # Libraries are expired also from the library manager thread
+        self._lock = RLock()
         self._library_keywords = {}
+        self._revision = 0
         self.__default_libraries = None
         self.__default_kws = None
 
@@ -42,8 +45,21 @@ class LibraryCache(object):
         self._library_manager = library_manager
 
     def expire(self):
-        self.__init__(self._settings, self._libraries_need_refresh_listener,
-                      self._library_manager)
+        with self._lock:
+            self._library_keywords = {}
+            self._revision += 1
+            self.__default_libraries = None
+            self.__default_kws = None
+
+    def expire_library(self, name):
+        with self._lock:
+            for key in [key for key in self._library_keywords if key[0] == name]:
+                del self._library_keywords[key]
+            self._revision += 1
+
+    def is_default_library(self, name):
+        return any(self._get_name_and_args(libsetting)[0] == name
+                   for libsetting in self._settings['auto imports'] + ['BuiltIn'])
 
     @property
     def _default_libraries(self):
@@ -58,25 +74,26 @@ class LibraryCache(object):
         return self.__default_kws
 
     def get_all_cached_library_names(self):
-        all_libraries = self.get_user_libraries() + [name for name, _ in self._library_keywords]
+        with self._lock:
+            cached = [name for name, _ in self._library_keywords]
+        all_libraries = self.get_user_libraries() + cached
         ordered = set(all_libraries)
         all_libraries = sorted(ordered)
         # print(f"DEBUG: cache.py LibraryCache get_all_cached_library_names  user_libraries={all_libraries}")
         return all_libraries
 
     def _get_library(self, name, args):
-        library_database = \
-            self._library_manager.get_new_connection_to_library_database()
-        try:
-            last_updated = library_database.get_library_last_updated(name, args)
-            if last_updated:
-                if time.time() - last_updated > 10.0:
-                    self._library_manager.fetch_keywords(
-                        name, args, self._libraries_need_refresh_listener)
-                return library_database.fetch_library_keywords(name, args)
-            return self._library_manager.get_and_insert_keywords(name, args)
-        finally:
-            library_database.close()
+        library_database = self._library_manager.get_library_database()
+        last_updated = library_database.get_library_last_updated(name, args)
+        if last_updated:
+            self._library_manager.refresh_keywords(name, args, lambda keywords: self._library_refreshed(name))
+            return library_database.fetch_library_keywords(name, args)
+        return self._library_manager.get_and_insert_keywords(
+            name, args, lambda keywords: self._library_refreshed(name))
+
+    def _library_refreshed(self, name):
+        self.expire_library(name)
+        self._libraries_need_refresh_listener(name)
 
     @staticmethod
     def _key(name, args):
@@ -85,11 +102,16 @@ class LibraryCache(object):
     def get_library_keywords(self, name, args=None, alias=None):
         args_with_alias = self._alias_to_args(alias, args)
         key = self._key(name, args_with_alias)
-        if key not in self._library_keywords:
-            self._library_keywords[key] = [k.with_alias(alias) for k in
-                                           self._get_library(name, args)]
-
-        return self._library_keywords[key]
+        with self._lock:
+            keywords = self._library_keywords.get(key)
+            revision = self._revision
+        if keywords is None:
+            keywords = [k.with_alias(alias) for k in self._get_library(name, args)]
+            with self._lock:
+                # Not stored if the library was expired while it was fetched
+                if revision == self._revision:
+                    self._library_keywords[key] = keywords
+        return keywords
 
     @staticmethod
     def _alias_to_args(alias, args):
@@ -256,28 +278,138 @@ class LibraryCache(object):
         return parts[0], parts[1:]
 
 
-class ExpiringCache(object):
+class KeywordCache(object):
+    """Keywords of datafiles, valid until something they depend on changes.
+
+    Dependencies are `(kind, name)` tuples like in `DependencyGraph`. Every
+    `expire` increments `revision` and records it for the expired
+    dependencies. A cached value is valid while none of its dependencies has
+    been expired after the revision the value was built at. Least recently
+    used values are evicted when the total size of the values exceeds
+    `max_size`.
+    """
+
+    def __init__(self, max_size=250000):
+        self._max_size = max_size
+        self._entries = OrderedDict()
+        self._expired = {}
+        self._revision = 0
+        self._cleared = 0
+        self._size = 0
+        # Libraries are refreshed in the library manager thread
+        self._lock = RLock()
 
-    def __init__(self, timeout=0.5):
-        self._cache = {}
-        self._timeout = timeout
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def revision(self):
+        """Revision to pass to `put` when the value is built after reading it."""
+        return self._revision
+
+    def __len__(self):
+        return len(self._entries)
 
     def get(self, key):
-        if key in self._cache:
-            key_time, values = self._cache[key]
-            if self._is_valid(key_time):
-                return values
-        return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.checked != self._revision:
+                if not self._is_valid(entry.revision, entry.dependencies):
+                    self.remove(key)
+                    return None
+                entry.checked = self._revision
+            self._entries.move_to_end(key)
+            return entry.value
 
-    def _is_valid(self, key_time):
-        return (time.time() - key_time) < self._timeout
+    def put(self, key, value, dependencies=(), size=1, revision=None):
+        """Caches `value` built at `revision`, by default the current one.
 
-    def put(self, key, values):
-        self._cache[key] = (time.time(), values)
+        Nothing is cached if any of `dependencies` has been expired after
+        `revision`, because then the value may already be stale.
+        """
+        with self._lock:
+            self.remove(key)
+            dependencies = tuple(dependencies)
+            if revision is None:
+                revision = self._revision
+            elif not self._is_valid(revision, dependencies):
+                return
+            self._entries[key] = _KeywordCacheEntry(revision, dependencies, value, size)
+            self._size += size
+            while self._size > self._max_size and len(self._entries) > 1:
+                self.remove(next(iter(self._entries)))
 
-    def _get_from_cache(self, source, name):
-        try:
-            return self._resource_files[name]
-        except KeyError:
-            path = normpath(os.path.join(os.path.dirname(source), name))
-            return self._resource_files[path]
+    def expire(self, *dependencies):
+        with self._lock:
+            self._revision += 1
+            for dependency in dependencies:
+                self._expired[dependency] = self._revision
+
+    def remove(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry:
+                self._size -= entry.size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self._revision += 1
+            self._cleared = self._revision
+
+    def _is_valid(self, revision, dependencies):
+        if revision < self._cleared:
+            return False
+        return all(self._expired.get(dependency, 0) <= revision for dependency in dependencies)
+
+
+class _KeywordCacheEntry(object):
+
+    def __init__(self, revision, dependencies, value, size):
+        self.revision = revision
+        self.checked = revision
+        self.dependencies = dependencies
+        self.value = value
+        self.size = size
+
+
+class DependencyGraph(object):
+    """Tracks what the cached data of each datafile depends on.
+
+    Dependencies are `(kind, name)` tuples like `('resource', path)` or
+    `('library', name)`, and they must include also transitive imports, so
+    that finding the datafiles depending on something is a single lookup.
+    """
+
+    def __init__(self):
+        self._dependencies = {}
+        self._dependents = {}
+        # Libraries are refreshed in the library manager thread
+        self._lock = RLock()
+
+    def set_dependencies(self, source, dependencies):
+        with self._lock:
+            self.remove(source)
+            self._dependencies[source] = set(dependencies)
+            for dependency in self._dependencies[source]:
+                self._dependents.setdefault(dependency, set()).add(source)
+
+    def remove(self, source):
+        with self._lock:
+            for dependency in self._dependencies.pop(source, ()):
+                dependents = self._dependents[dependency]
+                dependents.discard(source)
+                if not dependents:
+                    del self._dependents[dependency]
+
+    def dependencies(self, source):
+        with self._lock:
+            return set(self._dependencies.get(source, ()))
+
+    def dependents(self, dependency):
+        with self._lock:
+            return set(self._dependents.get(dependency, ()))
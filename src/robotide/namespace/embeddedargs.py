@@ -13,8 +13,14 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import re
+from collections import OrderedDict
+
 from robotide.lib.robot.running.arguments.embedded import EmbeddedArgumentParser
 
+_BACKREFERENCE = re.compile(r'\\\d')
+_NOT_FOUND = object()
+
 
 class EmbeddedArgsHandler(object):
 
@@ -28,3 +34,108 @@ class EmbeddedArgsHandler(object):
             self.longname_regexp, _ = EmbeddedArgumentParser().parse(keyword.longname)
         if not self.embedded_args:
             raise TypeError('Must have embedded arguments')
+
+
+class EmbeddedKeywordMatcher(object):
+    """Finds the first keyword whose embedded arguments regexp matches a name.
+
+    Regexps are grouped by the first characters of their literal prefix and
+    every group is combined into one alternation, so finding a keyword tries
+    only a couple of compiled regexps. Recent results are memoized.
+    """
+    PREFIX_LENGTH = 3
+    MEMO_SIZE = 2000
+
+    def __init__(self, regexps):
+        """`regexps` are `(regexp, keyword)` pairs in priority order."""
+        self._keywords = []
+        groups = {}
+        for regexp, keyword in regexps:
+            if not hasattr(regexp, 'match'):
+                continue
+            groups.setdefault(self._group_key(regexp.pattern), []).append((len(self._keywords), regexp))
+            self._keywords.append(keyword)
+        self._groups = dict((key, _Alternation(items)) for key, items in groups.items())
+        self._memo = OrderedDict()
+
+    def __len__(self):
+        return len(self._keywords)
+
+    def match(self, name):
+        keyword = self._memo.get(name, _NOT_FOUND)
+        if keyword is _NOT_FOUND:
+            index = self._first_match(name)
+            keyword = self._keywords[index] if index is not None else None
+            if len(self._memo) >= self.MEMO_SIZE:
+                self._memo.popitem(last=False)
+        self._memo[name] = keyword
+        self._memo.move_to_end(name)
+        return keyword
+
+    def _first_match(self, name):
+        key = name[:self.PREFIX_LENGTH].lower()
+        if not key.isascii():
+            # Case-insensitive matching may equate non-ASCII and ASCII characters
+            groups = list(self._groups.values())
+        else:
+            groups = [self._groups.get(key), self._groups.get('')] if len(key) == self.PREFIX_LENGTH \
+                else [self._groups.get('')]
+        indexes = [index for index in (group.match(name) for group in groups if group) if index is not None]
+        return min(indexes) if indexes else None
+
+    def _group_key(self, pattern):
+        prefix = _literal_prefix(pattern)
+        if len(prefix) < self.PREFIX_LENGTH or not prefix.isascii():
+            return ''
+        return prefix[:self.PREFIX_LENGTH].lower()
+
+
+class _Alternation(object):
+
+    def __init__(self, items):
+        self._items = items
+        self._regexp = None
+        self._indexes = {}
+
+    def match(self, name):
+        if self._regexp is None:
+            self._compile()
+        if not self._regexp:
+            for index, regexp in self._items:
+                if regexp.match(name):
+                    return index
+            return None
+        match = self._regexp.match(name)
+        return self._indexes[match.lastindex] if match else None
+
+    def _compile(self):
+        self._regexp = False
+        if len(self._items) < 2 or any(_BACKREFERENCE.search(regexp.pattern) for _, regexp in self._items):
+            return
+        patterns = []
+        group = 1
+        for index, regexp in self._items:
+            patterns.append('(%s)' % regexp.pattern)
+            self._indexes[group] = index
+            group += regexp.groups + 1
+        try:
+            self._regexp = re.compile('|'.join(patterns), re.IGNORECASE)
+        except (re.error, OverflowError, RecursionError):
+            self._indexes = {}
+
+
+def _literal_prefix(pattern):
+    """Returns the text an embedded arguments regexp pattern starts with."""
+    prefix = []
+    position = 1 if pattern.startswith('^') else 0
+    while position < len(pattern):
+        character = pattern[position]
+        if character == '\\' and position + 1 < len(pattern) and not pattern[position + 1].isalnum():
+            prefix.append(pattern[position + 1])
+            position += 2
+        elif character in '\\()[]{}.*+?|^$':
+            break
+        else:
+            prefix.append(character)
+            position += 1
+    return ''.join(prefix)
@@ -0,0 +1,115 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""Index of keyword names for content assist suggestions.
+
+Keywords are indexed with their normalized names, long names and names
+without a Given/When/Then prefix. The keys are kept sorted so that keywords
+beginning with the typed text are found with a binary search.
+
+An index consists of segments, one for the keywords of each library or
+resource. Segments with the same keywords are shared between indexes, so
+when the keywords visible in a datafile change, only the segments of
+changed keywords are built again.
+"""
+
+import re
+import weakref
+from bisect import bisect_left
+from threading import Lock
+
+from .. import utils
+
+PREFIX = 'prefix'
+SUBSTRING = 'substring'
+FUZZY = 'fuzzy'
+MATCH_MODES = (PREFIX, SUBSTRING, FUZZY)
+
+_LAST_CHARACTER = chr(0x10FFFF)
+_segments = weakref.WeakValueDictionary()
+_segments_lock = Lock()
+
+
+class KeywordIndex(object):
+    """Finds keywords whose name matches the text typed so far.
+
+    `bdd_prefix` is a regular expression matching keyword names with
+    a Given/When/Then prefix, its second group being the name without it.
+    """
+
+    def __init__(self, keywords, bdd_prefix=None):
+        groups = {}
+        for kw in keywords:
+            groups.setdefault(kw.source, []).append(kw)
+        self._segments = [_get_segment(group, bdd_prefix) for group in groups.values()]
+
+    def find(self, start, mode=PREFIX):
+        """Returns the set of keywords matching `start`.
+
+        With `PREFIX` a name must begin with `start`, with `SUBSTRING` contain
+        it and with `FUZZY` contain its characters in the same order. Case,
+        spaces and underscores are ignored.
+        """
+        text = utils.normalize(start, ignore=['_'])
+        if mode == SUBSTRING:
+            matcher = (lambda key: text in key) if text else None
+        elif mode == FUZZY:
+            matcher = re.compile('.*?'.join(re.escape(c) for c in text)).search if text else None
+        else:
+            matcher = None
+        found = set()
+        for segment in self._segments:
+            found.update(segment.matching(matcher) if matcher else segment.beginning_with(text))
+        return found
+
+
+def _get_segment(keywords, bdd_prefix):
+    # Segments refer to their keywords, so ids in the key cannot be reused while the segment exists
+    key = (bdd_prefix.pattern if bdd_prefix else None, frozenset(id(kw) for kw in keywords))
+    with _segments_lock:
+        segment = _segments.get(key)
+        if segment is None:
+            segment = _segments[key] = _Segment(keywords, bdd_prefix)
+    return segment
+
+
+class _Segment(object):
+
+    def __init__(self, keywords, bdd_prefix):
+        self._keywords = keywords
+        entries = set()
+        for position, kw in enumerate(keywords):
+            for key in self._keys_of(kw, bdd_prefix):
+                entries.add((key, position))
+        entries = sorted(entries)
+        self._keys = [key for key, _ in entries]
+        self._positions = [position for _, position in entries]
+
+    @staticmethod
+    def _keys_of(kw, bdd_prefix):
+        name = kw.name or ''
+        keys = [utils.normalize(name, ignore=['_']), utils.normalize(kw.longname or '', ignore=['_'])]
+        match = bdd_prefix.match(name) if bdd_prefix else None
+        if match:
+            keys.append(utils.normalize(match.group(2), ignore=['_']))
+        return keys
+
+    def beginning_with(self, text):
+        first = bisect_left(self._keys, text)
+        last = bisect_left(self._keys, text + _LAST_CHARACTER, first)
+        return [self._keywords[position] for position in self._positions[first:last]]
+
+    def matching(self, matcher):
+        return [self._keywords[position] for key, position in zip(self._keys, self._positions) if matcher(key)]
@@ -13,6 +13,8 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+from bisect import bisect_left
+
 from robotide import utils
 from robotide.spec.iteminfo import LocalVariableInfo
 
@@ -23,6 +25,54 @@ def local_namespace(controller, namespace, row=None):
     return LocalMacroNamespace(controller, namespace)
 
 
+class LocalVariableIndex(object):
+    """Rows where variables are assigned in the steps of a test or keyword.
+
+    The index is built once for a list of steps, so that checking the
+    variables assigned before a row does not go through the steps again.
+    Variables are assigned by step return values, FOR loops and VAR.
+    """
+
+    def __init__(self, steps):
+        self.steps = steps
+        self._length = len(steps)
+        self._first_rows = {}
+        assignments = {}
+        for row, step in enumerate(steps):
+            for assignment in _step_assignments(step):
+                assignments.setdefault(assignment, row)
+                self._first_rows.setdefault(_variable_name(assignment), row)
+        self._assignments = sorted(assignments.items())
+
+    def is_for(self, steps):
+        return steps is self.steps and len(steps) == self._length
+
+    def is_assigned_before(self, name, row):
+        return self._first_rows.get(_variable_name(name), row) < row
+
+    def assigned_before(self, start, row):
+        """Returns names of the variables assigned before `row` and starting with `start`."""
+        names = set()
+        for index in range(bisect_left(self._assignments, (start,)), len(self._assignments)):
+            assignment, first_row = self._assignments[index]
+            if not assignment.startswith(start):
+                break
+            if first_row < row:
+                names.add(_variable_name(assignment))
+        return names
+
+
+def _step_assignments(step):
+    assignments = list(step.assignments)
+    if step.keyword == 'VAR' and step.args:
+        assignments.append(step.args[0])
+    return assignments
+
+
+def _variable_name(assignment):
+    return assignment.replace('=', '').strip()
+
+
 class LocalMacroNamespace(object):
 
     def __init__(self, controller, namespace):
@@ -34,6 +84,8 @@ class LocalMacroNamespace(object):
         return self.namespace.get_suggestions_for(self._controller, start)
 
     def has_name(self, value):
+        if self.namespace.has_variable(self._controller, value):
+            return True
         for sug in self.namespace.get_suggestions_for(self._controller, value):
             if sug.name == value:
                 return True
@@ -47,6 +99,9 @@ class LocalMacroNamespace(object):
     def update_words_cache(self, words_list: list, reset=False):
         return self.namespace.update_words_cache(words_list, reset)
 
+    def set_word_index(self, word_index):
+        self.namespace.set_word_index(word_index)
+
 
 class LocalRowNamespace(LocalMacroNamespace):
 
@@ -67,13 +122,7 @@ class LocalRowNamespace(LocalMacroNamespace):
         return suggestions
 
     def _harvest_local_variables(self, start, suggestions):
-        matching_assignments = set()
-        for row, step in enumerate(self._controller.steps):
-            if self._row == row:
-                break
-            matching_assignments = matching_assignments.union(
-                val.replace('=', '').strip() for val in step.assignments if
-                val.startswith(start))
+        matching_assignments = self._controller.get_local_variable_index().assigned_before(start, self._row)
         if matching_assignments:
             local_variables = [LocalVariableInfo(name) for name
                                in matching_assignments]
@@ -87,19 +136,17 @@ class LocalRowNamespace(LocalMacroNamespace):
 
     def has_name(self, value):
         if self._row is not None:
-            for row, step in enumerate(self._controller.steps):
-                if self._row == row:
-                    break
-                if step.is_assigning(value):
-                    return True
+            index = self._controller.get_local_variable_index()
+            if index.is_assigned_before(value, self._row):
+                return True
+            # A value ending with '=' is an assignment itself
+            if value.strip().endswith('=') and min(self._row, len(index.steps)) > 0:
+                return True
         return LocalMacroNamespace.has_name(self, value)
 
     @staticmethod
     def _remove_duplicates(suggestions, local_variables):
-        def is_unique(gvar):
-            if hasattr(gvar, 'name'):
-                return utils.normalize(gvar.name) not in [utils.normalize(lvar.name) for lvar in local_variables]
-            else:
-                return utils.normalize(gvar) not in [utils.normalize(lvar.name) for lvar in local_variables]
-        unique = [gvar for gvar in suggestions if is_unique(gvar)]
+        local_names = set(utils.normalize(lvar.name) for lvar in local_variables)
+        unique = [gvar for gvar in suggestions
+                  if utils.normalize(getattr(gvar, 'name', gvar)) not in local_names]
         return unique + local_variables
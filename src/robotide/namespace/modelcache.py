@@ -0,0 +1,119 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""On-disk cache of parsed test data files.
+
+Entries are keyed by the file path, its modification time and size, the
+parsing language, the `txt number of spaces` setting and RIDE version, so a
+file is parsed again only when it, the settings or RIDE have changed. Parsed
+files are stored without their parent and settings, which are attached again
+when an entry is read.
+"""
+
+import hashlib
+import os
+import pickle
+
+from ..context import SETTINGS_DIRECTORY
+from ..version import VERSION
+
+CACHE_DIRECTORY = os.path.join(SETTINGS_DIRECTORY, 'parsed_files')
+_DETACHED = ('parent', 'settings', '_settings')
+
+
+def get_model_cache(settings):
+    """Returns the parsed model cache if enabled in `settings`, otherwise `None`."""
+    if settings and settings.get('cache parsed files', False):
+        return ParsedModelCache(tab_size=settings.get('txt number of spaces', 2))
+    return None
+
+
+class ParsedModelCache(object):
+    """`tab_size` is the `txt number of spaces` setting files are parsed with."""
+
+    def __init__(self, directory=None, tab_size=2):
+        self._directory = directory or CACHE_DIRECTORY
+        self._tab_size = tab_size
+
+    def get(self, path, language, kind, parent=None, settings=None):
+        """Returns `(datafile, extra)` stored for `path` or `None` if not up to date.
+
+        `parent` and `settings` are attached to the returned datafile if it had
+        them when it was stored.
+        """
+        key = self._key(path, language, kind)
+        if key is None:
+            return None
+        try:
+            with open(self._entry_path(path, kind), 'rb') as entry:
+                if pickle.load(entry) != key:
+                    return None
+                datafile, extra, attached = pickle.load(entry)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print("Could not read parsed model cache for '%s': %s" % (path, e))
+            return None
+        values = {'parent': parent, 'settings': settings, '_settings': settings}
+        self._attach(datafile, dict((name, values[name]) for name in attached))
+        return datafile, extra
+
+    def put(self, path, language, kind, datafile, extra=None):
+        key = self._key(path, language, kind)
+        if key is None:
+            return
+        detached = self._detach(datafile)
+        entry_path = self._entry_path(path, kind)
+        temp_path = '%s.%d.tmp' % (entry_path, os.getpid())
+        try:
+            if not os.path.isdir(self._directory):
+                os.makedirs(self._directory)
+            with open(temp_path, 'wb') as entry:
+                pickle.dump(key, entry, protocol=pickle.HIGHEST_PROTOCOL)
+                attached = [name for name, value in detached.items() if value is not None]
+                pickle.dump((datafile, extra, attached), entry, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, entry_path)
+        except (OSError, pickle.PicklingError, RecursionError, TypeError, AttributeError) as e:
+            print("Could not write parsed model cache for '%s': %s" % (path, e))
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        finally:
+            self._attach(datafile, detached)
+
+    def _key(self, path, language, kind):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (VERSION, os.path.normcase(os.path.abspath(path)), stat.st_mtime_ns, stat.st_size,
+                tuple(language) if isinstance(language, (list, tuple)) else language, kind, self._tab_size)
+
+    def _entry_path(self, path, kind):
+        name = '%s|%s' % (os.path.normcase(os.path.abspath(path)), kind)
+        return os.path.join(self._directory, hashlib.sha1(name.encode('UTF-8')).hexdigest() + '.pickle')
+
+    @staticmethod
+    def _detach(datafile):
+        if datafile is None:
+            return {}
+        detached = dict((name, getattr(datafile, name)) for name in _DETACHED if hasattr(datafile, name))
+        for name in detached:
+            setattr(datafile, name, None)
+        return detached
+
+    @staticmethod
+    def _attach(datafile, attributes):
+        for name, value in attributes.items():
+            setattr(datafile, name, value)
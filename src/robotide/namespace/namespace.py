@@ -18,18 +18,22 @@ import os
 import re
 import sys
 import tempfile
-from itertools import chain
+import time
 from multiprocessing import shared_memory
+from threading import RLock
 from robotide.lib.compat.parsing.language import Language
 
 from .. import robotapi, utils
-from ..publish import PUBLISHER, RideSettingsChanged, RideLogMessage
-from ..robotapi import VariableFileSetter
+from ..publish import (PUBLISHER, RideSettingsChanged, RideLogMessage, RideDataFileSet, RideDataFileRemoved,
+                       RideOpenSuite, RideNewProject)
 from ..spec.iteminfo import (TestCaseUserKeywordInfo, ResourceUserKeywordInfo, VariableInfo, UserKeywordInfo,
                              ArgumentInfo, LibraryKeywordInfo, BlockKeywordInfo)
-from .cache import LibraryCache, ExpiringCache
+from .cache import LibraryCache, KeywordCache, DependencyGraph
 from .resourcefactory import ResourceFactory
-from .embeddedargs import EmbeddedArgsHandler
+from .variablefilecache import VariableFileCache
+from .variablescope import VariableScope
+from .embeddedargs import EmbeddedArgsHandler, EmbeddedKeywordMatcher
+from .keywordindex import KeywordIndex, MATCH_MODES, PREFIX
 
 
 class Namespace(object):
@@ -38,16 +42,26 @@ class Namespace(object):
         self._context_factory = None
         self.settings = settings
         self._library_manager = None
+        self._retriever = None
         self._content_assist_hooks = []
         self._update_listeners = set()
+        self.revision = 0
         self._init_caches()
         self._set_pythonpath()
         self._words_cache = set()
+        self._word_index = None
         PUBLISHER.subscribe(self._setting_changed, RideSettingsChanged)
+        PUBLISHER.subscribe(self._datafile_replaced, RideDataFileSet)
+        PUBLISHER.subscribe(self._datafile_removed, RideDataFileRemoved)
+        PUBLISHER.subscribe(self._project_opened, RideOpenSuite)
+        PUBLISHER.subscribe(self._project_opened, RideNewProject)
 
     def _init_caches(self):
+        self.revision += 1
+        if self._retriever:
+            self._retriever.close()
         self._lib_cache = LibraryCache(
-            self.settings, self.update, self._library_manager)
+            self.settings, self._library_refreshed, self._library_manager)
         self._resource_factory = ResourceFactory(self.settings)
         self._retriever = DatafileRetriever(self._lib_cache,
                                             self._resource_factory, self)
@@ -85,6 +99,7 @@ class Namespace(object):
     def update_exec_dir_global_var(self, exec_dir):
         _VariableStash.global_variables['${EXECDIR}'] = exec_dir
         self._context_factory.reload_context_global_vars()
+        self._retriever.expire_builtin_variables()
 
     def update_cur_dir_global_var(self, cur_dir):
         dp = os.getenv('RIDE_DOC_PATH')
@@ -96,6 +111,7 @@ class Namespace(object):
             os.environ['RIDE_DOC_PATH'] = f"{cur_dir}, {parent_cur_dir}"
         _VariableStash.global_variables['${CURDIR}'] = cur_dir
         self._context_factory.reload_context_global_vars()
+        self._retriever.expire_builtin_variables()
 
     def set_library_manager(self, library_manager):
         self._library_manager = library_manager
@@ -105,7 +121,41 @@ class Namespace(object):
         _ = args
         self._retriever.expire_cache()
         self._context_factory = _RetrieverContextFactory()
-        for listener in self._update_listeners:
+        self._notify_update_listeners()
+
+    def update_datafile(self, datafile):
+        """Expires cached data of `datafile` and of the datafiles importing it."""
+        self._expire_datafiles(self._retriever.expire_datafile(datafile))
+
+    def _project_opened(self, message):
+        _ = message
+        self.update()
+
+    def _datafile_replaced(self, message):
+        self.update_datafile(message.item.data)
+
+    def _datafile_removed(self, message):
+        data = getattr(message.datafile, 'data', None)
+        if data is not None:
+            self.update_datafile(data)
+
+    def _library_refreshed(self, library_name):
+        if self._lib_cache.is_default_library(library_name):
+            self.update()
+        else:
+            self._expire_datafiles(self._retriever.expire_library(library_name))
+
+    def variable_file_changed(self, path):
+        """Expires cached data of the datafiles importing variable file `path`."""
+        self._expire_datafiles(self._retriever.expire_variable_file(path))
+
+    def _expire_datafiles(self, sources):
+        self._context_factory.remove_contexts(sources)
+        self._notify_update_listeners()
+
+    def _notify_update_listeners(self):
+        self.revision += 1
+        for listener in list(self._update_listeners):
             listener()
 
     def resource_filename_changed(self, old_name, new_name):
@@ -140,16 +190,15 @@ class Namespace(object):
         if not controller:
             return []
         datafile = controller.datafile
-        ctx = self._context_factory.ctx_for_controller(controller)
         sugs = set()  # self._words_cache or
         while start and start[-1] in [']', '}', '=', ',']:
             start = start[:-1]
         sugs.update(self._get_suggestions_from_hooks(datafile, start))
         if self._blank(start) or not self._looks_like_variable(start):
-            sugs.update(self._variable_suggestions(controller, start, ctx))
-            sugs.update(self._keyword_suggestions(datafile, start, ctx))
+            sugs.update(self._variable_suggestions(controller, start))
+            sugs.update(self._keyword_suggestions(datafile, start))
         else:
-            sugs.update(self._variable_suggestions(controller, start, ctx))
+            sugs.update(self._variable_suggestions(controller, start))
         # print(f"DEBUG: namespace.py Namespace get_suggestions_for BEFORE CONTENT start={start} {sugs=}")
         if not self._looks_like_variable(start):  # Search in content
             for v in ['${', '@{', '&{', '%{', '$']:
@@ -180,12 +229,16 @@ class Namespace(object):
             or (len(start) >= 2 and start[:2] in ['${', '@{', '&{', '%{']) \
             or len(start) >= 2 and start[0] == '$'
 
-    def _variable_suggestions(self, controller, start, ctx):
-        self._add_kw_arg_vars(controller, ctx.vars)
-        variables = self._retriever.get_variables_from(
-            controller.datafile, ctx)
-        sugs = (v for v in variables if v.name_matches(start))
-        return sugs
+    def _variable_suggestions(self, controller, start):
+        arguments = self._argument_variables(controller)
+        scope = VariableScope(arguments, self._retriever.get_variable_scope(controller.datafile))
+        return (v for v in scope if v.name_matches(start))
+
+    def has_variable(self, controller, name):
+        """Returns True if variable `name`, like `${var}`, is visible in `controller`."""
+        if any(argument.name == name for argument in self._argument_variables(controller)):
+            return True
+        return name in self._retriever.get_variable_scope(controller.datafile)
 
     def _content_suggestions(self, start):
         sugs = set()
@@ -203,20 +256,22 @@ class Namespace(object):
                 # print(f"DEBUG: namespace.py Namespace _content_suggestions SUGGESTION from STRING {v=}"
                 #       f"\n v.lower().startswith(start.lower() ={v.lower().startswith(start.lower())}")
                 sugs.add(v)
+        if self._word_index is not None:
+            sugs.update(self._word_index.starting_with(start))
         return sugs
 
     @staticmethod
-    def _add_kw_arg_vars(controller, variables):
-        for name, value in controller.get_local_variables().items():
-            variables.set_argument(name, value)
-
-    def _keyword_suggestions(self, datafile, start, ctx):
-        start_normalized = utils.normalize(start)
-        all_kws = chain(self._get_default_keywords(),
-                        self._retriever.get_keywords_from(datafile, ctx))
-        return (sug for sug in all_kws
-                if sug.name_begins_with(start_normalized) or
-                sug.longname_begins_with(start_normalized))
+    def _argument_variables(controller):
+        return [ArgumentInfo('%s{%s}' % (_VariableStash.get_prefix(value), name[2:-1]), value)
+                for name, value in controller.get_local_variables().items()]
+
+    def _keyword_suggestions(self, datafile, start):
+        keywords = self._retriever.get_keywords_cached(datafile, self._context_factory)
+        return keywords.find_suggestions(start, self._keyword_match_mode())
+
+    def _keyword_match_mode(self):
+        mode = self.settings.get('keyword suggestion match', PREFIX) if self.settings else PREFIX
+        return mode if mode in MATCH_MODES else PREFIX
 
     def get_resources(self, datafile, language=None):
         return self._retriever.get_resources_from(datafile, language=language)
@@ -284,34 +339,52 @@ class Namespace(object):
             return
         self._words_cache.update(set(words_list))
 
+    def set_word_index(self, word_index):
+        """Sets the `WordIndex` of the edited document to get content suggestions from."""
+        self._word_index = word_index
+
 
 class _RetrieverContextFactory(object):
     def __init__(self):
         self._context_cache = {}
+        # Contexts are removed also in the library manager thread
+        self._lock = RLock()
 
     def ctx_for_controller(self, controller):
-        if controller not in self._context_cache:
-            self._context_cache[controller] = RetrieverContext()
-            self._context_cache[controller.datafile
-                                ] = self._context_cache[controller]
-        return self._context_cache[controller]
+        with self._lock:
+            if controller not in self._context_cache:
+                self._context_cache[controller] = RetrieverContext()
+                self._context_cache[controller.datafile
+                                    ] = self._context_cache[controller]
+            return self._context_cache[controller]
 
     def ctx_for_datafile(self, datafile):
-        if datafile not in self._context_cache:
-            ctx = RetrieverContext()
-            ctx.set_variables_from_datafile_variable_table(datafile)
-            self._context_cache[datafile] = ctx
-        return self._context_cache[datafile]
+        with self._lock:
+            if datafile not in self._context_cache:
+                ctx = RetrieverContext()
+                ctx.set_variables_from_datafile_variable_table(datafile)
+                self._context_cache[datafile] = ctx
+            return self._context_cache[datafile]
 
     def reload_context_global_vars(self):
-        for retrieve_context in self._context_cache.values():
+        with self._lock:
+            contexts = list(self._context_cache.values())
+        for retrieve_context in contexts:
             retrieve_context.vars.load_builtin_global_vars()
 
+    def remove_contexts(self, sources):
+        with self._lock:
+            for key in [key for key in self._context_cache if getattr(key, 'source', None) in sources]:
+                del self._context_cache[key]
+
 
 class RetrieverContext(object):
     def __init__(self):
         self.vars = _VariableStash()
         self.parsed = set()
+        self.libraries = set()
+        self.variable_files = set()
+        self.resources_not_found = False
 
     def set_variables_from_datafile_variable_table(self, datafile):
         self.vars.set_from_variable_table(datafile.variable_table)
@@ -370,6 +443,7 @@ class _VariableStash(object):
     }
 
     ARGUMENT_SOURCE = object()
+    BUILTIN_SOURCE = 'built-in'
 
     def __init__(self):
         self._vars = robotapi.RobotVariables()
@@ -378,7 +452,7 @@ class _VariableStash(object):
 
     def load_builtin_global_vars(self):
         for k, v in self.global_variables.items():
-            self.set(k, v, 'built-in')
+            self.set(k, v, self.BUILTIN_SOURCE)
 
     def set(self, name, value, source):
         self._vars[name] = value
@@ -421,27 +495,12 @@ class _VariableStash(object):
             return []
         return {}
 
-    def set_from_file(self, varfile_path, args):
-        from ..robotapi import Variables
-        from robotide.lib.robot.variables.store import VariableStore
-        class Dummy:
-            language='En'
-        parent = Dummy()
-        store = VariableStore(Variables(parent, ""))
-        # print(f"namespace._VariableStash.set_from_file: variable_path {varfile_path} "
-        #       f"args {args}")
-        try:
-            vars_from_file = VariableFileSetter(store)
-            resulting_vars = vars_from_file._import_if_needed(varfile_path, args)
-        except (robotapi.DataError, Exception) as e:
-            # print(f"namespace._VariableStash.set_from_file: unexpected DataError: variable_path {varfile_path} "
-            #       f"args {args}")
-            raise e
-        for name, value in resulting_vars:
-            self.set(name, value, varfile_path)
+    def set_from_file(self, varfile_path, args, variable_files):
+        for name, value, source in variable_files.get_variables(varfile_path, args):
+            self.set(name, value, source)
 
     @staticmethod
-    def _get_prefix(value):
+    def get_prefix(value):
         if utils.is_dict_like(value):
             return '&'
         elif utils.is_list_like(value):
@@ -450,9 +509,14 @@ class _VariableStash(object):
             return '$'
 
     def __iter__(self):
+        return self.variables()
+
+    def variables(self, include_builtin=True):
         for name, value in self._vars.store.data.items():
             source = self._sources[name]
-            prefix = self._get_prefix(value)
+            if source == self.BUILTIN_SOURCE and not include_builtin:
+                continue
+            prefix = self.get_prefix(value)
             name = u'{0}{{{1}}}'.format(prefix, name)
             if source == self.ARGUMENT_SOURCE:
                 yield ArgumentInfo(name, value)
@@ -460,14 +524,36 @@ class _VariableStash(object):
                 yield VariableInfo(name, value, source)
 
 
+_RESOURCE_NOT_FOUND = ('resource', None)
+
+
+def _file_version(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
 class DatafileRetriever(object):
+    # Seconds a variable file is not checked for changes again
+    VARIABLE_FILE_CHECK_INTERVAL = 2.0
+
     def __init__(self, lib_cache, resource_factory, namespace):
         self._namespace = namespace
         self._lib_cache = lib_cache
         self._resource_factory = resource_factory
-        self.keyword_cache = ExpiringCache()
+        self.keyword_cache = KeywordCache()
+        self.variable_scopes = KeywordCache(max_size=5000)
+        self._builtin_scope = None
+        self._variable_files = VariableFileCache(getattr(namespace, 'settings', None))
+        self._variable_file_versions = {}
+        self._dependencies = DependencyGraph()
         self._default_kws = None
 
+    def close(self):
+        self._variable_files.close()
+
     def get_all_cached_library_names(self):
         return self._lib_cache.get_all_cached_library_names()
 
@@ -478,8 +564,47 @@ class DatafileRetriever(object):
         return self._default_kws
 
     def expire_cache(self):
-        self.keyword_cache = ExpiringCache()
+        self.keyword_cache.clear()
+        self.expire_builtin_variables()
+        self._dependencies = DependencyGraph()
         self._lib_cache.expire()
+        self._default_kws = None
+
+    def expire_datafile(self, datafile):
+        """Expires cached keywords of `datafile` and of datafiles importing it.
+
+        Libraries used by `datafile` are checked again for changes when they
+        are needed next time. Returns sources of the expired datafiles.
+        """
+        for kind, name in self._dependencies.dependencies(datafile.source):
+            if kind == 'library':
+                self._lib_cache.expire_library(name)
+        # The changed datafile may be a resource that was not found earlier
+        self.keyword_cache.expire(('resource', datafile.source), _RESOURCE_NOT_FOUND)
+        self.variable_scopes.expire(('resource', datafile.source), _RESOURCE_NOT_FOUND)
+        return self._expire_sources({datafile.source} |
+                                    self._dependencies.dependents(('resource', datafile.source)) |
+                                    self._dependencies.dependents(_RESOURCE_NOT_FOUND))
+
+    def expire_library(self, name):
+        """Expires cached keywords of datafiles importing library `name`."""
+        self._lib_cache.expire_library(name)
+        self.keyword_cache.expire(('library', name))
+        return self._expire_sources(self._dependencies.dependents(('library', name)))
+
+    def expire_variable_file(self, path):
+        """Expires cached keywords of datafiles importing variable file `path`."""
+        self._variable_files.expire(path)
+        self.keyword_cache.expire(('variables', path))
+        self.variable_scopes.expire(('variables', path))
+        return self._expire_sources(self._dependencies.dependents(('variables', path)))
+
+    def _expire_sources(self, sources):
+        for source in sources:
+            self.keyword_cache.remove(source)
+            self.variable_scopes.remove(source)
+            self._dependencies.remove(source)
+        return sources
 
     def get_keywords_from_several(self, datafiles):
         kws = set()
@@ -527,6 +652,7 @@ class DatafileRetriever(object):
         name = self._convert_to_absolute_path(name, imp)
         args = [ctx.replace_variables(a) for a in imp.args]
         alias = ctx.replace_variables(imp.alias) if imp.alias else None
+        ctx.libraries.add(name)
         return self._lib_cache.get_library_keywords(name, args, alias)
 
     @staticmethod
@@ -549,6 +675,8 @@ class DatafileRetriever(object):
     def _res_kw_recursive_getter(self, imp, ctx):
         kws = []
         res = self._resource_factory.get_resource_from_import(imp, ctx)
+        if not res:
+            ctx.resources_not_found = True
         if not res or res in ctx.parsed:
             return kws
         ctx.parsed.add(res)
@@ -558,6 +686,47 @@ class DatafileRetriever(object):
         kws.extend(self._get_imported_library_keywords(res, ctx))
         return [ResourceUserKeywordInfo(kw) for kw in res.keywords if not kw.name.startswith('#')] + kws
 
+    def expire_builtin_variables(self):
+        """Expires variable scopes after values of built-in variables changed."""
+        self._builtin_scope = None
+        self.variable_scopes.clear()
+
+    def get_variable_scope(self, datafile):
+        """Returns `VariableScope` of the variables visible in `datafile`.
+
+        Scopes are kept until the datafile, its imports or variable files
+        imported by them change.
+        """
+        cached = self.variable_scopes.get(datafile.source)
+        if cached is not None:
+            scope, variable_files = cached
+            changed = [path for path, version in variable_files.items()
+                       if self._variable_file_version(path) != version]
+            if not changed:
+                return scope
+            for path in changed:
+                self._namespace.variable_file_changed(path)
+        revision = self.variable_scopes.revision
+        ctx = self._get_vars_recursive(datafile, RetrieverContext())
+        scope = VariableScope(ctx.vars.variables(include_builtin=False), self._builtin_variables())
+        variable_files = dict((path, self._variable_file_version(path, refresh=True)) for path in ctx.variable_files)
+        self.variable_scopes.put(datafile.source, (scope, variable_files),
+                                 [('resource', datafile.source)] + self._imported_items(ctx), revision=revision)
+        return scope
+
+    def _variable_file_version(self, path, refresh=False):
+        checked, version = self._variable_file_versions.get(path, (None, None))
+        now = time.time()
+        if refresh or checked is None or now - checked >= self.VARIABLE_FILE_CHECK_INTERVAL:
+            version = _file_version(path)
+            self._variable_file_versions[path] = (now, version)
+        return version
+
+    def _builtin_variables(self):
+        if self._builtin_scope is None:
+            self._builtin_scope = VariableScope(_VariableStash().variables())
+        return self._builtin_scope
+
     def get_variables_from(self, datafile, ctx=None):
         return self._get_vars_recursive(datafile,
                                         ctx or RetrieverContext()).vars
@@ -572,12 +741,12 @@ class DatafileRetriever(object):
         for imp in self._collect_import_of_type(datafile, robotapi.Variables):
             self._import_vars(ctx, datafile, imp)
 
-    @staticmethod
-    def _import_vars(ctx, datafile, imp):
+    def _import_vars(self, ctx, datafile, imp):
         varfile_path = os.path.abspath(os.path.join(datafile.directory, ctx.replace_variables(imp.name)))
         args = [ctx.replace_variables(a) for a in imp.args]
+        ctx.variable_files.add(varfile_path)
         try:
-            ctx.vars.set_from_file(varfile_path, args)
+            ctx.vars.set_from_file(varfile_path, args, self._variable_files)
             return True
         except (robotapi.DataError, Exception):
             return False  # DEBUG: log somewhere
@@ -588,16 +757,33 @@ class DatafileRetriever(object):
 
     def get_keywords_cached(self, datafile, context_factory, caseless=False):
         values = self.keyword_cache.get(datafile.source)
-        if not values:
-            words = self.get_keywords_from(datafile, context_factory.ctx_for_datafile(datafile))
+        if values is None:
+            # Taken before collecting, so that expiring during it is noticed
+            revision = self.keyword_cache.revision
+            ctx = context_factory.ctx_for_datafile(datafile)
+            ctx.libraries.clear()
+            ctx.variable_files.clear()
+            ctx.resources_not_found = False
+            words = self.get_keywords_from(datafile, ctx)
             words.extend(self.default_kws)
             values = _Keywords(words, caseless=caseless)
-            self.keyword_cache.put(datafile.source, values)
+            dependencies = self._imported_items(ctx)
+            self.keyword_cache.put(datafile.source, values, [('resource', datafile.source)] + dependencies,
+                                   size=len(words), revision=revision)
+            self._dependencies.set_dependencies(datafile.source, dependencies)
         # print(f"DEBUG: namespace.py DatafileRetrieve get_keywords_cached returning cached keywords values=={values}"
         #       f"\ndatafile={datafile.source}")
         # print(f"DEBUG: namespace.py DatafileRetrieve get_keywords_cached datafile = {datafile.source}")
         return values
 
+    @staticmethod
+    def _imported_items(ctx):
+        # After collecting keywords `ctx.parsed` contains all resources imported directly or indirectly
+        return ([('resource', res.source) for res in ctx.parsed] +
+                [('library', name) for name in ctx.libraries] +
+                [('variables', path) for path in ctx.variable_files] +
+                ([_RESOURCE_NOT_FOUND] if ctx.resources_not_found else []))
+
     def _get_user_keywords_from(self, datafile):
         return list(self._get_user_keywords_recursive(datafile,
                                                       RetrieverContext()))
@@ -617,7 +803,9 @@ class DatafileRetriever(object):
         ctx.set_variables_from_datafile_variable_table(datafile)
         for imp in self._collect_import_of_type(datafile, robotapi.Resource):
             res = self._resource_factory.get_resource_from_import(imp, ctx)
-            if res and res not in ctx.parsed:
+            if not res:
+                ctx.resources_not_found = True
+            elif res not in ctx.parsed:
                 ctx.parsed.add(res)
                 collector(res, ctx, items)
         return items
@@ -664,6 +852,9 @@ class _Keywords(object):
         self.gherkin_prefix = re.compile(fr'^({self.normalized_bdd_prefixes}) (.*)', re.IGNORECASE)
         self.keywords = robotapi.NormalizedDict(ignore=['_'], caseless=caseless)
         self.embedded_keywords = {}
+        self._all_keywords = keywords
+        self._suggestion_index = None
+        self._embedded_matcher = None
         self._add_keywords(keywords)
 
     def _add_keywords(self, keywords):
@@ -704,17 +895,18 @@ class _Keywords(object):
         bdd_name = self._get_bdd_name(kw_name)
         if bdd_name and bdd_name in self.keywords:
             return self.keywords[bdd_name]
-        # print(f"DEBUG: namespace.py _Keywords get embedded kws {self.embedded_keywords}"
-        #       f"\nseaching keyword={kw_name}")
-        for regexp in self.embedded_keywords:
-            try:
-                if regexp.match(kw_name) or (bdd_name and regexp.match(bdd_name)):
-                    # print(f"DEBUG: namespace.py _Keywords get keywords in REGEX FOUND {kw_name}"
-                    #       f" source={self.embedded_keywords[regexp].source}")
-                    return self.embedded_keywords[regexp]
-            except AttributeError:
-                pass
-        return None
+        if not self.embedded_keywords:
+            return None
+        if self._embedded_matcher is None:
+            self._embedded_matcher = EmbeddedKeywordMatcher(self.embedded_keywords.items())
+        return self._embedded_matcher.match(kw_name) or (bdd_name and self._embedded_matcher.match(bdd_name)) \
+            or None
+
+    def find_suggestions(self, start, mode=PREFIX):
+        """Returns keywords whose name matches `start` in the given `mode`."""
+        if self._suggestion_index is None:
+            self._suggestion_index = KeywordIndex(self._all_keywords, self.gherkin_prefix)
+        return self._suggestion_index.find(start, mode)
 
     def _get_bdd_name(self, kw_name):
         match = self.gherkin_prefix.match(kw_name)
@@ -15,12 +15,14 @@
 
 import os
 from robotide import utils, robotapi
+from .modelcache import get_model_cache
 
 
 class ResourceFactory(object):
     _IGNORE_RESOURCE_DIRECTORY_SETTING_NAME = 'ignored resource directory'
 
     def __init__(self, settings):
+        self._settings = settings
         self.cache = {}
         self.python_path_cache = {}
         self._excludes = settings.excludes
@@ -88,6 +90,19 @@ class ResourceFactory(object):
         return self.cache[normalized]
 
     def _load_resource(self, path, report_status):
+        model_cache = get_model_cache(self._settings)
+        if not model_cache:
+            return self._parse_resource(path, report_status)
+        kind = 'resource' if report_status else 'resource without status'
+        cached = model_cache.get(path, None, kind)
+        if cached:
+            return cached[0]
+        resource = self._parse_resource(path, report_status)
+        model_cache.put(path, None, kind, resource)
+        return resource
+
+    @staticmethod
+    def _parse_resource(path, report_status):
         r = robotapi.ResourceFile(path)
         if os.stat(path)[6] != 0 and report_status:
             return r.populate()
@@ -52,7 +52,7 @@ class SuggestionSource(object):
             # print(f"DEBUG: suggesters.py SuggestionSource get_suggestions IN LOOP initial ={initial} len sugs={len(sugs)}")
         return list(sugs)
 
-    def update_from_local(self, words: list, language:str):
+    def update_from_local(self, words: list, language:str, word_index=None):
         from ..lib.compat.parsing.languages import Language
         if isinstance(language, list):
             language = language[0]
@@ -64,6 +64,8 @@ class SuggestionSource(object):
                          list(localized.bdd_prefixes) + localized.true_strings + localized.false_strings))
         namespace = self._controller.get_local_namespace()
         namespace.update_words_cache(words)
+        if word_index is not None:
+            namespace.set_word_index(word_index)
         # print(f"DEBUG: suggesters.py SuggestionSource update_from_local words={words} namespace={namespace} "
         #       f"language={localized.name}")
 
@@ -13,21 +13,50 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import os
+import sys
+
 from .. import robotapi
 
 # NOTE! This is in own module to reduce the number of dependencies as this is executed in another process
 
+_SCALARS = (str, bytes, int, float, complex, bool, type(None))
+_CONTAINERS = (list, tuple, set, frozenset)
+
 
 def import_varfile(varfile_path, args):
-    """ Seems that this function is never called """
-    temp = robotapi.RobotVariables()
+    """Returns variables of a variable file as `(name, value, source)` triples.
+
+    Values other than builtin scalars and containers are converted to
+    strings, so that the result can be sent from another process and stored
+    on disk, also when their classes are defined in the variable file itself.
+    """
+    _forget_module(varfile_path)
     try:
-        temp.set_from_file(varfile_path, args)
-    except Exception as e:  # DEBUG used to be SystemExit
-        print(f"Failed to import variable file: {e}")
-        raise robotapi.DataError('Variable file import failed')
-    return [(name, _format_value(value), varfile_path)
-            for (name, value) in temp.store.data.items()]
+        variables = robotapi.VariableFileSetter._import_if_needed(varfile_path, args)
+        return [(name, _picklable(value), varfile_path) for name, value in variables]
+    except robotapi.DataError:
+        raise
+    except Exception as e:
+        raise robotapi.DataError("Processing variable file '%s' failed: %s" % (varfile_path, e))
+
+
+def _picklable(value):
+    try:
+        return _plain(value)
+    except RecursionError:
+        return _format_value(value)
+
+
+def _plain(value):
+    if type(value) in _SCALARS:
+        return value
+    if isinstance(value, dict):
+        return dict((_plain(key), _plain(item)) for key, item in value.items())
+    for container in _CONTAINERS:
+        if isinstance(value, container):
+            return container(_plain(item) for item in value)
+    return _format_value(value)
 
 
 # Must be picklable
@@ -37,3 +66,35 @@ def _format_value(value):
     if isinstance(value, list):
         return u'[ %s ]' % u' | '.join(str(v) for v in value)
     return str(value)
+
+
+def serve():
+    """Worker process main loop reading variable file tasks from stdin."""
+    # Variable files may write to stdout when imported, keep it for the results only.
+    channel = os.fdopen(os.dup(sys.stdout.fileno()), 'wb')
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    tasks = sys.stdin.buffer
+    from ..spec.libraryimporter import read_frame, write_frame, READY
+    write_frame(channel, READY)
+    while True:
+        try:
+            varfile_path, args, sys_path = read_frame(tasks)
+        except EOFError:
+            return
+        for path in sys_path:
+            if path not in sys.path:
+                sys.path.append(path)
+        try:
+            response = ('ok', import_varfile(varfile_path, args))
+        except BaseException as err:
+            response = ('error', str(err) or err.__class__.__name__)
+        write_frame(channel, response)
+
+
+def _forget_module(path):
+    """Removes module imported earlier from `path`, so that it is evaluated again."""
+    name = os.path.splitext(os.path.basename(path))[0]
+    source = getattr(sys.modules.get(name), '__file__', None)
+    if source and os.path.splitext(os.path.normcase(os.path.abspath(source)))[0] == \
+            os.path.splitext(os.path.normcase(os.path.abspath(path)))[0]:
+        del sys.modules[name]
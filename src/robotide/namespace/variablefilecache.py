@@ -0,0 +1,141 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""Cache of variables read from variable files.
+
+Variable files can be evaluated in a separate worker process with a timeout,
+so that a slow variable file or one with side effects does not run inside
+RIDE over and over. Results are kept per file path and arguments until the
+file is modified, and optionally also on disk in the settings directory.
+"""
+
+import hashlib
+import os
+import pickle
+import sys
+from threading import RLock
+
+from .. import robotapi
+from ..context import SETTINGS_DIRECTORY
+from ..version import VERSION
+
+CACHE_DIRECTORY = os.path.join(SETTINGS_DIRECTORY, 'variable_files')
+
+
+class VariableFileCache(object):
+    """Returns variables of variable files as `(name, value, source)` triples.
+
+    `settings` may define `variable file timeout`, seconds after which the
+    evaluation in a worker process is cancelled, or 0 (default) to evaluate
+    in RIDE process, and `cache variable files` to keep the results also on
+    disk. Results are evaluated again only when the variable file itself is
+    modified, not when modules or files it reads change.
+    """
+
+    def __init__(self, settings=None, directory=None):
+        settings = settings if settings is not None else {}
+        self._timeout = settings.get('variable file timeout', 0)
+        self._directory = (directory or CACHE_DIRECTORY) if settings.get('cache variable files', False) else None
+        self._results = {}
+        self._worker = None
+        self._lock = RLock()
+        self._worker_lock = RLock()
+
+    def get_variables(self, path, args):
+        """Returns variables of variable file `path` or raises `DataError`."""
+        args = tuple(args or ())
+        path = os.path.normcase(os.path.abspath(path))
+        try:
+            stat = os.stat(path)
+        except OSError as err:
+            raise robotapi.DataError("Variable file '%s' does not exist: %s" % (path, err))
+        key = (path, args)
+        version = (VERSION, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._results.get(key)
+        if cached is None or cached[0] != version:
+            result = self._read_entry(key, version)
+            if result is None:
+                result = self._evaluate(path, args)
+                if result[0] == 'ok':
+                    self._write_entry(key, version, result[1])
+            cached = (version, result)
+            with self._lock:
+                self._results[key] = cached
+        status, value = cached[1]
+        if status != 'ok':
+            raise robotapi.DataError(value)
+        return value
+
+    def expire(self, path):
+        """Removes cached results of variable file `path` with any arguments."""
+        path = os.path.normcase(os.path.abspath(path))
+        with self._lock:
+            for key in [key for key in self._results if key[0] == path]:
+                del self._results[key]
+
+    def _evaluate(self, path, args):
+        if not self._timeout or self._timeout <= 0:
+            from .variablefetcher import import_varfile
+            try:
+                return 'ok', import_varfile(path, list(args))
+            except Exception as err:
+                return 'error', str(err)
+        with self._worker_lock:
+            if self._worker is None:
+                from ..spec.libraryimporter import WorkerProcess, worker_command
+                self._worker = WorkerProcess(worker_command('robotide.namespace.variablefetcher'), self._timeout)
+            return self._worker.call((path, list(args), list(sys.path)), "variable file '%s'" % path)
+
+    def close(self):
+        with self._worker_lock:
+            if self._worker:
+                self._worker.close()
+                self._worker = None
+
+    def _read_entry(self, key, version):
+        if not self._directory:
+            return None
+        try:
+            with open(self._entry_path(key), 'rb') as entry:
+                if pickle.load(entry) != (key, version):
+                    return None
+                return 'ok', pickle.load(entry)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print("Could not read variable file cache for '%s': %s" % (key[0], e))
+            return None
+
+    def _write_entry(self, key, version, variables):
+        if not self._directory:
+            return
+        entry_path = self._entry_path(key)
+        temp_path = '%s.%d.tmp' % (entry_path, os.getpid())
+        try:
+            if not os.path.isdir(self._directory):
+                os.makedirs(self._directory)
+            with open(temp_path, 'wb') as entry:
+                pickle.dump((key, version), entry, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(variables, entry, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, entry_path)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError) as e:
+            print("Could not write variable file cache for '%s': %s" % (key[0], e))
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def _entry_path(self, key):
+        name = '%s|%r' % key
+        return os.path.join(self._directory, hashlib.sha1(name.encode('UTF-8')).hexdigest() + '.pickle')
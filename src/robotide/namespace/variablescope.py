@@ -0,0 +1,59 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""Tables of the variables visible in datafiles.
+
+A table is built once per datafile and kept until the datafile or any of
+its imports change. Variables defined by the datafile and its imports are
+stored in the table of the datafile, which is layered over one table of the
+built-in variables shared by all datafiles.
+"""
+
+
+class VariableScope(object):
+    """Immutable table of variables, looked up by their names.
+
+    Variables are `VariableInfo` objects. Variables of the table shadow the
+    variables with the same base name in `parent`.
+    """
+
+    def __init__(self, variables, parent=None):
+        self._variables = {}
+        self._base_names = set()
+        for variable in variables:
+            self._variables.setdefault(variable.name, variable)
+            self._base_names.add(variable.name[2:-1])
+        self._parent = parent
+
+    def get(self, name):
+        """Returns the variable with decorated `name`, like `${var}`, or `None`."""
+        variable = self._variables.get(name)
+        if variable is None and self._parent and name[2:-1] not in self._base_names:
+            return self._parent.get(name)
+        return variable
+
+    def __contains__(self, name):
+        return self.get(name) is not None
+
+    def __iter__(self):
+        for variable in self._variables.values():
+            yield variable
+        if self._parent:
+            for variable in self._parent:
+                if variable.name[2:-1] not in self._base_names:
+                    yield variable
+
+    def __len__(self):
+        return sum(1 for _ in self)
@@ -0,0 +1,113 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""Index of the words in an edited document for content assist.
+
+The words of every line are kept, so that when lines change only their
+words are indexed again. Words are reference counted, so a word is removed
+from the index when the last line containing it changes.
+"""
+
+from bisect import bisect_left, insort
+
+VARIABLE_CHARACTERS = '$&@%{[()]}'
+_STRIPPED_CHARACTERS = VARIABLE_CHARACTERS + '='
+_LAST_CHARACTER = chr(0x10FFFF)
+
+
+def line_words(line):
+    """Returns the words of `line` to be suggested, in the order they appear."""
+    words = []
+    for word in line.replace('\r', ' ').replace('\n', ' ').split(' '):
+        stripped = var_strip(word)
+        if stripped and stripped[0].isalpha():
+            words.append(word)
+    return words
+
+
+def var_strip(text):
+    for character in VARIABLE_CHARACTERS:
+        text = text.strip(character)
+    return text
+
+
+class WordIndex(object):
+
+    def __init__(self, text=''):
+        self.set_text(text)
+
+    def set_text(self, text):
+        self._lines = []
+        self._counts = {}
+        self._keys = []
+        self._stripped_keys = []
+        self.replace_lines(0, 0, text.split('\n'))
+
+    def replace_lines(self, first, count, lines):
+        """Replaces `count` lines starting from line `first` with `lines`."""
+        removed = self._lines[first:first + count]
+        added = [line_words(line) for line in lines]
+        self._lines[first:first + count] = added
+        for words in added:
+            for word in words:
+                self._add(word)
+        for words in removed:
+            for word in words:
+                self._remove(word)
+
+    def __len__(self):
+        return len(self._counts)
+
+    def __contains__(self, word):
+        return word in self._counts
+
+    def words(self):
+        return sorted(self._counts)
+
+    def starting_with(self, start):
+        """Returns words starting with `start`, ignoring case.
+
+        Words also match if they start with `start` when variable characters
+        are stripped from both.
+        """
+        found = set(self._beginning_with(self._keys, start.lower()))
+        found.update(self._beginning_with(self._stripped_keys, self._stripped(start)))
+        return found
+
+    @staticmethod
+    def _beginning_with(keys, start):
+        first = bisect_left(keys, (start,))
+        last = bisect_left(keys, (start + _LAST_CHARACTER,), first)
+        return [word for _, word in keys[first:last]]
+
+    @staticmethod
+    def _stripped(word):
+        return word.strip(_STRIPPED_CHARACTERS).lower()
+
+    def _add(self, word):
+        count = self._counts.get(word, 0)
+        self._counts[word] = count + 1
+        if not count:
+            insort(self._keys, (word.lower(), word))
+            insort(self._stripped_keys, (self._stripped(word), word))
+
+    def _remove(self, word):
+        count = self._counts[word] - 1
+        if count:
+            self._counts[word] = count
+            return
+        del self._counts[word]
+        for keys, key in ((self._keys, word.lower()), (self._stripped_keys, self._stripped(word))):
+            del keys[bisect_left(keys, (key, word))]
@@ -14,5 +14,6 @@
 #  limitations under the License.
 
 from .librarydatabase import DATABASE_FILE
+from .libraryimporter import LibraryImporterPool, DEFAULT_TIMEOUT as DEFAULT_IMPORT_TIMEOUT
 from .librarymanager import LibraryManager
 
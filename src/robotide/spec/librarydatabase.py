@@ -21,19 +21,25 @@ from ..preferences.settings import SETTINGS_DIRECTORY
 from ..spec.iteminfo import LibraryKeywordInfo
 from ..lib.robot.utils import system_decode
 
+SCHEMA_VERSION = 2
+
 CREATION_SCRIPT = """\
 CREATE TABLE libraries (id INTEGER PRIMARY KEY,
                         name TEXT,
                         doc_format TEXT,
                         arguments TEXT,
-                        last_updated REAL);
+                        last_updated REAL,
+                        fingerprint TEXT);
 CREATE TABLE keywords (name TEXT,
                        doc TEXT,
                        arguments TEXT,
                        library_name TEXT,
                        library INTEGER,
                        FOREIGN KEY(library) REFERENCES libraries(id));
-"""
+CREATE INDEX libraries_name_arguments ON libraries(name, arguments);
+CREATE INDEX keywords_library ON keywords(library);
+PRAGMA user_version = %d;
+""" % SCHEMA_VERSION
 
 DATABASE_FILE = os.path.join(system_decode(SETTINGS_DIRECTORY),
                              'librarykeywords.db')
@@ -51,14 +57,25 @@ def _create_database():
 def _validate_database():
     connection = sqlite3.connect(DATABASE_FILE)
     try:
+        version = connection.execute('pragma user_version').fetchone()[0]
+        if version != SCHEMA_VERSION:
+            raise sqlite3.DatabaseError('schema version %d, expected %d'
+                                        % (version, SCHEMA_VERSION))
         connection.execute('select id, name, doc_format, arguments,'
-                           ' last_updated from libraries')
+                           ' last_updated, fingerprint from libraries')
         connection.execute('select name, doc, arguments, library_name,'
                            ' library from keywords')
     finally:
         connection.close()
 
 
+def _remove_database():
+    # Write-ahead log files belong to the database and are removed with it
+    for path in (DATABASE_FILE, DATABASE_FILE + '-wal', DATABASE_FILE + '-shm'):
+        if os.path.exists(path):
+            os.remove(path)
+
+
 def initialize_database():
     if not os.path.exists(SETTINGS_DIRECTORY):
         os.makedirs(SETTINGS_DIRECTORY)
@@ -71,7 +88,7 @@ def initialize_database():
             print('removing database "%s"' % DATABASE_FILE)
             print('error during database validation "%s"' % err)
             try:
-                os.remove(DATABASE_FILE)
+                _remove_database()
             except Exception as err:
                 print('failed to remove database "%s"' % DATABASE_FILE)
                 raise err
@@ -82,6 +99,10 @@ class LibraryDatabase(object):
 
     def __init__(self, database):
         self._connection = sqlite3.connect(database, timeout=30.0)
+        if database != ':memory:':
+            # Readers in other threads are not blocked by the writer
+            self._connection.execute('pragma journal_mode=wal')
+            self._connection.execute('pragma synchronous=normal')
 
     def create_database(self):
         self._cursor().executescript(CREATION_SCRIPT)
@@ -94,32 +115,40 @@ class LibraryDatabase(object):
         self._connection.close()
 
     def insert_library_keywords(self, library_name, library_arguments,
-                                keywords):
+                                keywords, fingerprint=None):
         library_doc_format = "ROBOT"
         if len(keywords) > 0:
             library_doc_format = keywords[0].doc_format
-
-        cur = self._cursor()
-        old_versions = cur.execute('select id from libraries where name = ?  '
-                                   'and arguments = ?',
-                                   (library_name,
-                                    str(library_arguments))).fetchall()
-        cur.executemany('delete from keywords where library = ?', old_versions)
-        cur.executemany('delete from libraries where id = ?', old_versions)
-        lib = self._insert_library(library_name, library_doc_format,
-                                   library_arguments, cur)
-        keyword_values = [[kw.name, kw.doc, u' | '.join(kw.arguments),
-                           kw.source,
-                           lib[0]] for kw in keywords if kw is not None]
-        self._insert_library_keywords(keyword_values, cur)
-        self._connection.commit()
-
-    def update_library_timestamp(self, name, arguments, milliseconds=None):
-        self._cursor().execute('update libraries set last_updated = ?'
-                               ' where name = ? and arguments = ?',
-                               (milliseconds or time.time(), name,
-                                str(arguments)))
-        self._connection.commit()
+        with self._connection:
+            cur = self._cursor()
+            old_versions = cur.execute('select id from libraries where name = ?'
+                                       ' and arguments = ?',
+                                       (library_name,
+                                        str(library_arguments))).fetchall()
+            cur.executemany('delete from keywords where library = ?',
+                            old_versions)
+            cur.executemany('delete from libraries where id = ?', old_versions)
+            lib_id = self._insert_library(library_name, library_doc_format,
+                                          library_arguments, fingerprint, cur)
+            keyword_values = [(kw.name, kw.doc, u' | '.join(kw.arguments),
+                               kw.source, lib_id)
+                              for kw in keywords if kw is not None]
+            self._insert_library_keywords(keyword_values, cur)
+
+    def update_library_timestamp(self, name, arguments, milliseconds=None,
+                                 fingerprint=None):
+        with self._connection:
+            if fingerprint is None:
+                self._cursor().execute('update libraries set last_updated = ?'
+                                       ' where name = ? and arguments = ?',
+                                       (milliseconds or time.time(), name,
+                                        str(arguments)))
+            else:
+                self._cursor().execute('update libraries set last_updated = ?,'
+                                       ' fingerprint = ? where name = ? and'
+                                       ' arguments = ?',
+                                       (milliseconds or time.time(),
+                                        fingerprint, name, str(arguments)))
 
     def fetch_library_keywords(self, library_name, library_arguments):
         lib = self._fetch_lib(library_name, library_arguments, self._cursor())
@@ -142,19 +171,25 @@ class LibraryDatabase(object):
             return 0.0
         return lib[4]
 
-    def _insert_library(self, name, doc_format, arguments, cursor):
-        cursor.execute('insert into libraries values (null, ?, ?, ?, ?)',
-                       (name, doc_format, str(arguments), time.time()))
-        return self._fetch_lib(name, arguments, cursor)
+    def get_library_fingerprint(self, library_name, library_arguments):
+        lib = self._fetch_lib(library_name, library_arguments, self._cursor())
+        if not lib:
+            return None
+        return lib[5]
+
+    def _insert_library(self, name, doc_format, arguments, fingerprint,
+                        cursor):
+        cursor.execute('insert into libraries values (null, ?, ?, ?, ?, ?)',
+                       (name, doc_format, str(arguments), time.time(),
+                        fingerprint))
+        return cursor.lastrowid
 
     @staticmethod
     def _fetch_lib(name, arguments, cursor):
-        t = cursor.execute('select max(last_updated) from libraries where name'
-                           ' = ?  and arguments = ?',
-                           (name, str(arguments))).fetchone()[0]
         return cursor.execute('select * from libraries where name = ?'
-                              '  and arguments = ? and last_updated = ?',
-                              (name, str(arguments), t)).fetchone()
+                              ' and arguments = ?'
+                              ' order by last_updated desc limit 1',
+                              (name, str(arguments))).fetchone()
 
     @staticmethod
     def _insert_library_keywords(data, cursor):
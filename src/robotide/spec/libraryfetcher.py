@@ -13,8 +13,34 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
-from ..robotapi import TestLibrary
+import os
+
+from ..robotapi import DataError, TestLibrary
 from .iteminfo import LibraryKeywordInfo
+from .xmlreaders import get_path
+
+
+def import_library_keywords(library_name, library_args, basedir=None, doc_paths=None):
+    """Imports library keywords searching first from `basedir` and then from `doc_paths`.
+
+    Raises `DataError` when the library could not be found from any of them.
+    """
+    name = library_name.replace('/', os.sep)
+    path = get_path(name, basedir or os.path.abspath('.'))
+    if path:
+        results = get_import_result(path, library_args)
+        if results:
+            return results
+    collection = []
+    for doc_path in doc_paths or []:
+        path = get_path(name, doc_path.strip())
+        if path:
+            results = get_import_result(path, library_args)
+            if results:
+                collection.extend(results)
+    if collection:
+        return collection
+    raise DataError('Library "%s" not found' % library_name)
 
 
 def get_import_result(path, args):
@@ -0,0 +1,112 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""Fingerprints telling whether the source of a test library has changed.
+
+A fingerprint is computed without importing the library. It covers the
+library source files (paths, modification times and sizes), the version of
+the installed distribution providing the library and the library arguments.
+"""
+
+import hashlib
+import importlib.util
+import os
+
+from ..robotapi import ROBOT_VERSION, STDLIB_NAMES
+from ..version import VERSION
+from .xmlreaders import get_path
+
+try:
+    from importlib.metadata import packages_distributions, version as distribution_version
+except ImportError:  # Python < 3.10
+    packages_distributions = distribution_version = None
+
+_SOURCE_EXTENSIONS = ('.py', '.pyc', '.pyd', '.so', '.java', '.class', '.jar')
+_distributions = None
+
+
+def get_library_fingerprint(library_name, library_args, basedir=None, doc_paths=None):
+    """Returns fingerprint of the library or `None` if its source is not found."""
+    if library_name in STDLIB_NAMES:
+        return _digest([library_name, str(library_args), str(ROBOT_VERSION), VERSION])
+    name = library_name.replace('/', os.sep)
+    path = None
+    for base in [basedir or os.path.abspath('.')] + [p.strip() for p in doc_paths or []]:
+        path = get_path(name, base)
+        if path:
+            break
+    if not path:
+        return None
+    if os.path.exists(path):
+        sources, version = _source_files(path), None
+    else:
+        module = path.split('.')[0]
+        sources, version = _source_files(_find_module_path(module)), _installed_version(module)
+    if not sources:
+        return None
+    return _digest([library_name, str(library_args), version or ''] + sources)
+
+
+def _digest(parts):
+    return hashlib.sha1('\n'.join(parts).encode('UTF-8')).hexdigest()
+
+
+def _find_module_path(module):
+    try:
+        spec = importlib.util.find_spec(module)
+    except (ImportError, ValueError):
+        return None
+    if spec is None:
+        return None
+    if spec.submodule_search_locations:
+        locations = list(spec.submodule_search_locations)
+        return locations[0] if locations else None
+    return spec.origin if spec.origin and os.path.isfile(spec.origin) else None
+
+
+def _source_files(path):
+    if not path:
+        return []
+    if os.path.isfile(path):
+        return [_stat(path)]
+    sources = []
+    for root, dirs, files in os.walk(path):
+        dirs[:] = sorted(d for d in dirs if d != '__pycache__' and not d.startswith('.'))
+        sources.extend(_stat(os.path.join(root, f)) for f in sorted(files)
+                       if f.endswith(_SOURCE_EXTENSIONS))
+    return sources
+
+
+def _stat(path):
+    stat = os.stat(path)
+    return '%s|%d|%d' % (path, stat.st_mtime_ns, stat.st_size)
+
+
+def _installed_version(module):
+    global _distributions
+    if packages_distributions is None:
+        return None
+    if _distributions is None:
+        try:
+            _distributions = packages_distributions()
+        except Exception:
+            _distributions = {}
+    for distribution in _distributions.get(module, []):
+        try:
+            return distribution_version(distribution)
+        except Exception:
+            continue
+    return None
+
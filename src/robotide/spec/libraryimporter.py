@@ -0,0 +1,255 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""Pool of worker processes importing test libraries outside RIDE process.
+
+Libraries are imported in parallel, each in a separate Python process, so that
+a slow or hanging library import does not block the others. Imports that do
+not finish in time are cancelled by killing the worker process, which is then
+replaced with a fresh one for the next import.
+
+NOTE! The worker side of this module (`serve`) is executed in another process.
+"""
+
+import os
+import pickle
+import queue
+import struct
+import subprocess
+import sys
+from threading import Thread
+
+DEFAULT_TIMEOUT = 60.0
+STARTUP_TIMEOUT = 60.0
+READY = ('ready', None)
+_HEADER = struct.Struct('>I')
+_SOURCE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Worker processes need only these packages, and their `__init__` modules
+# would import wx and most of RIDE, so they are created as empty packages.
+_WORKER_PACKAGES = ('robotide', 'robotide.spec', 'robotide.namespace')
+
+
+def write_frame(stream, obj):
+    data = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+    stream.write(_HEADER.pack(len(data)) + data)
+    stream.flush()
+
+
+def read_frame(stream):
+    return pickle.loads(_read_data(stream))
+
+
+def _read_data(stream):
+    header = stream.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        raise EOFError
+    size = _HEADER.unpack(header)[0]
+    data = stream.read(size)
+    if len(data) < size:
+        raise EOFError
+    return data
+
+
+def worker_environment():
+    """Returns environment for worker processes that can import `robotide`."""
+    python_path = os.environ.get('PYTHONPATH')
+    return dict(os.environ, PYTHONPATH=os.pathsep.join([_SOURCE_DIR, python_path]) if python_path
+                else _SOURCE_DIR, PYTHONIOENCODING='UTF-8')
+
+
+def worker_command(module, packages=_WORKER_PACKAGES):
+    """Returns Python code running `serve` of `module` in a worker process.
+
+    `packages`, `_WORKER_PACKAGES` by default, are created without running
+    their `__init__` modules, but the paths `robotide/__init__.py` adds to
+    `sys.path` are added.
+    """
+    packages = [(name, os.path.join(_SOURCE_DIR, *name.split('.'))) for name in packages]
+    robotide_dir = packages[0][1]
+    return ('import sys, types\n'
+            'for name, path in %r:\n'
+            '    sys.modules[name] = types.ModuleType(name)\n'
+            '    sys.modules[name].__path__ = [path]\n'
+            'sys.path.extend(%r)\n'
+            'from %s import serve\n'
+            'serve()\n' % (packages, [os.path.join(robotide_dir, 'spec'), os.path.join(robotide_dir, 'lib')],
+                            module))
+
+
+class LibraryImporterPool(object):
+    """Imports libraries in parallel worker processes.
+
+    `submit` returns immediately and `callback` is later called, in one of
+    the pool threads, with two arguments: the list of imported keywords and
+    the error message. Exactly one of them is `None`.
+    """
+
+    def __init__(self, workers=None, timeout=DEFAULT_TIMEOUT):
+        self._size = max(1, workers or os.cpu_count() or 1)
+        self._timeout = timeout
+        self._tasks = queue.Queue()
+        self._threads = []
+
+    @property
+    def size(self):
+        return self._size
+
+    def start(self):
+        for _ in range(self._size):
+            thread = Thread(target=self._run_worker, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        for _ in self._threads:
+            self._tasks.put(None)
+        self._threads = []
+
+    def submit(self, library_name, library_args, callback, basedir=None, doc_paths=None):
+        task = (library_name, library_args, basedir or os.path.abspath('.'),
+                list(doc_paths or []), list(sys.path))
+        self._tasks.put((task, callback))
+
+    def _run_worker(self):
+        worker = WorkerProcess(worker_command(__name__), self._timeout)
+        try:
+            while True:
+                item = self._tasks.get()
+                if item is None:
+                    break
+                task, callback = item
+                keywords, error = self._import_library(worker, task)
+                self._call(callback, keywords, error)
+        finally:
+            worker.close()
+
+    @staticmethod
+    def _import_library(worker, task):
+        status, value = worker.call(task, 'library "%s"' % task[0])
+        if status == 'ok':
+            from .iteminfo import LibraryKeywordInfo
+            return [LibraryKeywordInfo(*record) for record in value], None
+        return None, value
+
+    @staticmethod
+    def _call(callback, keywords, error):
+        try:
+            callback(keywords, error)
+        except Exception as err:
+            from ..publish import RideLogException
+            msg = 'Library import callback threw an unexpected exception'
+            RideLogException(message=msg, exception=err, level='WARN').publish()
+
+
+class WorkerProcess(object):
+    """Python process running `command`, which handles one task at a time.
+
+    The process writes `READY` to stdout when it has started, then reads
+    tasks from stdin and writes `(status, value)` responses to stdout using
+    `read_frame` and `write_frame`. A process not responding in `timeout`
+    seconds, not counting its startup, is killed and started again for the
+    next task.
+    """
+
+    def __init__(self, command, timeout):
+        self._command = command
+        self._timeout = timeout
+        self._process = None
+        self._responses = None
+
+    def call(self, task, description):
+        """Returns the response to `task` or `('error', message)` if there was none.
+
+        `description` tells what the task imports, like `library "Name"`.
+        """
+        try:
+            self._ensure_started()
+            write_frame(self._process.stdin, task)
+        except (OSError, ValueError) as err:
+            self.close()
+            return 'error', 'Could not start process importing %s: %s' % (description, err)
+        try:
+            response = self._responses.get(timeout=self._timeout)
+        except queue.Empty:
+            self.close()
+            return 'error', 'Importing %s timed out after %s seconds' % (description, self._timeout)
+        if response is None:
+            self.close()
+            return 'error', 'Process importing %s died unexpectedly' % description
+        return response
+
+    def _ensure_started(self):
+        if self._process and self._process.poll() is None:
+            return
+        self._responses = queue.Queue()
+        self._process = subprocess.Popen([sys.executable, '-c', self._command],
+                                         stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                         stderr=subprocess.DEVNULL, env=worker_environment())
+        Thread(target=self._read_responses, args=(self._process.stdout, self._responses), daemon=True).start()
+        try:
+            response = self._responses.get(timeout=STARTUP_TIMEOUT)
+        except queue.Empty:
+            response = None
+        if response != READY:
+            raise OSError('process did not get ready')
+
+    @staticmethod
+    def _read_responses(stream, responses):
+        while True:
+            try:
+                data = _read_data(stream)
+            except (EOFError, OSError, ValueError):
+                responses.put(None)
+                return
+            try:
+                responses.put(pickle.loads(data))
+            except Exception as err:
+                # For example, a class of the response cannot be imported in this process
+                responses.put(('error', 'Could not read response: %s' % (str(err) or err.__class__.__name__)))
+
+    def close(self):
+        if not self._process:
+            return
+        try:
+            self._process.kill()
+            self._process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+        self._process = None
+
+
+def serve():
+    """Worker process main loop reading import tasks from stdin."""
+    # Libraries may write to stdout when imported, keep it for the results only.
+    channel = os.fdopen(os.dup(sys.stdout.fileno()), 'wb')
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    tasks = sys.stdin.buffer
+    from .libraryfetcher import import_library_keywords
+    write_frame(channel, READY)
+    while True:
+        try:
+            library_name, library_args, basedir, doc_paths, sys_path = read_frame(tasks)
+        except EOFError:
+            return
+        for path in sys_path:
+            if path not in sys.path:
+                sys.path.append(path)
+        try:
+            keywords = import_library_keywords(library_name, library_args, basedir, doc_paths)
+            response = ('ok', [(kw.name, kw.doc, kw.doc_format, kw.source, kw.arguments)
+                               for kw in keywords if kw is not None])
+        except BaseException as err:
+            response = ('error', str(err) or err.__class__.__name__)
+        write_frame(channel, response)
@@ -15,28 +15,36 @@
 
 import os
 import queue
+import time
 from sqlite3 import OperationalError
-from threading import Thread
+from threading import Lock, Thread, local
 
-import robotide.robotapi
 from ..publish import RideLogException, RideLogMessage
+from ..robotapi import DataError
 from ..spec.librarydatabase import LibraryDatabase
-from ..spec.libraryfetcher import get_import_result
-from ..spec.xmlreaders import get_path, SpecInitializer
+from ..spec.libraryfetcher import import_library_keywords
+from ..spec.libraryfingerprint import get_library_fingerprint
+from ..spec.xmlreaders import SpecInitializer
 
 
 class LibraryManager(Thread):
+    # Seconds `get_and_insert_keywords` waits for the keywords
+    INSERT_TIMEOUT = 5
 
-    def __init__(self, database_name, spec_initializer=None):
+    def __init__(self, database_name, spec_initializer=None, importer_pool=None):
         self._database_name = database_name
         self._database = None
         self._messages = queue.Queue()
         self._spec_initializer = spec_initializer or SpecInitializer()
+        self._importer_pool = importer_pool
+        self._thread_databases = local()
         Thread.__init__(self)
         self.daemon = True
 
     def run(self):
         self._initiate_database_connection()
+        if self._importer_pool:
+            self._importer_pool.start()
         while True:
             try:
                 if not self._handle_message():
@@ -44,6 +52,8 @@ class LibraryManager(Thread):
             except Exception as err:
                 msg = 'Library import handling threw an unexpected exception'
                 RideLogException(message=msg, exception=err, level='WARN').publish()
+        if self._importer_pool:
+            self._importer_pool.stop()
         self._database.close()
 
     def _initiate_database_connection(self):
@@ -57,6 +67,18 @@ class LibraryManager(Thread):
             library_database.create_database()
         return library_database
 
+    def get_library_database(self):
+        """Returns a connection to the library database owned by the calling thread.
+
+        The connection is created on first use and reused by later calls from
+        the same thread, so it must not be closed by the caller.
+        """
+        library_database = getattr(self._thread_databases, 'database', None)
+        if library_database is None:
+            library_database = self.get_new_connection_to_library_database()
+            self._thread_databases.database = library_database
+        return library_database
+
     def _handle_message(self):
         message = self._messages.get()
         if not message:
@@ -64,60 +86,96 @@ class LibraryManager(Thread):
         msg_type = message[0]
         if msg_type == 'fetch':
             self._handle_fetch_keywords_message(message)
+        elif msg_type == 'refresh':
+            self._handle_refresh_keywords_message(message)
         elif msg_type == 'insert':
             self._handle_insert_keywords_message(message)
+        elif msg_type in ('fetched', 'inserted'):
+            self._handle_imported_keywords_message(message)
         elif msg_type == 'create':
             self._database.create_database()
         return True
 
     def _handle_fetch_keywords_message(self, message):
         _, library_name, library_args, callback = message
+        if self._import_in_pool('fetched', library_name, library_args, callback):
+            return
         keywords = self._fetch_keywords(library_name, library_args)
         self._update_database_and_call_callback_if_needed((library_name, library_args), keywords, callback)
 
+    def _handle_refresh_keywords_message(self, message):
+        _, library_name, library_args, callback = message
+        if self._library_changed(library_name, library_args):
+            self._handle_fetch_keywords_message(('fetch', library_name, library_args, callback))
+
+    def _library_changed(self, library_name, library_args):
+        fingerprint = self.get_library_fingerprint(library_name, library_args)
+        if fingerprint is None:
+            # Library source not found without importing it, fall back to age
+            last_updated = self._database.get_library_last_updated(library_name, library_args)
+            return not last_updated or time.time() - last_updated > 10.0
+        return fingerprint != self._database.get_library_fingerprint(library_name, library_args)
+
+    def _import_in_pool(self, msg_type, library_name, library_args, target):
+        if not self._importer_pool or self._is_library_without_keywords(library_name):
+            return False
+
+        def imported(keywords, error):
+            self._messages.put((msg_type, library_name, library_args, keywords, error, target))
+        self._importer_pool.submit(library_name, library_args, imported, os.path.abspath('.'), self._doc_paths())
+        return True
+
+    def _handle_imported_keywords_message(self, message):
+        msg_type, library_name, library_args, keywords, error, target = message
+        if error is not None:
+            keywords = self._fetch_keywords_from_spec(library_name, DataError(error))
+        if msg_type == 'fetched':
+            self._update_database_and_call_callback_if_needed((library_name, library_args), keywords, target)
+        else:
+            self._insert(library_name, library_args, keywords, target.put)
+
+    @staticmethod
+    def _is_library_without_keywords(library_name):
+        # Known libraries without keywords
+        return library_name in ("DataDriver", "Remote")
+
     def _fetch_keywords(self, library_name, library_args):
-        if library_name in ("DataDriver", "Remote"):  # Known libraries without keywords
+        if self._is_library_without_keywords(library_name):
             msg = 'Library "%s" does not contain keywords' % library_name
             RideLogMessage(message=msg, level='INFO').publish()
             return []
         try:
-            doc_paths = os.getenv('RIDE_DOC_PATH')
-            collection = []
-            path = get_path(library_name.replace('/', os.sep), os.path.abspath('.'))
-            if path:
-                results = get_import_result(path, library_args)
-                if results:
-                    return results
-            if doc_paths:
-                for p in doc_paths.split(','):
-                    path = get_path(library_name.replace('/', os.sep), p.strip())
-                    if path:
-                        results = get_import_result(path, library_args)
-                        if results:
-                            collection.extend(results)
-            if collection:
-                return collection
-            raise robotide.robotapi.DataError
+            return import_library_keywords(library_name, library_args, os.path.abspath('.'), self._doc_paths())
         except Exception as err:
-            try:
-                print('FAILED', library_name, err)
-            except IOError:
-                pass
-            kws = self._spec_initializer.init_from_spec(library_name)
-            if not kws:
-                msg = 'Importing test library "%s" failed' % library_name
-                RideLogException(message=msg, exception=err, level='WARN').publish()
-            return kws
+            return self._fetch_keywords_from_spec(library_name, err)
+
+    @staticmethod
+    def _doc_paths():
+        doc_paths = os.getenv('RIDE_DOC_PATH')
+        return doc_paths.split(',') if doc_paths else []
+
+    def _fetch_keywords_from_spec(self, library_name, err):
+        try:
+            print('FAILED', library_name, err)
+        except IOError:
+            pass
+        kws = self._spec_initializer.init_from_spec(library_name)
+        if not kws:
+            msg = 'Importing test library "%s" failed' % library_name
+            RideLogException(message=msg, exception=err, level='WARN').publish()
+        return kws
 
     def _handle_insert_keywords_message(self, message):
-        _, library_name, library_args, result_queue = message
+        _, library_name, library_args, result = message
+        if self._import_in_pool('inserted', library_name, library_args, result):
+            return
         keywords = self._fetch_keywords(library_name, library_args)
-        self._insert(library_name, library_args, keywords,
-                     lambda res: result_queue.put(res, timeout=3))
+        self._insert(library_name, library_args, keywords, result.put)
 
     def _insert(self, library_name, library_args, keywords, callback):
         self._database.insert_library_keywords(
-            library_name, library_args, keywords or [])
+            library_name, library_args, keywords or [],
+            self.get_library_fingerprint(library_name, library_args))
         self._call(callback, keywords)
 
     def _update_database_and_call_callback_if_needed(
@@ -128,7 +186,8 @@ class LibraryManager(Thread):
                 self._insert(
                     library_key[0], library_key[1], keywords, callback)
             else:
-                self._database.update_library_timestamp(*library_key)
+                self._database.update_library_timestamp(
+                    *library_key, fingerprint=self.get_library_fingerprint(*library_key))
         except OperationalError:
             pass
 
@@ -144,16 +203,36 @@ class LibraryManager(Thread):
         self._messages.put(('fetch', library_name, library_args, callback),
                            timeout=3)
 
-    def get_and_insert_keywords(self, library_name, library_args):
-        result_queue = queue.Queue(maxsize=1)
-        self._messages.put(('insert', library_name, library_args, result_queue), timeout=3)
+    def refresh_keywords(self, library_name, library_args, callback):
+        """Imports the library again if its source has changed since it was stored.
+
+        The check is done in the library manager thread, and `callback` is
+        called like with `fetch_keywords` if the keywords changed.
+        """
+        self._messages.put(('refresh', library_name, library_args, callback), timeout=3)
+
+    def get_and_insert_keywords(self, library_name, library_args, late_callback=None):
+        """Imports keywords to the database and returns them.
+
+        Returns an empty list if importing takes longer than `INSERT_TIMEOUT`.
+        In that case `late_callback`, if given, is called with the keywords
+        in the library manager thread when they have been inserted.
+        """
+        result = _InsertResult(late_callback)
+        self._messages.put(('insert', library_name, library_args, result), timeout=3)
         try:
-            return result_queue.get(timeout=5)
+            return result.get(timeout=self.INSERT_TIMEOUT)
         except queue.Empty as e:
             RideLogMessage(u'Failed to read keywords from library db: {}'
                            .format(str(e))).publish()
             return []
 
+    def get_library_fingerprint(self, library_name, library_args):
+        try:
+            return get_library_fingerprint(library_name, library_args, os.path.abspath('.'), self._doc_paths())
+        except Exception:
+            return None
+
     def create_database(self):
         self._messages.put(('create',), timeout=3)
 
@@ -176,3 +255,31 @@ class LibraryManager(Thread):
             if k1.source != k2.source:
                 return True
         return False
+
+
+class _InsertResult(object):
+    """Keywords inserted for a caller, who may have stopped waiting for them."""
+
+    def __init__(self, late_callback=None):
+        self._keywords = queue.Queue(maxsize=1)
+        self._late_callback = late_callback
+        self._abandoned = False
+        self._lock = Lock()
+
+    def put(self, keywords):
+        with self._lock:
+            if not self._abandoned:
+                self._keywords.put(keywords)
+                return
+        if self._late_callback:
+            self._late_callback(keywords)
+
+    def get(self, timeout):
+        try:
+            return self._keywords.get(timeout=timeout)
+        except queue.Empty:
+            with self._lock:
+                if not self._keywords.empty():
+                    return self._keywords.get()
+                self._abandoned = True
+            raise
@@ -13,6 +13,7 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import json
 import os
 import sys
 
@@ -23,9 +24,10 @@ from .iteminfo import _XMLKeywordContent
 
 class SpecInitializer(object):
 
-    def __init__(self, directories=None):
+    def __init__(self, directories=None, spec_index=None):
         self._directories = directories or []
         self._directories.append(context.LIBRARY_XML_DIRECTORY)
+        self._spec_index = spec_index or SpecIndex()
 
     def init_from_spec(self, name):
         specfile = self._find_from_pythonpath(name) or \
@@ -41,35 +43,7 @@ class SpecInitializer(object):
         return None
 
     def _find_from_library_xml_directory(self, directory, name):
-        current_xml_file = None
-        for xml_file in self._list_xml_files_in(directory):
-            name_from_xml = get_name_from_xml(xml_file)
-            if name_from_xml == name:
-                current_xml_file = self._get_newest_xml_file(
-                    xml_file, current_xml_file)
-        return current_xml_file
-
-    def _get_newest_xml_file(self, xml_file, current_xml_file):
-        version1 = self._get_version(xml_file)
-        version2 = self._get_version(current_xml_file)
-        if cmp_versions(version1, version2) == 1:
-            return xml_file
-        return current_xml_file
-
-    @staticmethod
-    def _get_version(xml_file):
-        try:
-            return utils.ET.parse(xml_file).getroot().find('version').text
-        except Exception as e:
-            print(e)
-            return None
-
-    @staticmethod
-    def _list_xml_files_in(directory):
-        for filename in os.listdir(directory):
-            path = os.path.join(directory, filename)
-            if path.endswith('.xml') and os.path.isfile(path):
-                yield path
+        return self._spec_index.find(directory, name)
 
     def _find_from_pythonpath(self, name):
         return utils.find_from_pythonpath(name + '.xml')
@@ -131,9 +105,133 @@ def _get_library_name(name):
 
 def get_name_from_xml(path):
     try:
-        root = utils.ET.parse(path).getroot()
-        name = root.get('name')
-        return name
+        return read_spec_header(path)[0]
     except Exception as e:
         print(e)
         return None
+
+
+def read_spec_header(path):
+    """Returns library name and version from a spec file.
+
+    Reading stops after the version element so keywords are not parsed.
+    """
+    name = version = None
+    depth = 0
+    with open(path, 'rb') as source:
+        for event, element in utils.ET.iterparse(source, events=('start', 'end')):
+            if event == 'start':
+                depth += 1
+                if depth == 1:
+                    name = element.get('name')
+                elif depth == 2 and element.tag in ('inits', 'keywords', 'kw'):
+                    break
+            else:
+                if depth == 2 and element.tag == 'version':
+                    version = element.text
+                    break
+                depth -= 1
+    return name, version
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class SpecIndex(object):
+    """Persistent index of library spec files by library name.
+
+    Index maps every spec file in the indexed directories to its library
+    name, version, modification time and size. A directory is listed again
+    when its modification time changes, that is, when files are added,
+    removed or renamed, or when the found file has been modified. Only added
+    and modified files are read again.
+    """
+
+    def __init__(self, path=None):
+        self._path = path or os.path.join(context.SETTINGS_DIRECTORY, 'library_spec_index.json')
+        self._files = None
+        self._names = {}
+        self._directory_mtimes = {}
+
+    def find(self, directory, name):
+        """Returns the path of the newest spec file of library `name` in `directory`."""
+        if not self._is_up_to_date(directory, name):
+            self._refresh(directory)
+        return self._names[directory].get(name)
+
+    def _is_up_to_date(self, directory, name):
+        if directory not in self._names or self._directory_mtimes[directory] != _mtime(directory):
+            return False
+        path = self._names[directory].get(name)
+        if path is None:
+            return True
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        return self._files[directory][path][2:] == [stat.st_mtime_ns, stat.st_size]
+
+    def _refresh(self, directory):
+        if self._files is None:
+            self._files = self._load()
+        # Taken before listing, so that files added meanwhile are found later
+        self._directory_mtimes[directory] = _mtime(directory)
+        old_files = self._files.get(directory, {})
+        files = {}
+        for path, mtime, size in self._list_xml_files_in(directory):
+            entry = old_files.get(path)
+            if not entry or entry[2:] != [mtime, size]:
+                try:
+                    entry = list(read_spec_header(path)) + [mtime, size]
+                except Exception as e:
+                    print(e)
+                    entry = [None, None, mtime, size]
+            files[path] = entry
+        if files == old_files and directory in self._names:
+            return
+        self._files[directory] = files
+        self._names[directory] = self._newest_by_name(files)
+        if files != old_files:
+            self._save()
+
+    @staticmethod
+    def _list_xml_files_in(directory):
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            return
+        for entry in sorted(entries, key=lambda e: e.name):
+            if entry.name.endswith('.xml') and entry.is_file():
+                stat = entry.stat()
+                yield entry.path, stat.st_mtime_ns, stat.st_size
+
+    @staticmethod
+    def _newest_by_name(files):
+        newest = {}
+        for path, (name, version, _, _) in files.items():
+            if name is None:
+                continue
+            if name not in newest or cmp_versions(version, newest[name][1]) == 1:
+                newest[name] = (path, version)
+        return dict((name, path) for name, (path, _) in newest.items())
+
+    def _load(self):
+        try:
+            with open(self._path, encoding='UTF-8') as index_file:
+                files = json.load(index_file)
+            return files if isinstance(files, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        temp_path = self._path + '.tmp'
+        try:
+            with open(temp_path, 'w', encoding='UTF-8') as index_file:
+                json.dump(self._files, index_file)
+            os.replace(temp_path, self._path)
+        except OSError as e:
+            print(e)
@@ -376,6 +376,18 @@ class Tree(treemixin.DragAndDrop, customtreectrl.CustomTreeCtrl, wx.Panel):
         self._dragging = False
         treemixin.DragAndDrop.OnEndDrag(self, event)
 
+    def Delete(self, item):  # Overrides wx method
+        self.controller.forget_nodes()
+        customtreectrl.CustomTreeCtrl.Delete(self, item)
+
+    def DeleteChildren(self, item):  # Overrides wx method
+        self.controller.forget_nodes()
+        customtreectrl.CustomTreeCtrl.DeleteChildren(self, item)
+
+    def DeleteAllItems(self):  # Overrides wx method
+        self.controller.forget_nodes()
+        customtreectrl.CustomTreeCtrl.DeleteAllItems(self)
+
     def register_context_menu_hook(self, callable_m):
         self._popup_creator.add_hook(callable_m)
 
@@ -555,6 +567,7 @@ class Tree(treemixin.DragAndDrop, customtreectrl.CustomTreeCtrl, wx.Panel):
         # print(f"DEBUG: _populate_model model={model} self._resource_root={self._resource_root}"
         #       f" self._controller.settings={self._controller.settings}")
         self.SetPyData(self._resource_root, handler)
+        self.controller.register_node(self._resource_root)
         if model.data:
             self._render_datafile(self.root, model.data, 0)
         for res in model.external_resources:
@@ -639,6 +652,7 @@ class Tree(treemixin.DragAndDrop, customtreectrl.CustomTreeCtrl, wx.Panel):
             self.SetItemTextColour(node, TREETEXTCOLOUR)  # wxPython3 hack
         action_handler = handler_class(controller, self, node, self.controller.settings)
         self.SetPyData(node, action_handler)
+        self.controller.register_node(node)
 
         # if we have a TestCase node we have to make sure that
         # we retain the checked state
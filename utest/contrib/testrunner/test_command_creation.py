@@ -41,6 +41,11 @@ class CommandCreationTests(unittest.TestCase):
         self.assertEqual(result,
                          'prefix -A "C:\\User name\\Temp\\Ride\\arg_file.robot" --listener "C:\\My Work\\Python\\TestRunnerAgent.py:5522:False" "C:\\My Work\\TestSuite.robot"')
 
+    def test_build_command_with_batched_listener(self):
+        command = CommandStub().with_listener(5522, True, 100, False)
+        self.assertEqual(command.build(),
+                         '--listener "C:\\My Work\\Python\\TestRunnerAgent.py:5522:True:100:False"')
+
     def test_build_command_call_some_method_twice(self):
         command = CommandStub() \
             .with_prefix('prefix_1') \
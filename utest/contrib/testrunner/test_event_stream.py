@@ -0,0 +1,86 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import io
+import threading
+import unittest
+
+from robotide.contrib.testrunner.TestRunnerAgent import (COMPRESS_THRESHOLD, EventBatch, StreamHandler)
+
+
+def encode(obj, compress):
+    stream = io.BytesIO()
+    StreamHandler(stream, compress).dump(obj)
+    return stream.getvalue()
+
+
+def decode(data):
+    return StreamHandler(io.StringIO(data.decode('UTF-8'))).load()
+
+
+class TestStreamHandler(unittest.TestCase):
+
+    def test_short_messages_are_not_compressed(self):
+        data = encode(['log_message', [{'message': 'Hello'}]], compress=True)
+        assert data.startswith(b'J')
+        assert decode(data) == ['log_message', [{'message': 'Hello'}]]
+
+    def test_long_messages_are_compressed(self):
+        events = [['log_message', [{'message': u'Hyvää päivää %d' % i}]] for i in range(COMPRESS_THRESHOLD)]
+        packet = ['batch', [events]]
+        data = encode(packet, compress=True)
+        assert data.startswith(b'Z')
+        assert len(data) < len(encode(packet, compress=False)) / 10
+        assert decode(data) == packet
+
+
+class TestEventBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.packets = []
+        self.sent = threading.Event()
+
+    def _send(self, packet):
+        self.packets.append(packet)
+        self.sent.set()
+
+    def test_events_are_sent_after_interval(self):
+        batch = EventBatch(self._send, 0.01)
+        batch.add('start_keyword', ('Log', {}))
+        batch.add('end_keyword', ('Log', {}))
+        assert self.sent.wait(5)
+        batch.close()
+        assert self.packets == [('batch', ([('start_keyword', ('Log', {})), ('end_keyword', ('Log', {}))],))]
+
+    def test_events_are_sent_when_batch_is_full(self):
+        batch = EventBatch(self._send, 60)
+        for i in range(EventBatch.MAX_EVENTS + 1):
+            batch.add('log_message', (i,))
+        assert len(self.packets) == 1
+        assert len(self.packets[0][1][0]) == EventBatch.MAX_EVENTS
+        batch.close()
+        assert self.packets[1] == ('batch', ([('log_message', (EventBatch.MAX_EVENTS,))],))
+
+    def test_control_packets_are_sent_immediately_after_collected_events(self):
+        batch = EventBatch(self._send, 60)
+        batch.add('start_keyword', ('Comment', {}))
+        batch.send(('paused', ()))
+        assert self.packets == [('batch', ([('start_keyword', ('Comment', {}))],)), ('paused', ())]
+        batch.close()
+        assert len(self.packets) == 2
+
+
+if __name__ == '__main__':
+    unittest.main()
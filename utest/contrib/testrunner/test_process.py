@@ -13,12 +13,14 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import os
 import unittest
 import time
 from robot.version import VERSION
 from utest.resources import datafilereader
 
 from robotide.contrib.testrunner.testrunner import Process
+from robotide.contrib.testrunner.Process import StreamReaderThread, StreamSelectorThread
 
 if VERSION >= '7.1.1':
     console_out = b"==============================================================================\n" \
@@ -116,5 +118,79 @@ class ProcessUnicodeTestCase(unittest.TestCase):
         pass
 
 
+class StreamReaderTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.notifications = 0
+
+    def _notify(self):
+        self.notifications += 1
+
+    def _pipe_reader(self):
+        read_fd, write_fd = os.pipe()
+        return StreamReaderThread(os.fdopen(read_fd, 'rb', buffering=0), self._notify), write_fd
+
+    def test_output_is_notified_once_until_popped(self):
+        reader = StreamReaderThread(None, self._notify)
+        reader.feed(b'first\n')
+        reader.feed(b'second\n')
+        assert self.notifications == 1
+        assert reader.pop() == b'first\nsecond\n'
+        assert reader.pop() == b''
+        reader.feed(b'third\n')
+        assert self.notifications == 2
+
+    def test_incomplete_character_is_kept_until_next_chunk(self):
+        reader = StreamReaderThread(None, self._notify)
+        text = u'\xe4\u20ac'.encode('UTF-8')
+        reader.feed(b'a' + text[:2])
+        assert reader.pop() == b'a\xc3\xa4'
+        reader.feed(text[2:3])
+        assert reader.pop() == b''
+        reader.feed(text[3:])
+        assert reader.pop() == text[2:]
+        assert self.notifications == 3
+
+    def test_incomplete_escape_sequence_is_kept_until_next_chunk(self):
+        reader = StreamReaderThread(None, self._notify)
+        reader.feed(b'| \x1b[32')
+        assert reader.pop() == b'| '
+        reader.feed(b'mPASS\x1b[0m |\n\x1b]8;;file:///tmp/log.html')
+        assert reader.pop() == b'\x1b[32mPASS\x1b[0m |\n'
+        reader.feed(b'\x1b\\log.html\x1b]8;;\x1b')
+        assert reader.pop() == b'\x1b]8;;file:///tmp/log.html\x1b\\log.html'
+        reader.feed(b'\\')
+        assert reader.pop() == b'\x1b]8;;\x1b\\'
+
+    def test_incomplete_output_is_popped_after_stream_is_closed(self):
+        reader = StreamReaderThread(None, self._notify)
+        reader.feed(b'end\x1b[')
+        assert reader.pop() == b'end'
+        reader.feed_eof()
+        assert self.notifications == 2
+        assert reader.pop() == b'\x1b['
+
+    def test_reading_in_thread(self):
+        reader, write_fd = self._pipe_reader()
+        reader.run()
+        os.write(write_fd, b'x' * (StreamReaderThread.CHUNK_SIZE * 3 + 1))
+        os.close(write_fd)
+        reader._thread.join(5)
+        assert reader.pop() == b'x' * (StreamReaderThread.CHUNK_SIZE * 3 + 1)
+
+    @unittest.skipIf(os.name == 'nt', 'Selectors do not support pipes on Windows')
+    def test_reading_several_streams_in_one_thread(self):
+        (out, out_fd), (err, err_fd) = self._pipe_reader(), self._pipe_reader()
+        selector = StreamSelectorThread([out, err])
+        selector.run()
+        os.write(out_fd, b'output')
+        os.write(err_fd, b'errors')
+        os.close(out_fd)
+        os.close(err_fd)
+        selector._thread.join(5)
+        assert not selector._thread.is_alive()
+        assert (out.pop(), err.pop()) == (b'output', b'errors')
+
+
 if __name__ == '__main__':
     unittest.main()
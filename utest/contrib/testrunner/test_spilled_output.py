@@ -0,0 +1,77 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import os
+import tempfile
+import unittest
+
+from robotide.contrib.testrunner.SpilledOutput import SpilledOutput, lines_over_limit
+
+
+class TestLinesOverLimit(unittest.TestCase):
+
+    def test_no_limit(self):
+        assert lines_over_limit(10 ** 6, 0) == 0
+
+    def test_lines_are_removed_after_growing_over_tenth_of_limit(self):
+        assert lines_over_limit(1100, 1000) == 0
+        assert lines_over_limit(1101, 1000) == 101
+
+
+class TestSpilledOutput(unittest.TestCase):
+
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(), 'console_log.txt')
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        os.rmdir(os.path.dirname(self.path))
+
+    def test_appended_lines_are_written_and_counted(self):
+        spilled = SpilledOutput(self.path)
+        spilled.append(u'first\nsecond ä\n')
+        spilled.append('third\n')
+        assert spilled.lines == 3
+        with open(self.path, encoding='utf-8') as spill:
+            assert spill.read() == u'first\nsecond ä\nthird\n'
+
+    def test_previous_spill_file_is_removed(self):
+        SpilledOutput(self.path).append('old\n')
+        assert not os.path.exists(SpilledOutput(self.path).path)
+
+    def test_without_path_lines_are_only_counted(self):
+        spilled = SpilledOutput()
+        spilled.append('first\nsecond\n')
+        assert spilled.lines == 2
+        assert spilled.read_lines() == []
+
+    def test_reading_lines(self):
+        spilled = SpilledOutput(self.path)
+        spilled.append('first\nsecond\nthird\n')
+        assert spilled.read_lines() == ['first\n', 'second\n', 'third\n']
+        assert spilled.read_lines(1, 1) == ['second\n']
+        assert spilled.read_lines(3, 10) == []
+
+    def test_finding_lines(self):
+        spilled = SpilledOutput(self.path)
+        spilled.append('PASS one\nFAIL two\npass three\n')
+        assert spilled.find('pass') == 0
+        assert spilled.find('pass', 1) == 2
+        assert spilled.find('fail', 2) == -1
+
+
+if __name__ == '__main__':
+    unittest.main()
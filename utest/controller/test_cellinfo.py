@@ -404,6 +404,18 @@ class TestCellInfo(unittest.TestCase):
         self._verify_cell_info(0, 0, ContentType.STRING, CellType.UNKNOWN)
         self._verify_cell_info(0, 1, ContentType.EMPTY, CellType.UNKNOWN)
 
+    def test_cell_info_is_computed_once_per_step_revision(self):
+        self.test.execute(ChangeCellValue(0, 0, self.keyword1.name))
+        step = self.test.step(0)
+        cell_info = step.get_cell_info(1)
+        assert step.get_cell_info(1) is cell_info
+        step.change(1, '# comment')
+        assert step.get_cell_info(1).content_type == ContentType.COMMENTED
+        cell_info = step.get_cell_info(0)
+        self.testsuite.update_namespace()
+        assert step.get_cell_info(0) is not cell_info
+        assert step.get_cell_info(0).content_type == ContentType.USER_KEYWORD
+
     def _verify_string_change(self, row, col, celltype):
         self._verify_cell_info(row, col, ContentType.EMPTY, celltype)
         self.test.execute(ChangeCellValue(row, col, 'diipadaapa'))
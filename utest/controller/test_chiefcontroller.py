@@ -19,6 +19,7 @@ import unittest
 
 from robotide.robotapi import TestDataDirectory, TestCaseFile, ResourceFile
 from robotide.controller import Project
+from robotide.controller.ctrlcommands import RenameTest
 from robotide.namespace import Namespace
 from robotide.controller.filecontrollers import TestCaseFileController, \
     TestDataDirectoryController, ResourceFileController
@@ -324,6 +325,19 @@ class TestFindingControllers(unittest.TestCase):
         result2 = self.project.find_controller_by_longname('T.' + test2.longname, test2.display_name)
         assert result2 == test2
 
+    def test_longname_index_is_updated_when_tests_are_added_renamed_and_removed(self):
+        suite_controller = TestCaseFileController(_testcasefile('Suite.robot'))
+        self.project.controller = suite_controller
+        assert self.project.longname_index.find('Suite') is suite_controller
+        assert self.project.longname_index.find('Suite.Test 1') is None
+        test = suite_controller.create_test('Test 1')
+        assert self.project.longname_index.find('Suite.Test 1') is test
+        test.execute(RenameTest('Renamed'))
+        assert self.project.longname_index.find('Suite.Test 1') is None
+        assert self.project.longname_index.find('Suite.Renamed') is test
+        test.delete()
+        assert self.project.longname_index.find('Suite.Renamed') is None
+
     def _create_suite_structure_with_two_tests_with_same_name(self):
         directory_controller = TestDataDirectoryController(_data_directory('Ro.ot'))
         suite1_controller = TestCaseFileController(_testcasefile('Suite.1.robot'))
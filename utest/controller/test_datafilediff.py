@@ -0,0 +1,129 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import os
+import tempfile
+import unittest
+
+from robotide.robotapi import TestCaseFile
+from robotide.controller.ctrlcommands import UpdateDataFile
+from robotide.controller.datafilediff import diff_datafiles
+from robotide.controller.filecontrollers import TestCaseFileController
+from robotide.publish import PUBLISHER
+from robotide.publish.messages import (RideDataFileSet, RideItemNameChanged, RideItemSettingsChanged,
+                                       RideItemStepsChanged)
+
+CONTENT = """*** Settings ***
+Library    Collections
+
+*** Variables ***
+${VAR}    value
+
+*** Test Cases ***
+First
+    [Documentation]    First test
+    Log    ${VAR}
+    My Keyword
+
+Second
+    FOR    ${i}    IN RANGE    3
+        Log    ${i}
+    END
+
+*** Keywords ***
+My Keyword
+    [Arguments]    ${arg}=default
+    [Setup]    Log    one
+    Log    ${arg}
+"""
+
+
+class TestUpdateDataFile(unittest.TestCase):
+
+    def setUp(self):
+        self._path = tempfile.mkdtemp()
+        self.ctrl = TestCaseFileController(self._parse(CONTENT))
+        self.first_test, self.second_test = self.ctrl.tests
+        self.keyword = self.ctrl.keywords[0]
+        self.messages = []
+        self.topics = (RideDataFileSet, RideItemNameChanged, RideItemSettingsChanged, RideItemStepsChanged)
+        for topic in self.topics:
+            PUBLISHER.subscribe(self._record, topic)
+
+    def tearDown(self):
+        for topic in self.topics:
+            PUBLISHER.unsubscribe(self._record, topic)
+        for name in os.listdir(self._path):
+            os.remove(os.path.join(self._path, name))
+        os.rmdir(self._path)
+
+    def _record(self, message):
+        self.messages.append((type(message), getattr(message, 'item', None)))
+
+    def _parse(self, content):
+        path = os.path.join(self._path, 'suite.robot')
+        with open(path, 'w') as file:
+            file.write(content)
+        return TestCaseFile(source=path).populate()
+
+    def _update(self, content):
+        self.ctrl.execute(UpdateDataFile(self._parse(content)))
+
+    def test_unchanged_content_has_no_changes(self):
+        assert diff_datafiles(self.ctrl.data, self._parse(CONTENT)) == ([], [])
+
+    def test_changed_step_updates_only_its_test(self):
+        data = self.ctrl.data
+        self._update(CONTENT.replace('Log    ${i}', 'Log Many    ${i}'))
+        assert self.ctrl.data is data
+        assert self.ctrl.tests[1] is self.second_test
+        assert self.messages == [(RideItemStepsChanged, self.second_test)]
+        assert [s.as_list() for s in self.second_test.steps][1] == ['', 'Log Many', '${i}']
+        assert self.ctrl.dirty
+
+    def test_changed_keyword_setting(self):
+        self._update(CONTENT.replace('${arg}=default', '${arg}=other'))
+        assert self.ctrl.keywords[0] is self.keyword
+        assert (RideItemSettingsChanged, self.keyword) in self.messages
+        assert self.keyword.data.args.value == ['${arg}=other']
+        assert self.keyword.data.args.parent is self.keyword.data
+
+    def test_changed_keyword_setup(self):
+        assert self.keyword.setup.as_list() == ['[Setup]', 'Log', 'one']
+        self._update(CONTENT.replace('Log    one', 'Log    two'))
+        assert self.keyword.setup.as_list() == ['[Setup]', 'Log', 'two']
+        assert self.messages == [(RideItemSettingsChanged, self.keyword)]
+
+    def test_renamed_test(self):
+        self._update(CONTENT.replace('First\n', 'Renamed\n'))
+        assert self.ctrl.tests[0] is self.first_test
+        assert self.first_test.name == 'Renamed'
+        assert (RideItemNameChanged, self.first_test) in self.messages
+
+    def test_changed_variables_replace_datafile(self):
+        data = self._parse(CONTENT.replace('value', 'new value'))
+        self.ctrl.execute(UpdateDataFile(data))
+        assert self.ctrl.data is data
+        assert (RideDataFileSet, self.ctrl) in self.messages
+
+    def test_added_test_replaces_datafile(self):
+        data = self._parse(CONTENT.replace('*** Keywords ***', 'Third\n    No Operation\n\n*** Keywords ***'))
+        self.ctrl.execute(UpdateDataFile(data))
+        assert self.ctrl.data is data
+        assert [t.name for t in self.ctrl.tests] == ['First', 'Second', 'Third']
+
+
+if __name__ == '__main__':
+    unittest.main()
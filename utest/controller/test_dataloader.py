@@ -0,0 +1,93 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import os
+import tempfile
+import unittest
+from concurrent.futures import Future
+from unittest.mock import patch
+
+from robotide.controller import dataloader
+from robotide.controller.dataloader import DataLoader, _ParsedFile
+from robotide.namespace import Namespace
+from utest.resources import datafilereader
+from utest.resources.mocks import FakeSettings
+
+
+class _Observer(object):
+
+    def __init__(self):
+        self.notified = 0
+
+    def notify(self):
+        self.notified += 1
+
+
+class _FailingPool(object):
+
+    def submit(self, path, settings, language):
+        future = Future()
+        future.set_result(('error', 'Process importing test data file died unexpectedly'))
+        return future
+
+
+@patch('os.cpu_count', return_value=4)
+class TestParallelLoading(unittest.TestCase):
+
+    def test_parallel_loading_builds_same_tree(self, _):
+        for path in (datafilereader.ALL_FILES_PATH, datafilereader.SIMPLE_TEST_SUITE_PATH,
+                     datafilereader.RESOURCE_PREFIXED_KEYWORDS_PATH):
+            sequential = self._load(path, 0)
+            parallel = self._load(path, 4)
+            self.assertEqual(self._structure(sequential), self._structure(parallel))
+
+    def test_parsed_files_have_directory_as_parent(self, _):
+        data = self._load(datafilereader.ALL_FILES_PATH, 4)
+        self._assert_parents(data)
+
+    def test_progress_is_notified(self, _):
+        observer = _Observer()
+        settings = FakeSettings({'excludes': tempfile.gettempdir(), 'suite loading workers': 4})
+        DataLoader(Namespace(settings), settings).load_datafile(datafilereader.ALL_FILES_PATH, observer, ['en'])
+        self.assertTrue(observer.notified > 0)
+
+    def test_file_is_parsed_in_ride_process_if_worker_fails(self, _):
+        settings = FakeSettings({'excludes': tempfile.gettempdir()})
+        parent = dataloader.test_data(os.path.join(datafilereader.ALL_FILES_PATH, 'suite_dir'),
+                                      settings=settings, language=['en'])
+        expected = parent.children[0]
+        self.assertTrue(os.path.isfile(expected.source))
+        datafile = _ParsedFile(parent, expected.source, settings, parent.language, _FailingPool()).result()
+        self.assertEqual(self._structure(datafile), self._structure(expected))
+        self.assertIs(datafile.parent, parent)
+
+    @staticmethod
+    def _load(path, workers):
+        settings = FakeSettings({'excludes': tempfile.gettempdir(), 'txt number of spaces': 2,
+                                 'suite loading workers': workers})
+        return DataLoader(Namespace(settings), settings).load_datafile(path, _Observer(), ['en'])
+
+    def _structure(self, data):
+        return (data.source, data.tasks, [test.name for test in data.testcase_table],
+                [self._structure(child) for child in data.children])
+
+    def _assert_parents(self, data):
+        for child in data.children:
+            self.assertIs(child.parent, data)
+            self._assert_parents(child)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,6 +6,7 @@ from robotide.controller.macrocontrollers import KEYWORD_NAME_FIELD
 from robotide.controller.ctrlcommands import (
     Undo, FindOccurrences, FindVariableOccurrences, NullObserver,
     RenameKeywordOccurrences, ChangeCellValue)
+from robotide.controller.usageindex import variable_keys
 from robotide.controller.filecontrollers import (
     TestCaseFileController, TestCaseTableController, TestCaseController)
 from robotide.publish import PUBLISHER
@@ -399,6 +400,43 @@ class FindVariableOccurrencesTest(unittest.TestCase):
              (self._case3.name, 'Steps', 1)))
 
 
+class UsageIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.test_ctrl, self.namespace = TestCaseControllerWithSteps()
+        self.datafile = self.test_ctrl.datafile_controller
+        self.index = self.datafile.usage_index
+
+    def test_items_are_found_with_normalized_names(self):
+        items = self.index.keyword_items(self.datafile, ['run_keyword', 'NoOperation'])
+        assert [item.as_list()[:2] for item, _ in items] == [['Run Keyword', STEP2_ARGUMENT],
+                                                             ['No Operation'], ['No Operation']]
+
+    def test_keyword_names_are_returned_with_keyword(self):
+        items = self.index.keyword_items(self.datafile, [USERKEYWORD1_NAME])
+        assert [kw.name for _, kw in items] == [USERKEYWORD1_NAME]
+
+    def test_all_items_are_returned_without_names(self):
+        assert len(self.index.keyword_items(self.datafile)) > len(self.index.keyword_items(self.datafile, [STEP1_KEYWORD]))
+
+    def test_variable_references_are_indexed(self):
+        assert variable_keys('Hello ${X}[0] and @{y_ ${z}}!') == ['${x}', '${z}']
+        self.test_ctrl.execute(ChangeCellValue(0, 1, 'Hello ${X}[0]'))
+        items = self.index.variable_items(self.datafile, ['${x}'])
+        assert [item.as_list() for item in items] == [[STEP1_KEYWORD, 'Hello ${X}[0]']]
+
+    def test_all_items_are_searched_for_variable_patterns(self):
+        all_items = self.index.variable_items(self.datafile)
+        assert self.index.variable_items(self.datafile, ['${*}']) == all_items
+        assert self.index.variable_items(self.datafile, ['not a variable']) == all_items
+
+    def test_changed_steps_are_indexed_again(self):
+        assert self.index.keyword_items(self.datafile, ['Then New Step']) == []
+        self.test_ctrl.execute(ChangeCellValue(0, 0, 'Then New Step'))
+        assert len(self.index.keyword_items(self.datafile, ['New Step'])) == 1
+        assert_occurrence(self.test_ctrl, 'New Step', TEST1_NAME, 'Steps')
+
+
 class RenameOccurrenceTest(unittest.TestCase):
 
     def setUp(self):
@@ -15,8 +15,14 @@
 
 import unittest
 
-from robotide.robotapi import Variable
+from robotide.robotapi import TestCaseFile, Variable
+from robotide.controller import Project
+from robotide.controller.ctrlcommands import UpdateVariable
+from robotide.controller.filecontrollers import TestCaseFileController
 from robotide.controller.settingcontrollers import VariableController
+from robotide.namespace.namespace import Namespace
+from robotide.spec.librarymanager import LibraryManager
+from utest.resources import FakeSettings
 
 
 class TestVariableEquality(unittest.TestCase):
@@ -43,5 +49,28 @@ class TestVariableEquality(unittest.TestCase):
         self.assertTrue(self._var_ctrl.has_data())
         self.assertFalse(VariableController(object(), Variable(object(), '','')).has_data())
 
+
+class TestVariableUpdate(unittest.TestCase):
+
+    def setUp(self):
+        tcf = TestCaseFile(source='/tmp/variables.robot', language=['en'])
+        tcf.variable_table.add('${OLD}', '1')
+        tcf.testcase_table.add('Test').add_step(['Log', '${OLD}'])
+        library_manager = LibraryManager(':memory:')
+        library_manager.create_database()
+        project = Project(Namespace(FakeSettings()), library_manager=library_manager)
+        self.ctrl = TestCaseFileController(tcf, project)
+        project.controller = self.ctrl
+        self.test = self.ctrl.tests[0]
+        self.ns = project.namespace
+
+    def test_renamed_variable_is_visible(self):
+        self.assertTrue(self.ns.has_variable(self.test, '${OLD}'))
+        self.ctrl.variables[0].execute(UpdateVariable('${NEW}', '1', None))
+        self.assertTrue(self.ns.has_variable(self.test, '${NEW}'))
+        self.assertFalse(self.ns.has_variable(self.test, '${OLD}'))
+        self.assertIn('${NEW}', [sug.name for sug in self.ns.get_suggestions_for(self.test, '${N')])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -132,6 +132,77 @@ class TestNavigationHistory(_BaseTreeControllerTest, unittest.TestCase):
             self._go_forward_and_return_selection() == expected_selection)
 
 
+class _Node(object):
+
+    def __init__(self, controller=None, children=()):
+        self.handler = lambda: 0
+        self.handler.controller = controller
+        self.children = list(children)
+
+
+class _FakeTree(object):
+
+    def __init__(self, *children):
+        self.root = _Node(children=children)
+        self.visited = 0
+
+    def GetFirstChild(self, node):
+        return self.GetNextChild(node, 0)
+
+    def GetNextChild(self, node, cookie):
+        self.visited += 1
+        if cookie < len(node.children):
+            return node.children[cookie], cookie + 1
+        return None, cookie
+
+    def ItemHasChildren(self, node):
+        return bool(node.children)
+
+    def GetItemData(self, node):
+        return node.handler
+
+
+class TestFindingNodes(unittest.TestCase):
+
+    def setUp(self):
+        self.tests = [_Node(object()) for _ in range(3)]
+        self.suite = _Node(object(), self.tests)
+        self.tree = _FakeTree(_Node(object()), self.suite)
+        self.controller = TreeController(self.tree, None, None, None)
+
+    def _find(self, node):
+        return self.controller.find_node_by_controller(node.handler.controller)
+
+    def test_finding_nodes_walks_tree_once(self):
+        for node in self.tests + [self.suite]:
+            assert self._find(node) is node
+        assert self.controller.find_node_by_controller(object()) is None
+        visited = self.tree.visited
+        assert self._find(self.tests[1]) is self.tests[1]
+        assert self.tree.visited == visited
+
+    def test_registered_nodes_are_found(self):
+        self._find(self.suite)
+        new = _Node(object())
+        self.suite.children.append(new)
+        self.controller.register_node(new)
+        assert self._find(new) is new
+
+    def test_nodes_are_indexed_again_after_forgetting(self):
+        self._find(self.suite)
+        removed = self.suite.children.pop()
+        self.controller.forget_nodes()
+        assert self._find(removed) is None
+        assert self._find(self.tests[0]) is self.tests[0]
+
+    def test_node_with_changed_handler_is_not_returned(self):
+        controller = self.tests[0].handler.controller
+        self._find(self.suite)
+        self.tests[0].handler.controller = object()
+        assert self.controller.find_node_by_controller(controller) is None
+        assert self._find(self.tests[0]) is self.tests[0]
+
+
 class TestTestSelectionController(UIUnitTestBase):
 
     def setUp(self):
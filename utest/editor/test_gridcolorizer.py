@@ -228,7 +228,7 @@ def EditorWithData():
 
 class MockGrid(object):
     noop = lambda *args: None
-    SetCellTextColour = SetCellBackgroundColour = SetCellFont = noop
+    SetCellTextColour = SetCellBackgroundColour = SetCellFont = ForceRefresh = noop
     settings = {
         'font size': 10,
         'font face': '',
@@ -262,6 +262,20 @@ class MockGrid(object):
     def GetCellFont(self, x, y):
         return Font()
 
+    @staticmethod
+    def CalcUnscrolledPosition(x, y):
+        return x, y
+
+    def GetGridWindow(self):
+        return self
+
+    @staticmethod
+    def GetClientSize():
+        return Size(600, 100)
+
+    def YToRow(self, y):
+        return y // 20 if y // 20 < self.NumberRows else wx.NOT_FOUND
+
 
 class Font(wx.Font):
 
@@ -320,6 +334,55 @@ class TestPerformance(unittest.TestCase):
             colorizer._colorize_cell(1,1, cdata)
 
 
+class RecordingGrid(MockGrid):
+
+    def __init__(self, rows=10, scrolled=0):
+        self.NumberRows = rows
+        self._scrolled = scrolled
+        self.colored = []
+
+    def SetCellTextColour(self, row, col, color):
+        self.colored.append((row, col))
+
+    def CalcUnscrolledPosition(self, x, y):
+        return x, y + self._scrolled
+
+
+class ControllerWithStrings(object):
+
+    def __init__(self):
+        self.values = {}
+
+    def get_cell_info(self, row, column):
+        return CellInfo(CellContent(ContentType.STRING, self.values.get((row, column), '')),
+                        CellPosition(CellType.OPTIONAL, None))
+
+
+class TestRowColoring(unittest.TestCase):
+
+    def test_visible_rows_are_colored_first(self):
+        colorizer = Colorizer(RecordingGrid(rows=30, scrolled=200), ControllerWithStrings())
+        assert colorizer._rows_in_coloring_order() == list(range(10, 30)) + list(range(0, 10))
+        assert colorizer._visible_rows() == range(10, 16)
+
+    def test_unchanged_rows_are_not_colored_again(self):
+        grid = RecordingGrid()
+        controller = ControllerWithStrings()
+        colorizer = Colorizer(grid, controller)
+        colorizer._coloring_task(0, None)
+        assert len(grid.colored) == grid.NumberRows * grid.NumberCols
+        grid.colored = []
+        colorizer._coloring_task(0, None)
+        assert grid.colored == []
+        controller.values[(3, 2)] = 'changed'
+        colorizer._coloring_task(0, 'changed')
+        assert grid.colored == [(3, 2)]
+        grid.colored = []
+        colorizer.reset()
+        colorizer._coloring_task(0, 'changed')
+        assert len(grid.colored) == grid.NumberRows * grid.NumberCols
+
+
 class TestColorIdentification(unittest.TestCase):
     _data = ['xyz', 'FOR', 'try', 'for', 'LOG', 'My KW']
     _type = [CellInfo(CellContent(ContentType.STRING, _data[0]), CellPosition(CellType.UNKNOWN, None)),
@@ -384,7 +447,7 @@ class TestColorIdentification(unittest.TestCase):
     def test_private_bad(self):
         grid = MockGrid()
         colorizer = Colorizer(grid, ControllerWithCellInfo('Another Test', 'other'))
-        colorizer._coloring_task(0, 'My KW', 1, 1)
+        colorizer._coloring_task(0, 'My KW')
         txt_color = colorizer._get_text_color(self._type[5])
         # print(f"DEBUG: Text color={txt_color.title().upper()}")
         self._type[5].set_or_clear_error(True)  # forcing error
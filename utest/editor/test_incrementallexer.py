@@ -0,0 +1,101 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import unittest
+from multiprocessing import shared_memory
+
+from robotide.lib.compat.pygments.robotframework import RobotFrameworkLexer
+from robotide.editor.incrementallexer import IncrementalLexer, CHECKPOINT_INTERVAL
+
+LINES = """*** Settings ***
+Library    OperatingSystem
+
+*** Variables ***
+${NAME}    value
+@{LIST}    a    b
+
+*** Test Cases ***
+My Test
+    [Documentation]    Doc with ${NAME}
+    Log    ${NAME}
+    FOR    ${item}    IN    @{LIST}
+        Log    ${item}
+    END
+    My Keyword    arg
+
+*** Keywords ***
+My Keyword
+    [Arguments]    ${arg}
+    Log    ${arg}    # comment
+""".splitlines() * 5
+
+
+class TestIncrementalLexer(unittest.TestCase):
+
+    def setUp(self):
+        try:
+            self.shared_mem = shared_memory.ShareableList(['en'], name="language")
+        except FileExistsError:  # Other instance created file
+            self.shared_mem = shared_memory.ShareableList(name="language")
+        self.lexer = RobotFrameworkLexer(language=['En'])
+        self.lines = list(LINES)
+        self.read = []
+
+    def tearDown(self):
+        self.shared_mem.shm.close()
+        self.shared_mem.shm.unlink()
+
+    def _get_line(self, line):
+        self.read.append(line)
+        return self.lines[line]
+
+    def _expected(self):
+        text = '\n'.join(self.lines) + '\n'
+        return [(value, token) for _, token, value in self.lexer.get_tokens_unprocessed(text)]
+
+    def _lexed(self, incremental, first, last):
+        return [tok for _, tokens in incremental.lex(self._get_line, first, last) for tok in tokens]
+
+    def test_lexing_all_lines_matches_full_lexing(self):
+        incremental = IncrementalLexer(self.lexer)
+        assert self._lexed(incremental, 0, len(self.lines) - 1) == self._expected()
+
+    def test_lexing_in_ranges_matches_full_lexing(self):
+        incremental = IncrementalLexer(self.lexer)
+        tokens = []
+        for first in range(0, len(self.lines), 7):
+            tokens.extend(self._lexed(incremental, first, min(first + 6, len(self.lines) - 1)))
+        assert tokens == self._expected()
+
+    def test_lexing_changed_line_starts_from_checkpoint(self):
+        incremental = IncrementalLexer(self.lexer)
+        last = len(self.lines) - 1
+        self._lexed(incremental, 0, last)
+        changed = 2 * CHECKPOINT_INTERVAL + 5
+        self.lines[changed] = '    Log Many    ${NAME}'
+        self.read = []
+        tokens = [tok for line, toks in incremental.lex(self._get_line, changed, last) for tok in toks]
+        assert self.read[0] == 2 * CHECKPOINT_INTERVAL
+        all_tokens = self._lexed(IncrementalLexer(self.lexer), 0, changed - 1) + tokens
+        assert all_tokens == self._expected()
+
+    def test_returns_only_requested_lines(self):
+        incremental = IncrementalLexer(self.lexer)
+        lines = [line for line, _ in incremental.lex(self._get_line, 20, 25)]
+        assert lines == list(range(20, 26))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -33,7 +33,7 @@ from robotide.ui.mainframe import ActionRegisterer, ToolBar
 from robotide.ui.actiontriggers import MenuBar, ShortcutRegistry
 from robotide.application import Project
 from robotide.controller.filecontrollers import (TestDataDirectoryController,
-                                                 ResourceFileController)
+                                                 ResourceFileController, TestCaseFileController)
 from robotide import utils
 from utest.resources import FakeSettings, FakeEditor
 from robotide.publish import PUBLISHER, RideSuiteAdded, RideNotebookTabChanging
@@ -1131,5 +1131,33 @@ class TestDefaultLanguage(unittest.TestCase):
         self.app.Destroy()
         self.app = None
 
+
+class TestDataFileWrapper(unittest.TestCase):
+    content = 'Language: Finnish\n\n*** Testit ***\nTesti\n    Log    Moi\n'
+
+    def setUp(self):
+        try:
+            self.shared_mem = shared_memory.ShareableList(['en'], name="language")
+        except FileExistsError:  # Other instance created file
+            self.shared_mem = shared_memory.ShareableList(name="language")
+        self.controller = TestCaseFileController(TestCaseFile(source='/tmp/wrapper.robot'))
+        self.wrapper = texteditor.DataFileWrapper(self.controller, FakeSettings(), language=['en'])
+
+    def tearDown(self):
+        self.shared_mem.shm.close()
+        self.shared_mem.shm.unlink()
+
+    def test_building_in_given_language_does_not_change_wrapper(self):
+        language = self.wrapper.language_of(self.content)
+        target = self.wrapper.create_target_from(self.content, language)
+        assert [test.name for test in target.testcase_table] == ['Testi']
+        assert self.wrapper._doc_language == ['en']
+
+    def test_target_built_in_other_language_is_not_used(self):
+        target = self.wrapper.create_target_from(self.content, ['en'])
+        assert not target.testcase_table.tests
+        self.wrapper.update_from(self.content, target, ['en'])
+        assert [test.name for test in self.controller.tests] == ['Testi']
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,86 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import unittest
+from threading import Event
+
+from robot.parsing.parser.parser import get_model
+from robotide.editor.validationjob import ValidationJob
+from robotide.lib.compat.parsing import ErrorReporter
+from robotide.lib.robot.errors import DataError
+
+VALID = """*** Test Cases ***
+Test
+    Log    Hello
+"""
+
+
+def check(text, language):
+    try:
+        ErrorReporter(check_tokens=True).visit(get_model(text, lang=language))
+    except DataError as err:
+        return err.message, err.details
+    return True
+
+
+class TestValidationJob(unittest.TestCase):
+
+    def test_valid_text_is_built(self):
+        job = ValidationJob(VALID, 'en', check, build=lambda text: text.upper()).start()
+        assert job.wait() is True
+        assert job.target == VALID.upper()
+
+    def test_invalid_text_is_not_built(self):
+        job = ValidationJob('*** Invalid ***\n', 'en', check, build=lambda text: text.upper()).start()
+        result = job.wait()
+        assert result[0] == 'INVALID_HEADER'
+        assert job.target is None
+
+    def test_model_errors_are_reported(self):
+        job = ValidationJob(VALID + '    END\n', 'en', check)
+        job.run()
+        assert job.wait()[0] in ('ERROR', "'END' is not allowed in this context.")
+
+    def test_errors_of_check_are_raised_when_waiting(self):
+        def failing(text, language):
+            raise DataError('Failed')
+        job = ValidationJob(VALID, 'en', failing).start()
+        self.assertRaises(DataError, job.wait)
+
+    def test_cancelled_job_does_not_build_or_match(self):
+        started, release = Event(), Event()
+
+        def slow(text, language):
+            started.set()
+            release.wait()
+            return True
+        job = ValidationJob(VALID, 'en', slow, build=lambda text: text).start()
+        started.wait()
+        assert job.matches(VALID, 'en')
+        job.cancel()
+        release.set()
+        assert job.wait() is True
+        assert job.target is None
+        assert not job.matches(VALID, 'en')
+
+    def test_matches_text_and_language(self):
+        job = ValidationJob(VALID, 'en', check)
+        assert job.matches(VALID, 'en')
+        assert not job.matches(VALID, 'fi')
+        assert not job.matches(VALID + '\n', 'en')
+
+
+if __name__ == '__main__':
+    unittest.main()
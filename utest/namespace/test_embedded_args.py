@@ -15,7 +15,7 @@
 
 import pytest
 import unittest
-from robotide.namespace.embeddedargs import EmbeddedArgsHandler
+from robotide.namespace.embeddedargs import EmbeddedArgsHandler, EmbeddedKeywordMatcher
 
 
 class KWMock(object):
@@ -51,5 +51,38 @@ class TestEmbeddedArgs(unittest.TestCase):
         assert not args.name_regexp.match('Say hello to ABCD')
 
 
+class TestEmbeddedKeywordMatcher(unittest.TestCase):
+
+    def _matcher(self, *names):
+        keywords = [KWMock(name) for name in names]
+        return EmbeddedKeywordMatcher((EmbeddedArgsHandler(kw).name_regexp, kw) for kw in keywords)
+
+    def test_match(self):
+        matcher = self._matcher('add user ${user} to db', 'Say hello to ${user:[A-C]+}', '${x} is ${y}')
+        assert matcher.match('Add User john to DB').name == 'add user ${user} to db'
+        assert matcher.match('say hello to ABC').name == 'Say hello to ${user:[A-C]+}'
+        assert matcher.match('sky is blue').name == '${x} is ${y}'
+        assert matcher.match('Say hello to ABCD') is None
+        assert matcher.match('no') is None
+
+    def test_first_matching_keyword_is_returned(self):
+        matcher = self._matcher('${a} should ${b}', 'john should ${b}', 'john ${b}')
+        assert matcher.match('john should eat').name == '${a} should ${b}'
+        matcher = self._matcher('john ${b}', 'john should ${b}', '${a} should ${b}')
+        assert matcher.match('john should eat').name == 'john ${b}'
+
+    def test_many_keywords_with_same_prefix(self):
+        matcher = self._matcher(*['the user ${x} has %d items' % i for i in range(300)])
+        assert matcher.match('The User X has 123 items').name == 'the user ${x} has 123 items'
+        assert matcher.match('the user x has 300 items') is None
+
+    def test_results_are_memoized(self):
+        matcher = self._matcher('add user ${user} to db')
+        matcher.MEMO_SIZE = 2
+        for name in ('add user a to db', 'x', 'add user b to db', 'add user a to db'):
+            matcher.match(name)
+        assert list(matcher._memo) == ['add user b to db', 'add user a to db']
+
+
 if __name__ == "__main__":
     unittest.main()
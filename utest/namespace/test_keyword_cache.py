@@ -0,0 +1,90 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import unittest
+
+from robotide.namespace.cache import KeywordCache
+
+RESOURCE = ('resource', '/tmp/resource.robot')
+LIBRARY = ('library', 'OperatingSystem')
+
+
+class TestKeywordCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = KeywordCache(max_size=10)
+
+    def test_cache_hit(self):
+        self.cache.put('a', 'b', [RESOURCE])
+        assert self.cache.get('a') == 'b'
+        assert self.cache.get('x') is None
+
+    def test_value_expires_when_dependency_changes(self):
+        self.cache.put('a', 'b', [RESOURCE, LIBRARY])
+        self.cache.put('c', 'd', [RESOURCE])
+        self.cache.expire(LIBRARY)
+        assert self.cache.get('a') is None
+        assert self.cache.get('c') == 'd'
+        self.cache.expire(RESOURCE)
+        assert self.cache.get('c') is None
+        assert len(self.cache) == 0
+
+    def test_value_put_after_expiration_is_valid(self):
+        self.cache.expire(LIBRARY)
+        self.cache.put('a', 'b', [LIBRARY])
+        assert self.cache.get('a') == 'b'
+
+    def test_value_built_before_expiration_is_not_cached(self):
+        revision = self.cache.revision
+        self.cache.expire(LIBRARY)
+        self.cache.put('a', 'b', [RESOURCE, LIBRARY], revision=revision)
+        assert self.cache.get('a') is None
+        self.cache.put('a', 'c', [RESOURCE], revision=revision)
+        assert self.cache.get('a') == 'c'
+
+    def test_value_built_before_clear_is_not_cached(self):
+        revision = self.cache.revision
+        self.cache.clear()
+        self.cache.put('a', 'b', [RESOURCE], revision=revision)
+        assert self.cache.get('a') is None
+
+    def test_least_recently_used_values_are_evicted(self):
+        self.cache.put('a', 1, size=4)
+        self.cache.put('b', 2, size=4)
+        self.cache.get('a')
+        self.cache.put('c', 3, size=4)
+        assert self.cache.get('b') is None
+        assert self.cache.get('a') == 1
+        assert self.cache.get('c') == 3
+        assert self.cache.size == 8
+
+    def test_value_larger_than_max_size_is_kept(self):
+        self.cache.put('a', 1, size=20)
+        assert self.cache.get('a') == 1
+
+    def test_replacing_and_removing_update_size(self):
+        self.cache.put('a', 1, size=4)
+        self.cache.put('a', 2, size=3)
+        assert self.cache.size == 3
+        self.cache.remove('a')
+        assert self.cache.size == 0
+        self.cache.put('b', 1, size=5)
+        self.cache.clear()
+        assert self.cache.size == 0
+        assert self.cache.get('b') is None
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import re
+import unittest
+
+from robotide.namespace.keywordindex import KeywordIndex, FUZZY, SUBSTRING
+
+BDD_PREFIX = re.compile(r'^(given|when|then|and|but) (.*)', re.IGNORECASE)
+
+
+class KeywordMock(object):
+
+    def __init__(self, name, source):
+        self.name = name
+        self.source = source
+
+    @property
+    def longname(self):
+        return '%s.%s' % (self.source, self.name)
+
+    def __repr__(self):
+        return self.longname
+
+
+class TestKeywordIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.open_browser = KeywordMock('Open Browser', 'Browser')
+        self.close_browser = KeywordMock('Close_Browser', 'Browser')
+        self.log = KeywordMock('Log', 'BuiltIn')
+        self.logged_in = KeywordMock('Given user is logged in', 'resource')
+        self.keywords = [self.open_browser, self.close_browser, self.log, self.logged_in]
+        self.index = KeywordIndex(self.keywords, BDD_PREFIX)
+
+    def test_prefix(self):
+        assert self.index.find('Op') == {self.open_browser}
+        assert self.index.find('lo') == {self.log}
+        assert self.index.find('nothing') == set()
+
+    def test_prefix_ignores_case_spaces_and_underscores(self):
+        assert self.index.find('OPEN_br') == {self.open_browser}
+        assert self.index.find('close br') == {self.close_browser}
+
+    def test_empty_start_matches_all(self):
+        assert self.index.find('') == set(self.keywords)
+
+    def test_longname_prefix(self):
+        assert self.index.find('browser.') == {self.open_browser, self.close_browser}
+        assert self.index.find('BuiltIn.L') == {self.log}
+
+    def test_name_without_bdd_prefix(self):
+        assert self.index.find('user is') == {self.logged_in}
+        assert self.index.find('given user') == {self.logged_in}
+
+    def test_substring(self):
+        assert self.index.find('browser', SUBSTRING) == {self.open_browser, self.close_browser}
+        assert self.index.find('logged', SUBSTRING) == {self.logged_in}
+
+    def test_fuzzy(self):
+        assert self.index.find('opbr', FUZZY) == {self.open_browser}
+        assert self.index.find('cbrw', FUZZY) == {self.close_browser}
+        assert self.index.find('lgo', FUZZY) == set()
+
+    def test_segments_are_shared_between_indexes(self):
+        other_kw = KeywordMock('Other', 'other resource')
+        other = KeywordIndex(self.keywords[:3] + [other_kw], BDD_PREFIX)
+        shared = [segment for segment in other._segments if segment in self.index._segments]
+        assert len(shared) == 2
+        assert other.find('o') == {self.open_browser, other_kw}
+
+
+if __name__ == '__main__':
+    unittest.main()
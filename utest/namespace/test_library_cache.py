@@ -62,6 +62,21 @@ class TestLibraryCache(unittest.TestCase):
         t2.join()
         self.assertEqual(['ok', 'ok'], self._thread_results)
 
+    def test_library_expired_while_fetched_is_not_stored(self):
+        cache = self._create_cache_with_auto_imports('TestLib')
+        get_library = cache._get_library
+
+        def expiring_get_library(name, args):
+            keywords = get_library(name, args)
+            cache.expire_library(name)
+            return keywords
+        cache._get_library = expiring_get_library
+        keywords = cache.get_library_keywords('TestLib')
+        self._assert_keyword_in_keywords(keywords, 'Testlib Keyword')
+        self.assertNotIn('TestLib', cache.get_all_cached_library_names())
+        cache._get_library = get_library
+        self.assertIs(cache.get_library_keywords('TestLib'), cache.get_library_keywords('TestLib'))
+
     def _create_cache_with_auto_imports(self, auto_import):
         settings = {'auto imports': [auto_import]}
         return LibraryCache(settings, lambda:0, self._library_manager)
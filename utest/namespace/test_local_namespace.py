@@ -14,6 +14,7 @@
 #  limitations under the License.
 
 import unittest
+from robotide.namespace.local_namespace import LocalVariableIndex
 from utest.resources import datafilereader
 
 
@@ -87,8 +88,50 @@ class TestLocalNamespace(unittest.TestCase):
                 if name in suggestion_names:
                     raise AssertionError('Suggestions on row (%s) did contain illegal value "%s"' % (str(row), name))
 
+    def test_local_variable_index_is_reused_until_steps_change(self):
+        index = self._keyword.get_local_variable_index()
+        assert self._keyword.get_local_variable_index() is index
+        self._keyword.notify_steps_changed()
+        assert self._keyword.get_local_variable_index() is not index
 
 
+class _Step(object):
+
+    def __init__(self, assignments=(), keyword='Log', args=()):
+        self.assignments = list(assignments)
+        self.keyword = keyword
+        self.args = list(args)
+
+
+class TestLocalVariableIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = LocalVariableIndex([_Step(), _Step(['${foo}=']), _Step(['${i}'], 'FOR'),
+                                         _Step(keyword='VAR', args=['${bar}', 'value']), _Step(['${foo}', '${far}'])])
+
+    def test_is_assigned_before(self):
+        assert not self.index.is_assigned_before('${foo}', 1)
+        assert self.index.is_assigned_before('${foo}', 2)
+        assert self.index.is_assigned_before('${foo}=', 2)
+        assert self.index.is_assigned_before('${i}', 3)
+        assert not self.index.is_assigned_before('${bar}', 3)
+        assert self.index.is_assigned_before('${bar}', 4)
+        assert not self.index.is_assigned_before('${unknown}', 10)
+
+    def test_assigned_before(self):
+        assert self.index.assigned_before('${f', 2) == {'${foo}'}
+        assert self.index.assigned_before('${f', 5) == {'${foo}', '${far}'}
+        assert self.index.assigned_before('${', 3) == {'${foo}', '${i}'}
+        assert self.index.assigned_before('@{', 5) == set()
+
+    def test_index_is_for_same_unchanged_steps(self):
+        steps = [_Step()]
+        index = LocalVariableIndex(steps)
+        assert index.is_for(steps)
+        assert not index.is_for(list(steps))
+        steps.append(_Step())
+        assert not index.is_for(steps)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,98 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from robotide import robotapi
+from robotide.controller import dataloader
+from robotide.namespace import modelcache
+from robotide.namespace.modelcache import ParsedModelCache
+from utest.resources import FakeSettings
+
+SUITE = """\
+*** Settings ***
+Documentation    Cached suite
+
+*** Test Cases ***
+First
+    Log    first
+"""
+
+
+class TestParsedModelCache(unittest.TestCase):
+
+    def setUp(self):
+        self._dir = tempfile.mkdtemp()
+        self._cache = ParsedModelCache(os.path.join(self._dir, 'cache'))
+        self._suite = os.path.join(self._dir, 'suite.robot')
+        self._write(SUITE)
+
+    def tearDown(self):
+        shutil.rmtree(self._dir)
+
+    def test_missing_entry(self):
+        self.assertIsNone(self._cache.get(self._suite, ['en'], 'test data'))
+
+    def test_storing_and_reading_datafile(self):
+        parent, settings = object(), FakeSettings()
+        datafile = robotapi.TestCaseFile(parent, self._suite, settings, ['en']).populate()
+        self._cache.put(self._suite, ['en'], 'test data', datafile, True)
+        self.assertIs(datafile.parent, parent)
+        new_parent = object()
+        cached, extra = self._cache.get(self._suite, ['en'], 'test data', new_parent, settings)
+        self.assertTrue(extra)
+        self.assertIs(cached.parent, new_parent)
+        self.assertIs(cached._settings, settings)
+        self.assertEqual([t.name for t in cached.testcase_table], ['First'])
+        self.assertEqual(cached.setting_table.doc.value, 'Cached suite')
+
+    def test_entry_is_invalidated_when_file_or_language_changes(self):
+        datafile = robotapi.TestCaseFile(None, self._suite, None, ['en']).populate()
+        self._cache.put(self._suite, ['en'], 'test data', datafile)
+        self.assertIsNone(self._cache.get(self._suite, ['fi'], 'test data'))
+        self.assertIsNone(self._cache.get(self._suite, ['en'], 'resource'))
+        self._write(SUITE + '\nSecond\n    No Operation\n')
+        self.assertIsNone(self._cache.get(self._suite, ['en'], 'test data'))
+
+    def test_entry_is_invalidated_when_tab_size_changes(self):
+        datafile = robotapi.TestCaseFile(None, self._suite, None, ['en']).populate()
+        self._cache.put(self._suite, ['en'], 'test data', datafile)
+        other = ParsedModelCache(os.path.join(self._dir, 'cache'), tab_size=4)
+        self.assertIsNone(other.get(self._suite, ['en'], 'test data'))
+        self.assertIsNotNone(self._cache.get(self._suite, ['en'], 'test data'))
+
+    def test_test_data_uses_cache_when_enabled(self):
+        settings = FakeSettings({'cache parsed files': True})
+        with patch.object(modelcache, 'CACHE_DIRECTORY', os.path.join(self._dir, 'cache')):
+            first = dataloader.test_data(self._suite, settings=settings, language=['en'])
+            with patch.object(robotapi, 'TestCaseFile') as parser:
+                second = dataloader.test_data(self._suite, settings=settings, language=['en'])
+                self.assertFalse(parser.called)
+        self.assertEqual([t.name for t in first.testcase_table], [t.name for t in second.testcase_table])
+
+    def _write(self, content):
+        mtime = os.stat(self._suite).st_mtime_ns + 10**9 if os.path.exists(self._suite) else None
+        with open(self._suite, 'w') as suite:
+            suite.write(content)
+        if mtime:
+            os.utime(self._suite, ns=(mtime, mtime))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,7 @@
+import os
+import shutil
 import sys
+import tempfile
 import unittest
 
 import pytest
@@ -6,7 +9,9 @@ import pytest
 from robotide.robotapi import (
     TestCaseFile, Resource, VariableTable, TestDataDirectory)
 from robotide.context import IS_WINDOWS
+from robotide.namespace.cache import DependencyGraph
 from robotide.namespace.namespace import _VariableStash
+from robotide.namespace.variablescope import VariableScope
 from robotide.controller.basecontroller import WithNamespace
 from robotide.controller.filecontrollers import data_controller
 from robotide.spec.iteminfo import ArgumentInfo, VariableInfo
@@ -570,6 +575,132 @@ class TestResourceGetter(_DataFileTest):
             paths.append(normalized)
 
 
+class TestDatafileExpiration(_DataFileTest):
+
+    def setUp(self):
+        self.other = TestCaseFile(source='/tmp/other.robot')
+        self.other.directory = '/tmp/'
+        self.other.keyword_table.add('Other Keyword')
+        self.ns.update()
+        for datafile in (self.tcf, self.other):
+            self.ns.find_keyword(datafile, 'No Operation')
+        self.cache = self.ns._retriever.keyword_cache
+
+    def test_only_changed_datafile_is_expired(self):
+        self.ns.update_datafile(self.other)
+        assert self.cache.get(self.other.source) is None
+        assert self.cache.get(self.tcf.source) is not None
+
+    def test_datafiles_importing_changed_resource_are_expired(self):
+        resource = self.ns._resource_factory.get_resource(None, RESOURCE_PATH)
+        self.ns.update_datafile(resource)
+        assert self.cache.get(self.tcf.source) is None
+        assert self.cache.get(self.other.source) is not None
+
+    def test_datafiles_importing_refreshed_library_are_expired(self):
+        self.ns._library_refreshed(OS_LIB)
+        assert self.cache.get(self.tcf.source) is None
+        assert self.cache.get(self.other.source) is not None
+
+    def test_expiring_cache_expires_default_keywords(self):
+        retriever = self.ns._retriever
+        default_kws = retriever.default_kws
+        retriever.expire_cache()
+        assert retriever.default_kws is not default_kws
+
+    def test_dependency_graph(self):
+        graph = DependencyGraph()
+        graph.set_dependencies('a', [('resource', 'r'), ('library', 'l')])
+        graph.set_dependencies('b', [('resource', 'r')])
+        assert graph.dependents(('resource', 'r')) == {'a', 'b'}
+        graph.set_dependencies('a', [('library', 'l')])
+        assert graph.dependents(('resource', 'r')) == {'b'}
+        graph.remove('b')
+        assert graph.dependents(('resource', 'r')) == set()
+        assert graph.dependencies('a') == {('library', 'l')}
+
+
+class TestVariableScopes(_DataFileTest):
+
+    def setUp(self):
+        self.ns.update()
+
+    def test_scope_is_built_once(self):
+        scope = self.ns._retriever.get_variable_scope(self.tcf)
+        assert self.ns._retriever.get_variable_scope(self.tcf) is scope
+        assert EXTENSION_VAR in scope
+        assert '${library_from_resource}' in scope
+        assert '${SPACE}' in scope
+        assert UNKNOWN_VARIABLE not in scope
+
+    def test_scope_is_rebuilt_when_imported_resource_changes(self):
+        scope = self.ns._retriever.get_variable_scope(self.tcf)
+        resource = self.ns._resource_factory.get_resource(None, RESOURCE_WITH_VARS)
+        self.ns.update_datafile(resource)
+        assert self.ns._retriever.get_variable_scope(self.tcf) is not scope
+
+    def _datafile_with_variable_file(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        varfile = os.path.join(directory, 'vars.py')
+        with open(varfile, 'w') as file:
+            file.write('FIRST = 1\n')
+        datafile = TestCaseFile(source=os.path.join(directory, 'suite.robot'))
+        datafile.directory = directory
+        datafile.setting_table.add_variables('vars.py')
+        return datafile, varfile
+
+    @staticmethod
+    def _change_variable_file(varfile):
+        with open(varfile, 'w') as file:
+            file.write('SECOND = 2\n')
+        mtime = os.stat(varfile).st_mtime + 10
+        os.utime(varfile, (mtime, mtime))
+
+    def test_scope_is_rebuilt_when_variable_file_changes(self):
+        datafile, varfile = self._datafile_with_variable_file()
+        assert '${FIRST}' in self.ns._retriever.get_variable_scope(datafile)
+        self._change_variable_file(varfile)
+        self.ns._retriever.VARIABLE_FILE_CHECK_INTERVAL = 0
+        revision = self.ns.revision
+        scope = self.ns._retriever.get_variable_scope(datafile)
+        assert '${SECOND}' in scope
+        assert '${FIRST}' not in scope
+        assert self.ns.revision > revision
+
+    def test_variable_files_are_not_checked_again_immediately(self):
+        datafile, varfile = self._datafile_with_variable_file()
+        self.ns._retriever.VARIABLE_FILE_CHECK_INTERVAL = 60
+        scope = self.ns._retriever.get_variable_scope(datafile)
+        self._change_variable_file(varfile)
+        assert self.ns._retriever.get_variable_scope(datafile) is scope
+
+    def test_builtin_variables_are_shared(self):
+        other = TestCaseFile(source='/tmp/other.robot')
+        other.directory = '/tmp/'
+        first = self.ns._retriever.get_variable_scope(self.tcf)
+        second = self.ns._retriever.get_variable_scope(other)
+        assert first._parent is second._parent
+        self.addCleanup(self.ns.update_exec_dir_global_var, _VariableStash.global_variables['${EXECDIR}'])
+        self.ns.update_exec_dir_global_var('/tmp/exec')
+        assert self.ns._retriever.get_variable_scope(other).get('${EXECDIR}')._value == '/tmp/exec'
+
+    def test_has_variable(self):
+        assert self.ns.has_variable(self.kw, '${keyword argument}')
+        assert self.ns.has_variable(self.kw, EXTENSION_VAR)
+        assert self.ns.has_variable(self.kw, '&{dict var}')
+        assert not self.ns.has_variable(self.kw, '${dict var}')
+        assert not self.ns.has_variable(self.kw, UNKNOWN_VARIABLE)
+
+    def test_variables_shadow_parent_variables_with_same_base_name(self):
+        parent = VariableScope([VariableInfo('${name}', 'parent', 'a'), VariableInfo('${other}', 1, 'a')])
+        scope = VariableScope([ArgumentInfo('@{name}', [])], parent)
+        assert scope.get('@{name}').source == ArgumentInfo.SOURCE
+        assert scope.get('${name}') is None
+        assert scope.get('${other}')._value == 1
+        assert [v.name for v in scope] == ['@{name}', '${other}']
+
+
 class TestResourceCache(_DataFileTest):
 
     def setUp(self):
@@ -0,0 +1,136 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from robotide import robotapi
+from robotide.namespace.variablefilecache import VariableFileCache
+
+VARIABLE_FILE = """\
+import os
+import threading
+
+print('noise')
+
+def get_variables(name='value'):
+    with open(os.path.join(os.path.dirname(__file__), 'imports.txt'), 'a') as imports:
+        imports.write('x')
+    return {'NAME': name, 'LIST__ITEMS': [1, 2], 'LOCK': threading.Lock()}
+"""
+IN_WORKER = {'variable file timeout': 10.0}
+
+
+class TestVariableFileCache(unittest.TestCase):
+
+    def setUp(self):
+        self._dir = tempfile.mkdtemp()
+        self._path = os.path.join(self._dir, 'vars.py')
+        self._write(VARIABLE_FILE)
+
+    def tearDown(self):
+        shutil.rmtree(self._dir)
+
+    def test_variables_are_evaluated_in_another_process(self):
+        variables = VariableFileCache(IN_WORKER).get_variables(self._path, ['other'])
+        values = dict((name, value) for name, value, _ in variables)
+        self.assertEqual(values['${NAME}'], 'other')
+        self.assertEqual(values['@{ITEMS}'], [1, 2])
+        self.assertIsInstance(values['${LOCK}'], str)
+        self.assertEqual(set(source for _, _, source in variables), {os.path.normcase(self._path)})
+
+    def test_variable_file_is_evaluated_once_until_modified(self):
+        cache = VariableFileCache({'variable file timeout': 0})
+        cache.get_variables(self._path, [])
+        cache.get_variables(self._path, [])
+        self.assertEqual(self._imports(), 1)
+        cache.get_variables(self._path, ['other'])
+        self.assertEqual(self._imports(), 2)
+        self._write(VARIABLE_FILE + '\n')
+        cache.get_variables(self._path, [])
+        self.assertEqual(self._imports(), 3)
+
+    def test_results_are_stored_on_disk(self):
+        settings = {'variable file timeout': 0, 'cache variable files': True}
+        directory = os.path.join(self._dir, 'cache')
+        VariableFileCache(settings, directory).get_variables(self._path, [])
+        variables = VariableFileCache(settings, directory).get_variables(self._path, [])
+        self.assertEqual(self._imports(), 1)
+        self.assertIn(('${NAME}', 'value', os.path.normcase(self._path)), variables)
+
+    def test_errors_are_cached(self):
+        self._write('raise RuntimeError("broken")\n')
+        cache = VariableFileCache({'variable file timeout': 0})
+        for _ in range(2):
+            with self.assertRaises(robotapi.DataError):
+                cache.get_variables(self._path, [])
+        with self.assertRaises(robotapi.DataError):
+            cache.get_variables(os.path.join(self._dir, 'missing.py'), [])
+
+    def test_instances_of_classes_in_variable_file_are_strings(self):
+        self._write('class Config(object):\n'
+                    '    def __str__(self):\n'
+                    '        return "config"\n'
+                    'CONFIG = Config()\n'
+                    'CONFIGS = [Config(), 1]\n')
+        cache = VariableFileCache(IN_WORKER)
+        try:
+            values = dict((name, value) for name, value, _ in cache.get_variables(self._path, []))
+        finally:
+            cache.close()
+        self.assertEqual(values['${CONFIG}'], 'config')
+        self.assertEqual(values['${CONFIGS}'], ['config', 1])
+
+    def test_evaluation_is_cancelled_after_timeout(self):
+        self._write('import time\ntime.sleep(30)\n')
+        with self.assertRaises(robotapi.DataError) as error:
+            VariableFileCache({'variable file timeout': 0.5}).get_variables(self._path, [])
+        self.assertIn('timed out', str(error.exception))
+
+    def test_cache_is_not_locked_during_evaluation(self):
+        self._write('import time\ntime.sleep(3)\n')
+        cache = VariableFileCache(IN_WORKER)
+        evaluation = threading.Thread(target=self._get_variables_ignoring_errors, args=(cache,))
+        evaluation.start()
+        time.sleep(0.5)
+        start = time.time()
+        cache.expire(self._path)
+        self.assertLess(time.time() - start, 1)
+        evaluation.join()
+        cache.close()
+
+    def _get_variables_ignoring_errors(self, cache):
+        try:
+            cache.get_variables(self._path, [])
+        except robotapi.DataError:
+            pass
+
+    def _imports(self):
+        with open(os.path.join(self._dir, 'imports.txt')) as imports:
+            return len(imports.read())
+
+    def _write(self, content):
+        mtime = os.stat(self._path).st_mtime_ns + 10**9 if os.path.exists(self._path) else None
+        with open(self._path, 'w') as variable_file:
+            variable_file.write(content)
+        if mtime:
+            os.utime(self._path, ns=(mtime, mtime))
+
+
+if __name__ == '__main__':
+    unittest.main()
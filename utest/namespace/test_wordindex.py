@@ -0,0 +1,68 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import unittest
+
+from robotide.namespace.wordindex import WordIndex, line_words
+
+TEXT = """*** Test Cases ***
+My Test
+    Log    ${message}
+    Log Many    @{items}    123
+"""
+
+
+class TestWordIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = WordIndex(TEXT)
+
+    def test_line_words(self):
+        assert line_words('    Log    ${message}    123    =x') == ['Log', '${message}']
+
+    def test_words(self):
+        assert self.index.words() == ['${message}', '@{items}', 'Cases', 'Log', 'Many', 'My', 'Test']
+
+    def test_starting_with_ignores_case_and_variable_characters(self):
+        assert self.index.starting_with('lo') == {'Log'}
+        assert self.index.starting_with('${me') == {'${message}'}
+        assert self.index.starting_with('mes') == {'${message}'}
+        assert self.index.starting_with('m') == {'My', 'Many', '${message}'}
+        assert self.index.starting_with('x') == set()
+
+    def test_replaced_lines_are_indexed_again(self):
+        self.index.replace_lines(3, 1, ['    Should Be Equal    ${first}', '    Log    ${second}'])
+        assert 'Many' not in self.index
+        assert '@{items}' not in self.index
+        assert self.index.starting_with('sh') == {'Should'}
+        assert self.index.starting_with('${s') == {'${second}', 'Should'}
+
+    def test_word_remains_while_any_line_contains_it(self):
+        self.index.replace_lines(2, 1, ['    No Operation'])
+        assert 'Log' in self.index
+        self.index.replace_lines(3, 1, [''])
+        assert 'Log' not in self.index
+        assert self.index.starting_with('l') == set()
+
+    def test_inserting_and_deleting_lines(self):
+        self.index.replace_lines(2, 1, ['    Log    ${message}', '    Comment    here'])
+        assert 'Comment' in self.index
+        self.index.replace_lines(2, 2, ['    Log    ${message}'])
+        assert 'Comment' not in self.index
+        assert self.index.words() == WordIndex(TEXT).words()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -13,27 +13,12 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
-import unittest
 import time
 
-from robotide.namespace.cache import ExpiringCache
+time.sleep(60)
 
 
-class TestExpiringCache(unittest.TestCase):
+class Sleeping(object):
 
-    def test_cache_hit(self):
-        cache = ExpiringCache(0.1)
-        cache.put('a', 'b')
-        assert 'b' == cache.get('a')
-
-    def test_cache_expiration(self):
-        cache = ExpiringCache(0.01)
-        cache.put('a', 'b')
-        time.sleep(0.1)
-        assert cache.get('a') is None
-        cache.put('a', 'c')
-        assert 'c' == cache.get('a')
-
-
-if __name__ == "__main__":
-    unittest.main()
+    def never_imported(self):
+        pass
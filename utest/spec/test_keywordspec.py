@@ -14,13 +14,16 @@
 #  limitations under the License.
 
 import unittest
+import shutil
 import sys
 import os
+import tempfile
 import pytest
+from unittest.mock import patch
 
 from utest.resources import DATAPATH
 from robotide.context import LIBRARY_XML_DIRECTORY
-from robotide.spec.xmlreaders import SpecInitializer
+from robotide.spec.xmlreaders import SpecIndex, SpecInitializer, read_spec_header
 from robotide.utils import overrides
 
 sys.path.append(os.path.join(DATAPATH, 'libs'))
@@ -126,6 +129,74 @@ class TestSpecInitializer(unittest.TestCase):
         self.assertEqual(specinitializer.directory, 'my_dir')
 
 
+class TestSpecIndex(unittest.TestCase):
+
+    def setUp(self):
+        self._dir = tempfile.mkdtemp()
+        self._index_path = os.path.join(self._dir, 'index.json')
+        self._specs = os.path.join(self._dir, 'specs')
+        os.mkdir(self._specs)
+
+    def tearDown(self):
+        shutil.rmtree(self._dir)
+
+    def test_reading_header_stops_before_keywords(self):
+        path = self._write_spec('lib.xml', 'MyLib', '1.0', keywords='<keywords><kw name="broken"></keywords>')
+        self.assertEqual(read_spec_header(path), ('MyLib', '1.0'))
+
+    def test_finding_newest_version(self):
+        self._write_spec('old.xml', 'MyLib', '1.0')
+        newest = self._write_spec('new.xml', 'MyLib', '2.0')
+        self._write_spec('other.xml', 'Other', '3.0')
+        self.assertEqual(SpecIndex(self._index_path).find(self._specs, 'MyLib'), newest)
+        self.assertEqual(SpecIndex(self._index_path).find(self._specs, 'Unknown'), None)
+
+    def test_index_is_persisted_and_not_reread(self):
+        path = self._write_spec('lib.xml', 'MyLib', '1.0')
+        SpecIndex(self._index_path).find(self._specs, 'MyLib')
+        index = SpecIndex(self._index_path)
+        with patch('robotide.spec.xmlreaders.read_spec_header') as reader:
+            self.assertEqual(index.find(self._specs, 'MyLib'), path)
+            self.assertFalse(reader.called)
+
+    def test_modified_and_removed_files_are_refreshed(self):
+        path = self._write_spec('lib.xml', 'MyLib', '1.0')
+        index = SpecIndex(self._index_path)
+        self.assertEqual(index.find(self._specs, 'MyLib'), path)
+        self._write_spec('lib.xml', 'Renamed', '1.0', mtime_offset=10)
+        self.assertEqual(index.find(self._specs, 'MyLib'), None)
+        self.assertEqual(index.find(self._specs, 'Renamed'), path)
+        os.remove(path)
+        self.assertEqual(index.find(self._specs, 'Renamed'), None)
+
+    def test_unchanged_directory_is_not_listed_again(self):
+        path = self._write_spec('lib.xml', 'MyLib', '1.0')
+        index = SpecIndex(self._index_path)
+        index.find(self._specs, 'MyLib')
+        with patch('os.scandir') as scandir:
+            self.assertEqual(index.find(self._specs, 'MyLib'), path)
+            self.assertEqual(index.find(self._specs, 'Unknown'), None)
+            self.assertFalse(scandir.called)
+
+    def test_added_files_are_found(self):
+        index = SpecIndex(self._index_path)
+        self.assertEqual(index.find(self._specs, 'MyLib'), None)
+        mtime = os.stat(self._specs).st_mtime_ns
+        path = self._write_spec('lib.xml', 'MyLib', '1.0')
+        os.utime(self._specs, ns=(mtime + 10**9, mtime + 10**9))
+        self.assertEqual(index.find(self._specs, 'MyLib'), path)
+
+    def _write_spec(self, filename, name, version, keywords='', mtime_offset=0):
+        path = os.path.join(self._specs, filename)
+        with open(path, 'w') as spec:
+            spec.write('<?xml version="1.0" encoding="UTF-8"?>\n<keywordspec name="%s" type="LIBRARY">'
+                       '<version>%s</version><doc/>%s</keywordspec>' % (name, version, keywords))
+        if mtime_offset:
+            mtime = os.stat(path).st_mtime_ns + mtime_offset * 10**9
+            os.utime(path, ns=(mtime, mtime))
+        return path
+
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -17,7 +17,7 @@ import os
 import sys
 import unittest
 from robotide.spec.iteminfo import LibraryKeywordInfo
-from robotide.spec.librarydatabase import LibraryDatabase
+from robotide.spec.librarydatabase import LibraryDatabase, SCHEMA_VERSION
 from robotide.spec.libraryfetcher import get_import_result
 
 testlibpath = os.path.join(os.path.dirname(__file__), '..', 'resources',
@@ -110,6 +110,32 @@ class TestLibraryDatabase(unittest.TestCase):
         self._database.insert_library_keywords('library', '', [])
         self.assertTrue(self._database.library_exists('library', ''))
 
+    def test_library_fingerprint(self):
+        self.assertIsNone(self._database.get_library_fingerprint('lib.py', 'foo'))
+        self._database.insert_library_keywords('lib.py', 'foo', [], 'first')
+        self.assertEqual(self._database.get_library_fingerprint('lib.py', 'foo'), 'first')
+        self._database.update_library_timestamp('lib.py', 'foo', fingerprint='second')
+        self.assertEqual(self._database.get_library_fingerprint('lib.py', 'foo'), 'second')
+        self._database.update_library_timestamp('lib.py', 'foo')
+        self.assertEqual(self._database.get_library_fingerprint('lib.py', 'foo'), 'second')
+
+    def test_schema_version_and_indexes(self):
+        connection = self._database._connection
+        self.assertEqual(connection.execute('pragma user_version').fetchone()[0], SCHEMA_VERSION)
+        plan = connection.execute('explain query plan select * from keywords where library = ?', [1]).fetchall()
+        self.assertIn('keywords_library', str(plan))
+        plan = connection.execute('explain query plan select * from libraries where name = ? and arguments = ?',
+                                  ['lib', '']).fetchall()
+        self.assertIn('libraries_name_arguments', str(plan))
+
+    def test_failed_insert_is_rolled_back(self):
+        keyword = LibraryKeywordInfo('kw', 'doc', 'ROBOT', 'lib.py', '')
+        self._database.insert_library_keywords('lib.py', 'foo', [keyword])
+        self.assertRaises(AttributeError, self._database.insert_library_keywords, 'lib.py', 'foo',
+                          [keyword, object()])
+        kws = self._database.fetch_library_keywords('lib.py', 'foo')
+        self.assertEqual([kw.name for kw in kws], ['kw'])
+
     def _get_and_insert_keywords(self, library_name, library_arguments):
         kws = get_import_result(library_name, library_arguments)
         self._database.insert_library_keywords(library_name, library_arguments, kws)
@@ -0,0 +1,78 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from robotide.spec.libraryfingerprint import get_library_fingerprint
+
+
+class TestLibraryFingerprint(unittest.TestCase):
+
+    def setUp(self):
+        self._dir = tempfile.mkdtemp()
+        self._library = os.path.join(self._dir, 'FingerprintLib.py')
+        self._write(self._library, 'def keyword():\n    pass\n')
+        sys.path.append(self._dir)
+
+    def tearDown(self):
+        sys.path.remove(self._dir)
+        shutil.rmtree(self._dir)
+
+    def test_fingerprint_is_stable(self):
+        self.assertEqual(get_library_fingerprint('FingerprintLib', ''),
+                         get_library_fingerprint('FingerprintLib', ''))
+        self.assertEqual(get_library_fingerprint(self._library, ''),
+                         get_library_fingerprint(self._library, ''))
+
+    def test_fingerprint_depends_on_arguments(self):
+        self.assertNotEqual(get_library_fingerprint('FingerprintLib', ''),
+                            get_library_fingerprint('FingerprintLib', ['arg']))
+
+    def test_fingerprint_changes_when_source_changes(self):
+        original = get_library_fingerprint('FingerprintLib', '')
+        self._write(self._library, 'def keyword():\n    pass\n\n\ndef another():\n    pass\n')
+        self.assertNotEqual(original, get_library_fingerprint('FingerprintLib', ''))
+
+    def test_fingerprint_covers_package_modules(self):
+        package = os.path.join(self._dir, 'FingerprintPackage')
+        os.mkdir(package)
+        self._write(os.path.join(package, '__init__.py'), 'from .keywords import keyword\n')
+        self._write(os.path.join(package, 'keywords.py'), 'def keyword():\n    pass\n')
+        original = get_library_fingerprint('FingerprintPackage', '')
+        self.assertIsNotNone(original)
+        self._write(os.path.join(package, 'keywords.py'), 'def keyword():\n    return 1\n')
+        self.assertNotEqual(original, get_library_fingerprint('FingerprintPackage', ''))
+
+    def test_standard_libraries_have_fingerprint(self):
+        self.assertIsNotNone(get_library_fingerprint('Collections', ''))
+
+    def test_unknown_library_has_no_fingerprint(self):
+        self.assertIsNone(get_library_fingerprint('FooBarZoo', ''))
+        self.assertIsNone(get_library_fingerprint('not/existing/Library.py', ''))
+
+    @staticmethod
+    def _write(path, content):
+        mtime = os.stat(path).st_mtime_ns + 10**9 if os.path.exists(path) else None
+        with open(path, 'w') as source:
+            source.write(content)
+        if mtime:
+            os.utime(path, ns=(mtime, mtime))
+
+
+if __name__ == '__main__':
+    unittest.main()
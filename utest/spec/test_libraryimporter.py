@@ -0,0 +1,121 @@
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import os
+import queue
+import unittest
+from robotide.spec.libraryfetcher import get_import_result
+from robotide.spec.libraryimporter import LibraryImporterPool, WorkerProcess, worker_command
+from robotide.spec.librarymanager import LibraryManager
+
+SLEEPING_LIBRARY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Sleeping.py')
+# Responds with an object RIDE process cannot unpickle, and then with a number
+UNREADABLE_RESPONSE_WORKER = """\
+import pickle, struct, sys
+
+class Value(object):
+    pass
+
+for response in [('ready', None), ('ok', Value()), ('ok', 1)]:
+    data = pickle.dumps(response)
+    sys.stdout.buffer.write(struct.pack('>I', len(data)) + data)
+sys.stdout.buffer.flush()
+sys.stdin.read()
+"""
+
+
+class TestLibraryImporterPool(unittest.TestCase):
+
+    def setUp(self):
+        self._results = queue.Queue()
+        self._pool = LibraryImporterPool(workers=2, timeout=20)
+        self._pool.start()
+
+    def tearDown(self):
+        self._pool.stop()
+
+    def test_importing_libraries_in_parallel(self):
+        for name in ('Collections', 'String'):
+            self._pool.submit(name, '', self._callback(name))
+        results = dict(self._results.get(timeout=30) for _ in range(2))
+        for name in ('Collections', 'String'):
+            keywords, error = results[name]
+            self.assertIsNone(error)
+            self.assertFalse(LibraryManager._keywords_differ(keywords, get_import_result(name, '')))
+
+    def test_unknown_library_reports_error(self):
+        self._pool.submit('FooBarZoo', '', self._callback('FooBarZoo'))
+        _, (keywords, error) = self._results.get(timeout=30)
+        self.assertIsNone(keywords)
+        self.assertIn('FooBarZoo', error)
+
+    def test_hanging_import_does_not_block_others(self):
+        pool = LibraryImporterPool(workers=2, timeout=10)
+        pool.start()
+        try:
+            pool.submit(SLEEPING_LIBRARY, '', self._callback('Sleeping'))
+            pool.submit('String', '', self._callback('String'))
+            first, (keywords, _) = self._results.get(timeout=30)
+            self.assertEqual(first, 'String')
+            self.assertTrue(keywords)
+            second, (keywords, error) = self._results.get(timeout=30)
+            self.assertEqual(second, 'Sleeping')
+            self.assertIsNone(keywords)
+            self.assertIn('timed out', error)
+        finally:
+            pool.stop()
+
+    def test_timeout_does_not_include_worker_startup(self):
+        command = 'import time\ntime.sleep(2)\n' + worker_command('robotide.spec.libraryimporter')
+        worker = WorkerProcess(command, timeout=1)
+        try:
+            status, error = worker.call(('FooBarZoo', '', os.path.abspath('.'), [], []), 'library "FooBarZoo"')
+        finally:
+            worker.close()
+        self.assertEqual(status, 'error')
+        self.assertIn('FooBarZoo', error)
+        self.assertNotIn('timed out', error)
+
+    def test_unreadable_response_is_reported_as_error(self):
+        worker = WorkerProcess(UNREADABLE_RESPONSE_WORKER, timeout=10)
+        try:
+            status, error = worker.call('first', 'first')
+            second = worker.call('second', 'second')
+        finally:
+            worker.close()
+        self.assertEqual(status, 'error')
+        self.assertIn('Could not read response', error)
+        self.assertEqual(second, ('ok', 1))
+
+    def test_library_manager_uses_pool(self):
+        manager = LibraryManager(':memory:', importer_pool=self._pool)
+        manager._initiate_database_connection()
+        manager._database.create_database()
+        try:
+            manager.fetch_keywords('String', '', lambda kws: self._results.put(('String', kws)))
+            manager._handle_message()
+            manager._handle_message()
+            _, keywords = self._results.get(timeout=1)
+            self.assertFalse(manager._keywords_differ(keywords, get_import_result('String', '')))
+            self.assertTrue(manager._database.library_exists('String', ''))
+        finally:
+            manager._database.close()
+
+    def _callback(self, name):
+        return lambda keywords, error: self._results.put((name, (keywords, error)))
+
+
+if __name__ == '__main__':
+    unittest.main()
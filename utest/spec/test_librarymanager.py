@@ -17,6 +17,8 @@ import os
 import pytest
 import unittest
 import sys
+from threading import Thread
+from unittest.mock import patch
 from robotide.spec.libraryfetcher import get_import_result
 from robotide.spec.librarymanager import LibraryManager
 from utest.resources import DATAPATH
@@ -68,6 +70,47 @@ class TestLibraryManager(unittest.TestCase):
         self._library_manager._handle_message()
         self.assertEqual(self._keywords, [])
 
+    def test_refreshing_unchanged_library_does_not_import_it(self):
+        self._library_manager.fetch_keywords('String', '', self._callback)
+        self._library_manager._handle_message()
+        self._library_manager.refresh_keywords('String', '', self._callback)
+        with patch.object(self._library_manager, '_fetch_keywords') as fetch:
+            self._library_manager._handle_message()
+        self.assertFalse(fetch.called)
+
+    def test_refreshing_changed_library_imports_it(self):
+        database = self._library_manager._database
+        database.insert_library_keywords('String', '', get_import_result('String', ''), 'outdated')
+        self._library_manager.refresh_keywords('String', '', self._callback)
+        self._library_manager._handle_message()
+        self.assertEqual(database.get_library_fingerprint('String', ''),
+                         self._library_manager.get_library_fingerprint('String', ''))
+
+    def test_insert_completed_after_caller_gave_up_calls_late_callback(self):
+        self._library_manager.INSERT_TIMEOUT = 0.01
+        self.assertEqual(self._library_manager.get_and_insert_keywords('String', '', self._callback), [])
+        self._library_manager._handle_message()
+        self.assertFalse(self._library_manager._keywords_differ(self._keywords, get_import_result('String', '')))
+
+    def test_insert_completed_in_time_does_not_call_late_callback(self):
+        results = []
+        thread = Thread(target=lambda: results.append(
+            self._library_manager.get_and_insert_keywords('String', '', self._callback)))
+        thread.start()
+        self._library_manager._handle_message()
+        thread.join()
+        self.assertTrue(results[0])
+        self.assertIsNone(self._keywords)
+
+    def test_library_database_connection_per_thread(self):
+        database = self._library_manager.get_library_database()
+        self.assertIs(database, self._library_manager.get_library_database())
+        other = []
+        thread = Thread(target=lambda: other.append(self._library_manager.get_library_database()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(database, other[0])
+
     def _callback(self, keywords):
         self._keywords = keywords
 
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+#  Copyright 2008-2015 Nokia Networks
+#  Copyright 2016-     Robot Framework Foundation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""Compares loading a directory of suites with different `suite loading workers`.
+
+Usage: time_suite_loading.py [suites [workers ...]]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from robotide.controller.dataloader import DataLoader
+from robotide.namespace import Namespace
+from utest.resources.mocks import FakeSettings
+
+SUITE = '*** Test Cases ***\n' + ''.join('Test %d\n    Log    Message ${%d}    WARN\n'
+                                         '    Should Be Equal    first    second\n' % (i, i) for i in range(50))
+
+
+class _Observer(object):
+
+    def notify(self):
+        pass
+
+
+def create_suites(directory, count):
+    for index in range(count):
+        subdirectory = os.path.join(directory, 'dir_%d' % (index // 50))
+        if not os.path.isdir(subdirectory):
+            os.mkdir(subdirectory)
+        with open(os.path.join(subdirectory, 'suite_%d.robot' % index), 'w') as suite:
+            suite.write(SUITE)
+
+
+def load_time(directory, workers):
+    settings = FakeSettings({'excludes': tempfile.gettempdir(), 'suite loading workers': workers})
+    starttime = time.time()
+    DataLoader(Namespace(settings), settings).load_datafile(directory, _Observer(), ['en'])
+    return time.time() - starttime
+
+
+def main(suites=500, *workers):
+    directory = tempfile.mkdtemp()
+    try:
+        create_suites(directory, int(suites))
+        sys.stdout.write('%d suites, %d processors\n' % (int(suites), os.cpu_count() or 1))
+        for count in [0] + [int(count) for count in workers or [os.cpu_count() or 1]]:
+            sys.stdout.write('%d workers: %.02f s\n' % (count, load_time(directory, count)))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])